@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Long-lived analysis server for low-latency checks of single files.
+
+Every run of analyze_java_api_blockers.py starts an interpreter, compiles the
+API_CATEGORIES rules and walks the whole repository, which is too slow for
+editor integrations and pre-commit hooks that only need a few files. This
+server does that work once and keeps in memory:
+
+- the analyzer plugins with their compiled rules (api_blockers by default),
+- the module map (source file -> module) of the repository,
+- a cache of per-file results, keyed by path and validated by mtime and size.
+
+Requests are JSON-RPC 2.0 messages, one JSON object (or batch array) per
+line, over a Unix socket (one thread per client, so several clients are
+served concurrently) or over stdin/stdout (--stdio, for editors that spawn
+the server as a child process). Methods:
+
+- scan_paths {"paths": [...]}: results for files given relative to the
+  repository root or as absolute paths; unchanged files come from the cache
+- scan_buffer {"path": ..., "text": ...}: results for unsaved editor
+  contents; path gives the module, scope and language
+- stats {}: uptime, request counts, cache hits and latency per method
+- shutdown {}: stop the server after replying
+
+Per-file results are the analyzers' dump_results() entries, the same form as
+in the partial reports of a sharded scan, plus the ScanLimits guards the
+file hit.
+
+Usage:
+    python analysis_server.py [serve] [--socket PATH | --stdio] [--repo-root PATH]
+                              [--analyzers api_blockers,regex_literals] [--warm]
+    python analysis_server.py client [--socket PATH] FILE [FILE ...]
+    python analysis_server.py client [--socket PATH] --buffer PATH < CONTENTS
+    python analysis_server.py client [--socket PATH] --stats | --shutdown
+
+    The client prints the JSON result; with --fail-on-blockers it exits with
+    status 2 when any api_blockers finding is reported (for pre-commit hooks).
+"""
+
+import argparse
+import inspect
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from analyze_java_api_blockers import (
+    SOURCE_EXTENSIONS, ScanLimits, SkippedFile, analyze_source, decode_source, file_scope,
+    find_java_files, get_module_name, language_of, load_analyzers, read_source_file,
+)
+
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+METHODS = ("scan_paths", "scan_buffer", "stats", "shutdown")
+
+
+class RpcError(Exception):
+    """An error reported to the client as a JSON-RPC error object."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def default_socket_path(repo_root: Path) -> Path:
+    return repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis" / "analysis_server.sock"
+
+
+class AnalysisServer:
+    """
+    Warm analyzer state shared by every client connection.
+
+    Analyzers are created once, so their rules are compiled once; scans only
+    read shared state, and the cache and counters are updated under a lock.
+    """
+
+    def __init__(self, repo_root: Path, analyzer_names: List[str], limits: Optional[ScanLimits] = None):
+        self.repo_root = repo_root
+        self.analyzers = load_analyzers(analyzer_names)
+        self.limits = limits or ScanLimits()
+        self.modules: Dict[str, str] = {
+            str(path.relative_to(repo_root)): get_module_name(path, repo_root)
+            for path in find_java_files(repo_root, SOURCE_EXTENSIONS, "all")
+        }
+        # rel_path -> (st_mtime_ns, st_size, file result)
+        self.cache: Dict[str, Tuple[int, int, dict]] = {}
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.method_seconds: Dict[str, float] = defaultdict(float)
+        self.stopping = threading.Event()
+
+    def resolve(self, path: str) -> Path:
+        """Absolute path of a file given relative to the repository root or as an absolute path."""
+        file_path = Path(path)
+        if not file_path.is_absolute():
+            file_path = self.repo_root / file_path
+        file_path = Path(os.path.abspath(file_path))
+        try:
+            file_path.relative_to(self.repo_root)
+        except ValueError:
+            raise RpcError(INVALID_PARAMS, f"{path} is outside the repository root {self.repo_root}")
+        return file_path
+
+    def module_of(self, file_path: Path) -> str:
+        """Module of a file from the module map; files added since startup are mapped by path."""
+        module = self.modules.get(str(file_path.relative_to(self.repo_root)))
+        return module if module is not None else get_module_name(file_path, self.repo_root)
+
+    def file_result(self, source, skipped: List[SkippedFile]) -> dict:
+        results = analyze_source(source, self.analyzers, self.limits, skipped) if source else {}
+        return {
+            "results": {
+                analyzer.name: analyzer.dump_results({source.module: results[analyzer.name]})[source.module]
+                for analyzer in self.analyzers
+                if analyzer.name in results
+            },
+            "skipped": [asdict(entry) for entry in skipped],
+        }
+
+    def scan_file(self, file_path: Path) -> dict:
+        rel_path = str(file_path.relative_to(self.repo_root))
+        entry = {
+            "file": rel_path,
+            "module": self.module_of(file_path),
+            "scope": file_scope(file_path, self.repo_root),
+            "language": language_of(file_path),
+        }
+        try:
+            stat = file_path.stat()
+        except OSError as e:
+            return {**entry, "error": f"cannot stat: {e.strerror}"}
+        if not file_path.is_file():
+            return {**entry, "error": "not a file"}
+        if file_path.suffix not in SOURCE_EXTENSIONS:
+            return {**entry, "language": None, "error": "not a Java/Kotlin source"}
+
+        with self.lock:
+            cached = self.cache.get(rel_path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            self.count("cache_hits")
+            return {**entry, "cached": True, **cached[2]}
+
+        self.count("cache_misses")
+        skipped: List[SkippedFile] = []
+        source = read_source_file(file_path, self.repo_root, self.limits, skipped)
+        if source is not None:
+            source.module = entry["module"]
+        result = self.file_result(source, skipped)
+        with self.lock:
+            self.cache[rel_path] = (stat.st_mtime_ns, stat.st_size, result)
+        return {**entry, "cached": False, **result}
+
+    def scan_paths(self, paths: List[str]) -> dict:
+        if not isinstance(paths, list) or not all(isinstance(p, str) for p in paths):
+            raise RpcError(INVALID_PARAMS, "paths must be a list of strings")
+        return {"files": [self.scan_file(self.resolve(path)) for path in paths]}
+
+    def scan_buffer(self, path: str, text: str) -> dict:
+        if not isinstance(path, str) or not isinstance(text, str):
+            raise RpcError(INVALID_PARAMS, "path and text must be strings")
+        file_path = self.resolve(path)
+        if file_path.suffix not in SOURCE_EXTENSIONS:
+            raise RpcError(INVALID_PARAMS, f"{path} is not a Java/Kotlin source")
+        module = self.module_of(file_path)
+        skipped: List[SkippedFile] = []
+        source = decode_source(file_path, self.repo_root, text.encode("utf-8"), self.limits, skipped, module)
+        return {
+            "file": str(file_path.relative_to(self.repo_root)),
+            "module": module,
+            "scope": file_scope(file_path, self.repo_root),
+            "language": language_of(file_path),
+            **self.file_result(source, skipped),
+        }
+
+    def stats(self) -> dict:
+        with self.lock:
+            counters = dict(self.counters)
+            seconds = dict(self.method_seconds)
+            cache_entries = len(self.cache)
+        return {
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "analyzers": [a.name for a in self.analyzers],
+            "known_files": len(self.modules),
+            "modules": len(set(self.modules.values())),
+            "cache_entries": cache_entries,
+            "cache_hits": counters.get("cache_hits", 0),
+            "cache_misses": counters.get("cache_misses", 0),
+            "requests": {
+                method: {
+                    "count": counters[method],
+                    "mean_ms": round(1000 * seconds[method] / counters[method], 3),
+                }
+                for method in METHODS
+                if counters.get(method)
+            },
+        }
+
+    def shutdown(self) -> dict:
+        self.stopping.set()
+        return {"stopping": True}
+
+    def count(self, name: str, seconds: Optional[float] = None) -> None:
+        with self.lock:
+            self.counters[name] += 1
+            if seconds is not None:
+                self.method_seconds[name] += seconds
+
+    def call(self, method: str, params: Any) -> Any:
+        if method not in METHODS:
+            raise RpcError(METHOD_NOT_FOUND, f"Unknown method '{method}' (available: {', '.join(METHODS)})")
+        if params is None:
+            params = {}
+        if not isinstance(params, dict):
+            raise RpcError(INVALID_PARAMS, "params must be an object")
+        handler = getattr(self, method)
+        try:
+            inspect.signature(handler).bind(**params)
+        except TypeError as e:
+            raise RpcError(INVALID_PARAMS, str(e))
+        started = time.perf_counter()
+        result = handler(**params)
+        elapsed = time.perf_counter() - started
+        self.count(method, elapsed)
+        if isinstance(result, dict) and method.startswith("scan_"):
+            result["elapsed_ms"] = round(1000 * elapsed, 3)
+        return result
+
+    def handle(self, request: Any) -> Optional[dict]:
+        """Response to one JSON-RPC request object, or None for a notification."""
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return {"jsonrpc": "2.0", "id": None,
+                    "error": {"code": INVALID_REQUEST, "message": "Request must be an object with a method"}}
+        try:
+            response = {"result": self.call(request["method"], request.get("params"))}
+        except RpcError as e:
+            response = {"error": {"code": e.code, "message": str(e)}}
+        except Exception as e:
+            response = {"error": {"code": INTERNAL_ERROR, "message": f"{type(e).__name__}: {e}"}}
+        if "id" not in request:
+            return None
+        return {"jsonrpc": "2.0", "id": request["id"], **response}
+
+    def handle_line(self, line: bytes) -> Optional[bytes]:
+        """Response line to one request line (a request object or a batch array)."""
+        if not line.strip():
+            return None
+        try:
+            message = json.loads(line)
+        except ValueError as e:
+            response: Any = {"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": str(e)}}
+        else:
+            if message == []:
+                response = {"jsonrpc": "2.0", "id": None,
+                            "error": {"code": INVALID_REQUEST, "message": "Empty batch"}}
+            elif isinstance(message, list):
+                response = [r for r in (self.handle(m) for m in message) if r is not None] or None
+            else:
+                response = self.handle(message)
+        if response is None:
+            return None
+        return json.dumps(response, separators=(",", ":")).encode("utf-8") + b"\n"
+
+    def warm(self, scope: str) -> int:
+        """Fill the cache with every source file of the scope; returns the number of files."""
+        files = find_java_files(self.repo_root, SOURCE_EXTENSIONS, scope)
+        for file_path in files:
+            self.scan_file(file_path)
+        return len(files)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """One client connection: request lines in, response lines out."""
+
+    def handle(self) -> None:
+        app: AnalysisServer = self.server.app
+        for line in self.rfile:
+            response = app.handle_line(line)
+            if response is not None:
+                self.wfile.write(response)
+                self.wfile.flush()
+            if app.stopping.is_set():
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve_socket(app: AnalysisServer, socket_path: Path) -> None:
+    if socket_path.exists():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(socket_path))
+        except OSError:
+            socket_path.unlink()
+        else:
+            probe.close()
+            print(f"Error: a server is already listening on {socket_path}", file=sys.stderr)
+            sys.exit(1)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+    server = UnixServer(str(socket_path), RequestHandler)
+    server.app = app
+    print(f"Listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path.exists():
+            socket_path.unlink()
+    print("Server stopped")
+
+
+def serve_stdio(app: AnalysisServer) -> None:
+    # stdout carries the protocol; anything else printed goes to stderr
+    out = sys.stdout.buffer
+    sys.stdout = sys.stderr
+    for line in sys.stdin.buffer:
+        response = app.handle_line(line)
+        if response is not None:
+            out.write(response)
+            out.flush()
+        if app.stopping.is_set():
+            break
+
+
+def rpc_call(socket_path: Path, method: str, params: dict) -> Any:
+    """Send one request to a running server and return its result; raises RpcError on errors."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(str(socket_path))
+        request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+        conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with conn.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise RpcError(INTERNAL_ERROR, "Server closed the connection without a response")
+    response = json.loads(line)
+    if "error" in response:
+        raise RpcError(response["error"]["code"], response["error"]["message"])
+    return response["result"]
+
+
+def has_blockers(result: dict) -> bool:
+    files = result.get("files", [result])
+    return any(f.get("results", {}).get("api_blockers") for f in files)
+
+
+def run_client(args, socket_path: Path) -> int:
+    if args.stats:
+        method, params = "stats", {}
+    elif args.shutdown:
+        method, params = "shutdown", {}
+    elif args.buffer:
+        method, params = "scan_buffer", {"path": args.buffer, "text": sys.stdin.read()}
+    elif args.paths:
+        method, params = "scan_paths", {"paths": [str(Path(p).resolve()) for p in args.paths]}
+    else:
+        print("Error: give files to scan, --buffer PATH, --stats or --shutdown", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    try:
+        result = rpc_call(socket_path, method, params)
+    except OSError as e:
+        print(f"Error: cannot reach the server at {socket_path}: {e.strerror or e}", file=sys.stderr)
+        return 1
+    except RpcError as e:
+        print(f"Error {e.code}: {e}", file=sys.stderr)
+        return 1
+    elapsed_ms = 1000 * (time.perf_counter() - started)
+
+    print(json.dumps(result, indent=2))
+    print(f"Round trip: {elapsed_ms:.1f} ms", file=sys.stderr)
+    if args.fail_on_blockers and method.startswith("scan_") and has_blockers(result):
+        return 2
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve blocker scans of single files from warm analyzer state"
+    )
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["serve", "client"],
+        default="serve",
+        help="run the server (default), or send a request to a running server"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="Files to scan (client)"
+    )
+    parser.add_argument(
+        "--repo-root",
+        type=Path,
+        default=Path(__file__).parent.parent.parent,
+        help="Path to repository root (default: two levels up from script)"
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        help="Unix socket path (default: .ai_out/.../analysis_server.sock)"
+    )
+    parser.add_argument(
+        "--stdio",
+        action="store_true",
+        help="Serve JSON-RPC over stdin/stdout instead of a Unix socket"
+    )
+    parser.add_argument(
+        "--analyzers",
+        default="api_blockers",
+        help="Comma-separated analyzer plugins to serve (default: api_blockers)"
+    )
+    parser.add_argument(
+        "--warm",
+        choices=["main", "test", "testFixtures", "all"],
+        nargs="?",
+        const="main",
+        default=None,
+        help="Scan every file of the scope at startup to fill the cache (default scope: main)"
+    )
+    parser.add_argument(
+        "--buffer",
+        default=None,
+        help="Scan the contents read from stdin as if they were this file (client)"
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print server statistics (client)"
+    )
+    parser.add_argument(
+        "--shutdown",
+        action="store_true",
+        help="Stop the server (client)"
+    )
+    parser.add_argument(
+        "--fail-on-blockers",
+        action="store_true",
+        help="Exit with status 2 when a scanned file has api_blockers findings (client)"
+    )
+    args = parser.parse_intermixed_args()
+
+    repo_root = args.repo_root.resolve()
+    socket_path = args.socket or default_socket_path(repo_root)
+
+    if args.command == "client":
+        sys.exit(run_client(args, socket_path))
+
+    log = sys.stderr if args.stdio else sys.stdout
+    started = time.perf_counter()
+    try:
+        app = AnalysisServer(repo_root, [n.strip() for n in args.analyzers.split(",") if n.strip()])
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Loaded {len(app.analyzers)} analyzer(s) and {len(app.modules)} source files "
+          f"in {time.perf_counter() - started:.2f}s", file=log)
+    if args.warm:
+        started = time.perf_counter()
+        warmed = app.warm(args.warm)
+        print(f"Warmed the cache with {warmed} files in {time.perf_counter() - started:.2f}s", file=log)
+
+    if args.stdio:
+        serve_stdio(app)
+    else:
+        serve_socket(app, socket_path)
+
+
+if __name__ == "__main__":
+    main()
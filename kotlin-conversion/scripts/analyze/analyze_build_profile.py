@@ -0,0 +1,535 @@
+#!/usr/bin/env python3
+"""
+Attribute Gradle build time to modules and track it across runs.
+
+Compile time per module changes a lot as modules move from Java to Kotlin.
+This script ingests local build profiles and puts the cost of every module
+next to its feasibility tier:
+
+- Gradle --profile reports (build/reports/profile/profile-*.html): the
+  Configuration tab gives the configuration time per project, the Task
+  Execution tab the duration and result of every task.
+- Build-scan style JSON exported under build/reports/ (file names containing
+  "scan"), of the form
+      {"buildStartTime": <epoch ms>,
+       "projects": [{"path": ":flexmark", "duration": <ms>}, ...],
+       "tasks": [{"path": ":flexmark:compileJava", "duration": <ms>,
+                  "outcome": "executed" | "up_to_date" | "from_cache" | ...}, ...]}
+  ("taskPath", "projectPath" and "durationMillis" are accepted as well).
+
+Project paths are mapped to the modules of settings.gradle.kts. Task time is
+split into compile_java (compile*Java), compile_kotlin (compile*Kotlin*),
+test (test, *Test tasks) and other; tasks that were up to date, taken from
+the cache or had no source count as avoided.
+
+Every ingested run is appended to a history file (a report is ingested once,
+identified by its content hash) together with the Kotlin share of each
+module's code at that time. The latest run is compared with the median of the
+previous runs: a module whose compile time grew by --slowdown-pct and at least
+--min-seconds is flagged. Only runs that actually compiled (or tested) the
+module count for its compile (or test) baseline.
+analyze_module_feasibility.py adds the result to module_feasibility.json.
+
+Usage:
+    python analyze_build_profile.py [--profile PATH ...] [--repo-root PATH] [--output PATH]
+                                    [--history PATH] [--baseline-runs 5]
+                                    [--slowdown-pct 25] [--min-seconds 1.0]
+
+    --profile accepts report files or directories to search; by default
+    build/reports/ of the root project and of every module are searched.
+
+Output:
+    JSON report with the latest cost per module (labelled with the run it
+    comes from, for modules the latest run did not build), the change against
+    the baseline runs and the slowed modules; totals cover the latest run
+    only. The updated history file.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import statistics
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from analyze_java_api_blockers import count_loc, find_java_files, get_module_name, language_of
+from analyze_module_feasibility import load_json_report
+from analyze_module_graph import parse_settings
+
+
+COST_KINDS = ("configuration", "compile_java", "compile_kotlin", "test", "other")
+
+# Task results (profile report) and outcomes (build-scan JSON) of tasks that did no work
+AVOIDED_RESULTS = {"UP-TO-DATE", "FROM-CACHE", "NO-SOURCE", "SKIPPED"}
+AVOIDED_OUTCOMES = {"up_to_date", "up-to-date", "from_cache", "from-cache", "no_source", "no-source",
+                    "skipped", "avoided_up_to_date", "avoided_from_local_cache", "avoided_from_remote_cache"}
+
+DURATION_RE = re.compile(r'^(?:(\d+)d)?(?:(\d+)h)?(?:(\d+)m)?(?:([\d.]+)s)?$')
+STARTED_RE = re.compile(r'Started on:\s*(\d{4})/(\d{2})/(\d{2})\s*-\s*(\d{2}):(\d{2}):(\d{2})')
+
+# Runs kept in the history file
+HISTORY_LIMIT = 200
+
+
+def parse_duration(text: str) -> float:
+    """Seconds of a Gradle duration such as "1m2.345s" or "0.12s"; "-" and "" are 0."""
+    text = text.strip()
+    match = DURATION_RE.match(text)
+    if not text or text == "-" or not match:
+        return 0.0
+    days, hours, minutes, seconds = match.groups()
+    return (int(days or 0) * 86400 + int(hours or 0) * 3600 + int(minutes or 0) * 60
+            + float(seconds or 0))
+
+
+def task_kind(task_name: str) -> str:
+    """Cost kind of a task by its name (the last path segment)."""
+    if task_name.startswith("compile") and "Kotlin" in task_name:
+        return "compile_kotlin"
+    if task_name.startswith("compile") and task_name.endswith("Java"):
+        return "compile_java"
+    if task_name == "test" or task_name.endswith("Test") or task_name == "allTests":
+        return "test"
+    return "other"
+
+
+def split_task_path(path: str) -> Tuple[str, str]:
+    """(project path, task name) of a task path such as ":flexmark:compileJava"."""
+    project, _, name = path.rpartition(":")
+    return project or ":", name
+
+
+class _ProfileTables(HTMLParser):
+    """Rows of the tables of a Gradle profile report, per tab (h2 title)."""
+
+    def __init__(self):
+        super().__init__()
+        self.tables: Dict[str, List[List[str]]] = defaultdict(list)
+        self.text = []
+        self.title = ""
+        self.row: Optional[List[str]] = None
+        self.cell: Optional[List[str]] = None
+        self.in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "h2":
+            self.in_title = True
+            self.title = ""
+        elif tag == "tr":
+            self.row = []
+        elif tag == "td" and self.row is not None:
+            self.cell = []
+
+    def handle_endtag(self, tag):
+        if tag == "h2":
+            self.in_title = False
+        elif tag == "td" and self.cell is not None:
+            self.row.append("".join(self.cell).strip())
+            self.cell = None
+        elif tag == "tr" and self.row is not None:
+            if self.row:
+                self.tables[self.title.strip()].append(self.row)
+            self.row = None
+
+    def handle_data(self, data):
+        self.text.append(data)
+        if self.in_title:
+            self.title += data
+        elif self.cell is not None:
+            self.cell.append(data)
+
+
+def parse_profile_html(text: str) -> dict:
+    """Configuration seconds per project and (task path, seconds, avoided) of a --profile report."""
+    tables = _ProfileTables()
+    tables.feed(text)
+
+    configuration = {}
+    for row in tables.tables.get("Configuration", []):
+        if len(row) >= 2 and row[0].startswith(":"):
+            configuration[row[0]] = parse_duration(row[1])
+
+    tasks = []
+    for row in tables.tables.get("Task Execution", []):
+        # Per-project "(total)" rows are followed by one row per task
+        result = row[2] if len(row) > 2 else ""
+        if len(row) >= 2 and row[0].startswith(":") and result != "(total)":
+            tasks.append((row[0], parse_duration(row[1]), result in AVOIDED_RESULTS))
+
+    started = None
+    match = STARTED_RE.search("".join(tables.text))
+    if match:
+        started = "{}-{}-{}T{}:{}:{}".format(*match.groups())
+    return {"started": started, "configuration": configuration, "tasks": tasks}
+
+
+def _seconds(entry: dict) -> float:
+    for key in ("duration", "durationMillis", "duration_ms"):
+        if key in entry:
+            value = entry[key]
+            return parse_duration(value) if isinstance(value, str) else float(value) / 1000
+    return 0.0
+
+
+def parse_build_scan_json(data: dict) -> dict:
+    """Configuration seconds per project and (task path, seconds, avoided) of build-scan style JSON."""
+    configuration = {}
+    projects = data.get("projects") or data.get("configuration") or []
+    if isinstance(projects, dict):
+        projects = [{"path": path, "duration": millis} for path, millis in projects.items()]
+    for project in projects:
+        path = project.get("path") or project.get("projectPath")
+        if path:
+            configuration[path] = _seconds(project)
+
+    tasks = []
+    for task in data.get("tasks", []):
+        path = task.get("path") or task.get("taskPath")
+        if path:
+            outcome = str(task.get("outcome") or task.get("avoidanceOutcome") or "").lower()
+            tasks.append((path, _seconds(task), outcome in AVOIDED_OUTCOMES))
+
+    started = data.get("buildStartTime") or data.get("started")
+    if isinstance(started, (int, float)):
+        started = datetime.fromtimestamp(started / 1000, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+    return {"started": started, "configuration": configuration, "tasks": tasks}
+
+
+def find_reports(paths: List[Path]) -> List[Path]:
+    """Profile HTML and build-scan JSON files among paths, searching directories."""
+    found = []
+    for path in paths:
+        candidates = [path] if path.is_file() else (
+            list(path.rglob("profile-*.html")) + list(path.rglob("*scan*.json")) if path.is_dir() else []
+        )
+        found.extend(p for p in candidates if p.suffix in (".html", ".json"))
+    return sorted(set(found))
+
+
+def default_report_dirs(repo_root: Path, modules: List[str]) -> List[Path]:
+    return [d for d in [repo_root / "build" / "reports"] + [repo_root / m / "build" / "reports" for m in modules]
+            if d.is_dir()]
+
+
+def kotlin_share(repo_root: Path) -> Dict[str, float]:
+    """Percentage of the main code of each module that is Kotlin, by lines of code."""
+    loc: Dict[str, Dict[str, int]] = defaultdict(lambda: {"java": 0, "kotlin": 0})
+    for file_path in find_java_files(repo_root, ('.java', '.kt'), "main"):
+        try:
+            lines = file_path.read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError as e:
+            print(f"Warning: Could not read {file_path}: {e}")
+            continue
+        loc[get_module_name(file_path, repo_root)][language_of(file_path)] += count_loc(lines)
+    return {
+        module: round(100 * counts["kotlin"] / (counts["java"] + counts["kotlin"]), 1)
+        for module, counts in loc.items() if counts["java"] + counts["kotlin"]
+    }
+
+
+def attribute_run(parsed: dict, modules: List[str], shares: Dict[str, float]) -> Tuple[dict, dict]:
+    """Cost per module of one parsed report, and the seconds of projects that are not modules."""
+    known = set(modules)
+    costs: Dict[str, dict] = {}
+    unattributed: Dict[str, float] = defaultdict(float)
+
+    def entry(project: str) -> Optional[dict]:
+        module = project.lstrip(":").replace(":", "/")
+        if module not in known:
+            return None
+        if module not in costs:
+            costs[module] = {**{kind: 0.0 for kind in COST_KINDS},
+                             "compile_tasks_executed": 0, "test_tasks_executed": 0, "tasks_executed": 0, "tasks_avoided": 0,
+                             "kotlin_pct": shares.get(module, 0.0)}
+        return costs[module]
+
+    for project, seconds in parsed["configuration"].items():
+        module_costs = entry(project)
+        if module_costs is None:
+            unattributed[project or ":"] += seconds
+        else:
+            module_costs["configuration"] += seconds
+
+    for path, seconds, avoided in parsed["tasks"]:
+        project, name = split_task_path(path)
+        module_costs = entry(project)
+        if module_costs is None:
+            unattributed[project] += seconds
+            continue
+        kind = task_kind(name)
+        module_costs[kind] += seconds
+        if avoided:
+            module_costs["tasks_avoided"] += 1
+        else:
+            module_costs["tasks_executed"] += 1
+            if kind.startswith("compile"):
+                module_costs["compile_tasks_executed"] += 1
+            elif kind == "test":
+                module_costs["test_tasks_executed"] += 1
+
+    for module_costs in costs.values():
+        for kind in COST_KINDS:
+            module_costs[kind] = round(module_costs[kind], 3)
+    return costs, {project: round(seconds, 3) for project, seconds in sorted(unattributed.items())}
+
+
+def ingest(reports: List[Path], history: dict, repo_root: Path, modules: List[str]) -> List[dict]:
+    """Append the runs of reports not yet in history; returns the new runs."""
+    known_ids = {run["id"] for run in history["runs"]}
+    shares: Optional[Dict[str, float]] = None
+    new_runs = []
+    for path in reports:
+        data = path.read_bytes()
+        run_id = hashlib.sha1(data).hexdigest()[:16]
+        if run_id in known_ids:
+            continue
+        try:
+            if path.suffix == ".html":
+                parsed, kind = parse_profile_html(data.decode("utf-8", errors="replace")), "profile"
+            else:
+                parsed, kind = parse_build_scan_json(json.loads(data)), "build_scan"
+        except (ValueError, AttributeError, TypeError) as e:
+            print(f"Warning: Could not parse {path}: {e}")
+            continue
+        if not parsed["tasks"] and not parsed["configuration"]:
+            print(f"Warning: No configuration or task timings in {path}")
+            continue
+
+        if shares is None:
+            shares = kotlin_share(repo_root)
+        costs, unattributed = attribute_run(parsed, modules, shares)
+        started = parsed["started"] or datetime.fromtimestamp(
+            path.stat().st_mtime, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        try:
+            source = path.resolve().relative_to(repo_root).as_posix()
+        except ValueError:
+            source = str(path)
+        run = {
+            "id": run_id,
+            "source": source,
+            "format": kind,
+            "started": started,
+            "ingested": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S"),
+            "total_seconds": round(sum(c[k] for c in costs.values() for k in COST_KINDS)
+                                   + sum(unattributed.values()), 3),
+            "modules": costs,
+            "unattributed": unattributed,
+        }
+        history["runs"].append(run)
+        known_ids.add(run_id)
+        new_runs.append(run)
+
+    history["runs"].sort(key=lambda run: (run["started"], run["ingested"]))
+    del history["runs"][:-HISTORY_LIMIT]
+    return new_runs
+
+
+def compile_seconds(costs: dict) -> float:
+    return costs["compile_java"] + costs["compile_kotlin"]
+
+
+def change(latest: float, baseline: Optional[float]) -> Optional[float]:
+    if baseline is None or baseline <= 0:
+        return None
+    return round(100 * (latest - baseline) / baseline, 1)
+
+
+def generate_report(history: dict, modules: List[str], baseline_runs: int,
+                    slowdown_pct: float, min_seconds: float) -> dict:
+    """Generate the final JSON report structure from the run history."""
+    runs = history["runs"]
+    latest_run = runs[-1]
+    previous = runs[:-1]
+
+    by_module = {}
+    slowed = []
+    for module in modules:
+        source_run = next((run for run in reversed(runs) if module in run["modules"]), None)
+        if source_run is None:
+            continue
+        latest = source_run["modules"][module]
+        compiled = [run["modules"][module] for run in previous
+                    if module in run["modules"] and run["modules"][module]["compile_tasks_executed"]]
+        baseline = compiled[-baseline_runs:]
+        baseline_compile = statistics.median(compile_seconds(c) for c in baseline) if baseline else None
+        tested = [run["modules"][module]["test"] for run in previous
+                  if module in run["modules"] and run["modules"][module]["test_tasks_executed"]]
+        baseline_test = statistics.median(tested[-baseline_runs:]) if tested else None
+        baseline_kotlin = baseline[-1]["kotlin_pct"] if baseline else None
+
+        entry = {
+            **{kind: latest[kind] for kind in COST_KINDS},
+            "compile": round(compile_seconds(latest), 3),
+            "kotlin_pct": latest["kotlin_pct"],
+            # Modules absent from the latest run show their newest run that included them
+            "run_id": source_run["id"],
+            "compiled_in_latest_run": module in latest_run["modules"]
+                                      and latest["compile_tasks_executed"] > 0,
+            "baseline_runs": len(baseline),
+            "baseline_compile": round(baseline_compile, 3) if baseline_compile is not None else None,
+            "compile_change_pct": None,
+            "test_change_pct": None,
+            "kotlin_pct_change": None,
+            "slowed": False,
+        }
+        if entry["compiled_in_latest_run"] and baseline:
+            entry["compile_change_pct"] = change(entry["compile"], baseline_compile)
+            entry["kotlin_pct_change"] = round(latest["kotlin_pct"] - baseline_kotlin, 1)
+            growth = entry["compile"] - baseline_compile
+            entry["slowed"] = (growth >= min_seconds and entry["compile_change_pct"] is not None
+                               and entry["compile_change_pct"] >= slowdown_pct)
+        if module in latest_run["modules"] and latest["test_tasks_executed"]:
+            entry["test_change_pct"] = change(latest["test"], baseline_test)
+        by_module[module] = entry
+        if entry["slowed"]:
+            slowed.append(module)
+
+    slowed.sort(key=lambda m: -(by_module[m]["compile"] - by_module[m]["baseline_compile"]))
+    # Latest run only: the by_module entries of absent modules come from older runs
+    totals = {
+        kind: round(sum(costs[kind] for costs in latest_run["modules"].values()), 3)
+        for kind in COST_KINDS
+    }
+    return {
+        "settings": {"baseline_runs": baseline_runs, "slowdown_pct": slowdown_pct, "min_seconds": min_seconds},
+        "runs": [
+            {key: run[key] for key in ("id", "source", "format", "started", "total_seconds")}
+            for run in runs
+        ],
+        "latest_run": {key: latest_run[key] for key in ("id", "source", "started", "total_seconds", "unattributed")},
+        "totals": totals,
+        "slowed_modules": slowed,
+        "by_module": dict(sorted(by_module.items(), key=lambda item: -item[1]["compile"])),
+    }
+
+
+def print_summary(report: dict, new_runs: List[dict]) -> None:
+    """Print a human-readable summary to console."""
+    print("\n" + "=" * 70)
+    print("BUILD PROFILE ANALYSIS - SUMMARY")
+    print("=" * 70)
+
+    latest = report["latest_run"]
+    print(f"\nRuns in history: {len(report['runs'])} ({len(new_runs)} ingested now)")
+    print(f"Latest run: {latest['source']} (started {latest['started']}, {latest['total_seconds']:.1f}s attributed)")
+    totals = report["totals"]
+    print("Time by kind: " + ", ".join(f"{kind} {totals[kind]:.1f}s" for kind in COST_KINDS))
+    if latest["unattributed"]:
+        print(f"Not attributed to modules: {sum(latest['unattributed'].values()):.1f}s "
+              f"({', '.join(latest['unattributed'])})")
+
+    print("\n" + "-" * 70)
+    print("SLOWEST MODULES TO COMPILE:")
+    print("-" * 70)
+    for module, data in list(report["by_module"].items())[:15]:
+        trend = ""
+        if data["compile_change_pct"] is not None:
+            trend = f", {data['compile_change_pct']:+.0f}% vs baseline of {data['baseline_runs']} runs"
+        print(f"  {module}: compile {data['compile']:.1f}s (java {data['compile_java']:.1f}s, "
+              f"kotlin {data['compile_kotlin']:.1f}s), test {data['test']:.1f}s, "
+              f"{data['kotlin_pct']}% Kotlin{trend}")
+
+    if report["slowed_modules"]:
+        print("\n" + "-" * 70)
+        print("SLOWED MODULES:")
+        print("-" * 70)
+        for module in report["slowed_modules"]:
+            data = report["by_module"][module]
+            print(f"  ! {module}: {data['baseline_compile']:.1f}s -> {data['compile']:.1f}s "
+                  f"({data['compile_change_pct']:+.0f}%), Kotlin share {data['kotlin_pct_change']:+.1f} points")
+
+    print("\n" + "=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Attribute Gradle build time to modules and track it across runs"
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        action="append",
+        default=[],
+        help="Profile HTML or build-scan JSON file, or a directory to search (repeatable)"
+    )
+    parser.add_argument(
+        "--repo-root",
+        type=Path,
+        default=Path(__file__).parent.parent.parent,
+        help="Path to repository root (default: two levels up from script)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Output JSON file path (default: .ai_out/.../build_profile.json)"
+    )
+    parser.add_argument(
+        "--history",
+        type=Path,
+        default=None,
+        help="Run history file (default: .ai_out/.../build_profile_history.json)"
+    )
+    parser.add_argument(
+        "--baseline-runs",
+        type=int,
+        default=5,
+        help="Previous runs whose median is the baseline (default: 5)"
+    )
+    parser.add_argument(
+        "--slowdown-pct",
+        type=float,
+        default=25.0,
+        help="Compile time growth that flags a module, in percent (default: 25)"
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=1.0,
+        help="Minimum compile time growth that flags a module (default: 1.0)"
+    )
+    args = parser.parse_args()
+
+    if args.baseline_runs < 1:
+        parser.error("--baseline-runs must be positive")
+
+    repo_root = args.repo_root.resolve()
+    output_dir = repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = args.output or output_dir / "build_profile.json"
+    history_path = args.history or output_dir / "build_profile_history.json"
+
+    modules = parse_settings(repo_root)
+    if not modules:
+        print(f"Error: No modules in {repo_root / 'settings.gradle.kts'}")
+        sys.exit(1)
+
+    reports = find_reports(args.profile or default_report_dirs(repo_root, modules))
+    history = load_json_report(history_path) or {"runs": []}
+    new_runs = ingest(reports, history, repo_root, modules)
+    print(f"Found {len(reports)} build reports, ingested {len(new_runs)} new runs")
+
+    if not history["runs"]:
+        print("No build profiles found (run ./gradlew build --profile first); nothing to report.")
+        return
+
+    with open(history_path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+
+    report = generate_report(history, modules, args.baseline_runs, args.slowdown_pct, args.min_seconds)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\nJSON report written to: {output_path}")
+    print(f"History written to: {history_path}")
+    print_summary(report, new_runs)
+
+
+if __name__ == "__main__":
+    main()
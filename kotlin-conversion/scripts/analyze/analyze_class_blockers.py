@@ -0,0 +1,618 @@
+#!/usr/bin/env python3
+"""
+Propagate Java API blockers from class to class over the import graph.
+
+Per-module counts (analyze_java_api_blockers.py) only see the blockers a file
+uses itself. A class without a java.io import still cannot be converted while
+it depends on a flexmark class that has one. This script indexes every Java
+and Kotlin source file (package, primary class named after the file, imports
+and referenced type names), resolves the com.vladsch.flexmark.* dependencies
+between classes, and reports for each class the blocker categories it uses
+directly and the ones it inherits transitively.
+
+Propagation runs in linear time: the class graph is condensed into strongly
+connected components (import cycles) and category bitmasks are OR-ed from
+dependencies into dependents in reverse topological order.
+
+The index is persisted. A re-run only re-reads files whose size or mtime
+changed, and only recomputes the closure of the changed classes and the
+classes that (transitively) depend on them. The whole index is rebuilt when
+the blocker rules (API_CATEGORIES patterns or masking) change.
+
+Usage:
+    python analyze_class_blockers.py [--repo-root PATH] [--output PATH]
+                                     [--index PATH] [--rebuild] [--scope main]
+
+Output:
+    JSON report with per-class direct/transitive blockers and per-module
+    leakage counts, plus the index file (default: .ai_out/.../class_index.json)
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from analyze_java_api_blockers import (
+    API_CATEGORIES,
+    SCOPES,
+    SOURCE_EXTENSIONS,
+    ApiBlockerAnalyzer,
+    find_java_files,
+    read_source_file,
+)
+from analyze_module_feasibility import RESEARCH_TIERS
+
+
+INDEX_VERSION = "3"
+
+INTERNAL_PREFIX = "com.vladsch.flexmark."
+
+# Bit i of a blocker mask stands for the i-th API category
+CATEGORY_BITS = {category: 1 << i for i, category in enumerate(API_CATEGORIES)}
+
+# Java statements end in ';', Kotlin ones at the end of the line (or at an import's "as" alias)
+PACKAGE_RE = re.compile(r'^\s*package\s+([\w.]+)[ \t]*;?', re.MULTILINE)
+IMPORT_RE = re.compile(r'^\s*import\s+(static\s+)?([\w.]+?)(\.\*)?[ \t]*(?:;|\bas\b|$)', re.MULTILINE)
+QUALIFIED_REF_RE = re.compile(r'\bcom\.vladsch\.flexmark(?:\.\w+)+')
+TYPE_NAME_RE = re.compile(r'\b[A-Z]\w*')
+# String literals naming a resource file, such as "/ext_tables_ast_spec.md"
+RESOURCE_REF_RE = re.compile(r'"(/?[\w.-]+(?:/[\w.-]+)*\.(?:md|txt|html|json|ya?ml|properties|xml))"')
+
+# Comments and string/char literals, removed before collecting type references
+NON_CODE_RE = re.compile(
+    r'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'',
+    re.DOTALL
+)
+
+
+def categories_of(mask: int) -> List[str]:
+    return [category for category, bit in CATEGORY_BITS.items() if mask & bit]
+
+
+# =============================================================================
+# Per-file index
+# =============================================================================
+
+def index_file(source, blocker_analyzer: ApiBlockerAnalyzer) -> dict:
+    """Extract the package, class, dependencies, resource references and direct blocker mask of one file."""
+    text = source.text
+    package_match = PACKAGE_RE.search(text)
+    package = package_match.group(1) if package_match else ""
+
+    imports = []
+    star_imports = []
+    for match in IMPORT_RE.finditer(text):
+        name = match.group(2)
+        if match.group(3):
+            star_imports.append(name)
+        else:
+            imports.append(name)
+
+    resource_refs = sorted(set(RESOURCE_REF_RE.findall(text)))
+    code = NON_CODE_RE.sub(" ", text)
+    class_name = source.path.stem
+    qualified = sorted({m for m in QUALIFIED_REF_RE.findall(code) if not m.startswith(package + "." + class_name)})
+    type_refs = sorted(set(TYPE_NAME_RE.findall(code)) - {class_name})
+
+    direct = 0
+    for category, report in blocker_analyzer.analyze(source).items():
+        if report.count:
+            direct |= CATEGORY_BITS[category]
+
+    return {
+        "module": source.module,
+        "package": package,
+        "class_name": class_name,
+        "imports": imports,
+        "star_imports": star_imports,
+        "qualified_refs": qualified,
+        "type_refs": type_refs,
+        "resource_refs": resource_refs,
+        "direct": direct,
+    }
+
+
+def rules_digest(blocker_analyzer: ApiBlockerAnalyzer) -> str:
+    """Digest of the compiled blocker rules and the mask setting the direct masks were computed with."""
+    rules = [
+        [language, category, pattern.pattern, in_strings]
+        for language, language_rules in sorted(blocker_analyzer.rules.items())
+        for category, pattern, _, in_strings in language_rules
+    ]
+    payload = json.dumps({"rules": rules, "mask": blocker_analyzer.mask}, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def empty_index(repo_root: Path) -> dict:
+    return {
+        "version": INDEX_VERSION,
+        "repo_root": str(repo_root),
+        "categories": list(API_CATEGORIES),
+        "rules": rules_digest(ApiBlockerAnalyzer()),
+        "files": {},
+    }
+
+
+def load_index(index_path: Path, repo_root: Path) -> dict:
+    """Load the persisted index, or an empty one if it is missing or stale."""
+    empty = empty_index(repo_root)
+    if not index_path.exists():
+        return empty
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Warning: Could not load {index_path}: {e}")
+        return empty
+    if (index.get("version") != INDEX_VERSION
+            or index.get("repo_root") != str(repo_root)
+            or index.get("categories") != empty["categories"]
+            or index.get("rules") != empty["rules"]):
+        return empty
+    return index
+
+
+def update_file_entries(index: dict, repo_root: Path, scope: str = "main") -> dict:
+    """
+    Re-index the files of the scan scope whose size or mtime changed.
+
+    Files outside the scope are dropped like deleted files, so switching
+    scope is an incremental update as well.
+
+    Returns statistics, and the sets of changed and removed paths under the
+    "changed_paths" and "removed_paths" keys.
+    """
+    files: Dict[str, dict] = index["files"]
+    blocker_analyzer = ApiBlockerAnalyzer()
+    seen = set()
+    changed = set()
+
+    for file_path in find_java_files(repo_root, SOURCE_EXTENSIONS, scope=scope):
+        rel_path = file_path.relative_to(repo_root).as_posix()
+        seen.add(rel_path)
+        st = file_path.stat()
+        entry = files.get(rel_path)
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            continue
+
+        source = read_source_file(file_path, repo_root)
+        if source is None:
+            continue
+        new_entry = index_file(source, blocker_analyzer)
+        new_entry["mtime_ns"] = st.st_mtime_ns
+        new_entry["size"] = st.st_size
+        if entry:
+            new_entry["edges"] = entry.get("edges", [])
+            new_entry["closure"] = entry.get("closure", 0)
+        files[rel_path] = new_entry
+        changed.add(rel_path)
+
+    removed = set(files) - seen
+    for rel_path in removed:
+        del files[rel_path]
+
+    return {
+        "files": len(files),
+        "reindexed": len(changed),
+        "removed": len(removed),
+        "changed_paths": changed,
+        "removed_paths": removed,
+    }
+
+
+# =============================================================================
+# Dependency resolution
+# =============================================================================
+
+def build_class_table(files: Dict[str, dict]) -> tuple:
+    """Map fully qualified class names, and package -> simple name, to files."""
+    by_fqn: Dict[str, str] = {}
+    by_package: Dict[str, Dict[str, str]] = defaultdict(dict)
+    for rel_path, entry in sorted(files.items()):
+        name = entry["class_name"]
+        fqn = f"{entry['package']}.{name}" if entry["package"] else name
+        by_fqn.setdefault(fqn, rel_path)
+        by_package[entry["package"]].setdefault(name, rel_path)
+    return by_fqn, by_package
+
+
+def resolve_qualified(name: str, by_fqn: Dict[str, str]) -> Optional[str]:
+    """
+    Resolve a com.vladsch.flexmark.* name to the file declaring it.
+
+    Nested classes and static members (a.b.Outer.Inner, a.b.Outer.member)
+    resolve to the file of the outermost class.
+    """
+    if not name.startswith(INTERNAL_PREFIX):
+        return None
+    while True:
+        rel_path = by_fqn.get(name)
+        if rel_path is not None:
+            return rel_path
+        dot = name.rfind(".")
+        if dot <= len(INTERNAL_PREFIX):
+            return None
+        name = name[:dot]
+
+
+def resolve_edges(rel_path: str, entry: dict, by_fqn: Dict[str, str],
+                  by_package: Dict[str, Dict[str, str]]) -> List[str]:
+    """Files this file depends on: imports, star imports, same-package and qualified references."""
+    edges = set()
+    for name in entry["imports"]:
+        target = resolve_qualified(name, by_fqn)
+        if target:
+            edges.add(target)
+    for name in entry["qualified_refs"]:
+        target = resolve_qualified(name, by_fqn)
+        if target:
+            edges.add(target)
+
+    # Unqualified type names resolve against the own package and star-imported packages
+    packages = [entry["package"]]
+    for name in entry["star_imports"]:
+        if name in by_package:
+            packages.append(name)
+        else:
+            target = resolve_qualified(name, by_fqn)  # import a.b.Outer.*
+            if target:
+                edges.add(target)
+    refs = entry["type_refs"]
+    for package in packages:
+        classes = by_package.get(package, {})
+        edges.update(classes[ref] for ref in refs if ref in classes)
+
+    edges.discard(rel_path)
+    return sorted(edges)
+
+
+# =============================================================================
+# Closure
+# =============================================================================
+
+def strongly_connected_components(nodes: List[str], edges: Dict[str, List[str]]) -> List[List[str]]:
+    """
+    Tarjan's algorithm (iterative), restricted to nodes.
+
+    Components are returned in reverse topological order: every component
+    comes after the components it depends on.
+    """
+    node_set = set(nodes)
+    index_of: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+    counter = 0
+
+    for start in nodes:
+        if start in index_of:
+            continue
+        work = [(start, iter(edges[start]))]
+        index_of[start] = low[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            node, successors = work[-1]
+            advanced = False
+            for succ in successors:
+                if succ not in node_set:
+                    continue
+                if succ not in index_of:
+                    index_of[succ] = low[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(edges[succ])))
+                    advanced = True
+                    break
+                if succ in on_stack:
+                    low[node] = min(low[node], index_of[succ])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index_of[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+
+def update_closure(files: Dict[str, dict], dirty: Set[str], reverse: Dict[str, Set[str]]) -> int:
+    """
+    Recompute the closure mask of the dirty files and everything depending on them.
+
+    Any other file reaches no dirty file, so its reachable set, and with it its
+    stored closure, is unchanged. Returns the number of recomputed files.
+    """
+    affected = set(d for d in dirty if d in files)
+    frontier = list(affected)
+    while frontier:
+        node = frontier.pop()
+        for dependent in reverse.get(node, ()):
+            if dependent not in affected:
+                affected.add(dependent)
+                frontier.append(dependent)
+
+    edges = {rel_path: files[rel_path]["edges"] for rel_path in affected}
+    for component in strongly_connected_components(sorted(affected), edges):
+        members = set(component)
+        mask = 0
+        for member in component:
+            mask |= files[member]["direct"]
+            for dep in edges[member]:
+                if dep not in members:
+                    mask |= files[dep]["closure"]
+        for member in component:
+            files[member]["closure"] = mask
+            files[member]["cycle_size"] = len(component)
+
+    return len(affected)
+
+
+def update_index(index: dict, repo_root: Path, scope: str = "main") -> dict:
+    """Bring file entries, resolved edges and closures up to date."""
+    stats = update_file_entries(index, repo_root, scope)
+    files = index["files"]
+    by_fqn, by_package = build_class_table(files)
+
+    # Resolution is cheap (no I/O), so every file is re-resolved: an added or
+    # removed class can change what unchanged files resolve to.
+    dirty = set(stats.pop("changed_paths"))
+    old_reverse: Dict[str, Set[str]] = defaultdict(set)
+    reverse: Dict[str, Set[str]] = defaultdict(set)
+    for rel_path, entry in files.items():
+        old_edges = entry.get("edges")
+        for dep in old_edges or ():
+            old_reverse[dep].add(rel_path)
+        edges = resolve_edges(rel_path, entry, by_fqn, by_package)
+        if edges != old_edges or "closure" not in entry:
+            dirty.add(rel_path)
+        entry["edges"] = edges
+        for dep in edges:
+            reverse[dep].add(rel_path)
+
+    for rel_path in stats.pop("removed_paths"):
+        dirty.update(old_reverse.get(rel_path, ()))
+
+    stats["recomputed"] = update_closure(files, dirty, reverse)
+    return stats
+
+
+def save_index(index: dict, index_path: Path) -> None:
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_suffix(index_path.suffix + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(",", ":"))
+    tmp_path.replace(index_path)
+
+
+# =============================================================================
+# Report
+# =============================================================================
+
+def class_fqn(entry: dict) -> str:
+    return f"{entry['package']}.{entry['class_name']}" if entry["package"] else entry["class_name"]
+
+
+def generate_report(files: Dict[str, dict]) -> dict:
+    """Per-class direct/transitive blockers and per-module leakage."""
+    classes = {}
+    by_module: Dict[str, dict] = defaultdict(lambda: {
+        "classes": 0,
+        "directly_blocked": 0,
+        "transitively_blocked": 0,
+        "leaked_only": 0,
+        "inherited_categories": defaultdict(int),
+    })
+    category_totals = {category: {"direct": 0, "transitive": 0} for category in API_CATEGORIES}
+
+    for rel_path in sorted(files):
+        entry = files[rel_path]
+        direct, closure = entry["direct"], entry["closure"]
+        inherited = closure & ~direct
+
+        # One dependency through which each inherited category arrives
+        via = {}
+        for category in categories_of(inherited):
+            bit = CATEGORY_BITS[category]
+            for dep in entry["edges"]:
+                if files[dep]["closure"] & bit:
+                    via[category] = class_fqn(files[dep])
+                    break
+
+        classes[class_fqn(entry)] = {
+            "file": rel_path,
+            "module": entry["module"],
+            "direct": categories_of(direct),
+            "transitive": categories_of(closure),
+            "inherited_via": via,
+            "dependencies": len(entry["edges"]),
+            "cycle_size": entry.get("cycle_size", 1),
+        }
+
+        stats = by_module[entry["module"]]
+        stats["classes"] += 1
+        if direct:
+            stats["directly_blocked"] += 1
+        if closure:
+            stats["transitively_blocked"] += 1
+        if closure and not direct:
+            stats["leaked_only"] += 1
+        for category in categories_of(inherited):
+            stats["inherited_categories"][category] += 1
+        for category in categories_of(direct):
+            category_totals[category]["direct"] += 1
+        for category in categories_of(closure):
+            category_totals[category]["transitive"] += 1
+
+    modules = {}
+    for module, stats in sorted(by_module.items()):
+        stats["inherited_categories"] = dict(sorted(stats["inherited_categories"].items()))
+        stats["research_tier"] = RESEARCH_TIERS.get(module)
+        modules[module] = stats
+
+    # Modules the research put in tier 1 whose classes still reach HIGH/MEDIUM blockers
+    serious = 0
+    for category, config in API_CATEGORIES.items():
+        if config["impact"] in ("HIGH", "MEDIUM"):
+            serious |= CATEGORY_BITS[category]
+    tier_leaks = {}
+    for module, stats in modules.items():
+        if stats["research_tier"] != 1:
+            continue
+        leaked = sorted(
+            fqn for fqn, data in classes.items()
+            if data["module"] == module
+            and any(CATEGORY_BITS[c] & serious for c in data["transitive"])
+        )
+        if leaked:
+            tier_leaks[module] = leaked
+
+    cycles = sum(1 for e in files.values() if e.get("cycle_size", 1) > 1)
+
+    return {
+        "summary": {
+            "total_classes": len(classes),
+            "directly_blocked": sum(1 for c in classes.values() if c["direct"]),
+            "transitively_blocked": sum(1 for c in classes.values() if c["transitive"]),
+            "leaked_only": sum(1 for c in classes.values() if c["transitive"] and not c["direct"]),
+            "classes_in_import_cycles": cycles,
+            "edges": sum(len(e["edges"]) for e in files.values()),
+            "by_category": {
+                category: {
+                    "impact": API_CATEGORIES[category]["impact"],
+                    "direct_classes": totals["direct"],
+                    "transitive_classes": totals["transitive"],
+                }
+                for category, totals in category_totals.items()
+            },
+        },
+        "tier_1_leaks": tier_leaks,
+        "by_module": modules,
+        "classes": classes,
+    }
+
+
+def print_summary(report: dict, stats: dict) -> None:
+    """Print a human-readable summary to console."""
+    print("\n" + "=" * 70)
+    print("CLASS-LEVEL BLOCKER PROPAGATION - SUMMARY")
+    print("=" * 70)
+
+    summary = report["summary"]
+    print(f"\nIndex: {stats['files']} files, {stats['reindexed']} re-indexed, "
+          f"{stats['removed']} removed, {stats['recomputed']} closures recomputed")
+    print(f"Classes: {summary['total_classes']} ({summary['edges']} internal dependencies, "
+          f"{summary['classes_in_import_cycles']} in import cycles)")
+    print(f"  Directly blocked:     {summary['directly_blocked']}")
+    print(f"  Transitively blocked: {summary['transitively_blocked']}")
+    print(f"  Leaked only:          {summary['leaked_only']} (no blocker of their own)")
+
+    print(f"\n{'Category':<28} {'Impact':<8} {'Direct':>8} {'Transitive':>11}")
+    print("-" * 70)
+    for category, data in summary["by_category"].items():
+        print(f"{category:<28} {data['impact']:<8} {data['direct_classes']:>8} {data['transitive_classes']:>11}")
+
+    print("\n" + "-" * 70)
+    print("MODULES BY LEAKED CLASSES")
+    print("-" * 70)
+    ranked = sorted(report["by_module"].items(), key=lambda item: (-item[1]["leaked_only"], item[0]))
+    for module, data in ranked[:15]:
+        if not data["leaked_only"]:
+            break
+        tier = data["research_tier"] if data["research_tier"] is not None else "-"
+        print(f"  {module:<40} tier {tier}  {data['leaked_only']:>4} of {data['classes']:>4} classes")
+
+    if report["tier_1_leaks"]:
+        print("\n" + "-" * 70)
+        print("TIER 1 MODULES REACHING HIGH/MEDIUM BLOCKERS")
+        print("-" * 70)
+        for module, leaked in report["tier_1_leaks"].items():
+            print(f"  {module}: {len(leaked)} classes")
+            for fqn in leaked[:3]:
+                data = report["classes"][fqn]
+                via = ", ".join(f"{c} via {v.rsplit('.', 1)[-1]}" for c, v in data["inherited_via"].items())
+                print(f"    {fqn.rsplit('.', 1)[-1]}: {via or ', '.join(data['direct'])}")
+
+    print("\n" + "=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Propagate Java API blockers between classes over the import graph"
+    )
+    parser.add_argument(
+        "--repo-root",
+        type=Path,
+        default=Path(__file__).parent.parent.parent,
+        help="Path to repository root (default: two levels up from script)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Output JSON file path (default: .ai_out/.../class_blockers.json)"
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=None,
+        help="Persistent index path (default: .ai_out/.../class_index.json)"
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ignore the persisted index and re-index every file"
+    )
+    parser.add_argument(
+        "--scope",
+        choices=list(SCOPES),
+        default="main",
+        help="Source sets to index: main, test, testFixtures or all (default: main)"
+    )
+    args = parser.parse_args()
+
+    repo_root = args.repo_root.resolve()
+    if not repo_root.exists():
+        print(f"Error: Repository root does not exist: {repo_root}")
+        sys.exit(1)
+
+    output_dir = repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = args.output or output_dir / "class_blockers.json"
+    index_path = args.index or output_dir / "class_index.json"
+
+    print(f"Indexing classes in: {repo_root}")
+    started = time.perf_counter()
+    index = empty_index(repo_root) if args.rebuild else load_index(index_path, repo_root)
+    stats = update_index(index, repo_root, args.scope)
+    save_index(index, index_path)
+
+    report = {"scope": args.scope, **generate_report(index["files"])}
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\nJSON report written to: {output_path}")
+    print(f"Index written to: {index_path} ({time.perf_counter() - started:.2f}s)")
+    print_summary(report, stats)
+
+
+if __name__ == "__main__":
+    main()
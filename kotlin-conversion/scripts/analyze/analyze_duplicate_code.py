@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""
+Find near-duplicate classes and methods across modules.
+
+Many modules carry near-copies of visitor, formatter and option-holder
+classes; each copy would otherwise be converted separately. This script:
+
+- Splits every Java file into code units: named classes (including nested
+  ones) and methods, constructors and initializer blocks, using the brace
+  walk of analyze_hot_paths.py.
+- Tokenizes each unit with comments removed, string and number literals
+  replaced by a placeholder and, by default, identifiers replaced as well, so
+  copies that only rename things still match. Keywords, operators and
+  punctuation are kept.
+- Builds the k-token shingles of each unit (repeats counted) and its MinHash
+  signature. The hash values of a shingle for all signature positions come
+  from one SHAKE-128 digest, so signatures are stable across runs and shards.
+- Finds candidate pairs with locality-sensitive hashing: signatures are cut
+  into bands, and only units of the same kind sharing a band bucket are
+  compared, instead of all pairs.
+- Joins candidates whose estimated Jaccard similarity reaches the threshold
+  into clusters (union-find). A cluster whose members all lie inside the
+  members of one class cluster (the methods of duplicated classes) is folded
+  into that cluster.
+- Counts the API blocker findings (analyze_java_api_blockers.py categories)
+  inside every member, and per cluster the categories shared by all members:
+  migrating one copy shows how to migrate all of them.
+
+Usage:
+    python analyze_duplicate_code.py [--repo-root PATH] [--output PATH] [--scope main]
+                                     [--threshold 0.8] [--shingle 5] [--min-tokens 50]
+                                     [--keep-identifiers]
+
+Output:
+    JSON report with duplicate clusters ranked by duplicated tokens, their
+    similarity and shared blockers, and duplicated code per module.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from array import array
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from analyze_hot_paths import code_spans
+from analyze_java_api_blockers import (
+    SCOPES,
+    Analyzer,
+    ApiBlockerAnalyzer,
+    LineMasker,
+    SourceFile,
+    analyze_by_module,
+    find_java_files,
+)
+
+
+# Signature length; a similarity estimate has a standard error of about
+# sqrt(J * (1 - J) / NUM_PERM), 0.035 at J = 0.8
+NUM_PERM = 128
+
+JAVA_KEYWORDS = frozenset("""
+    abstract assert boolean break byte case catch char class const continue default do double
+    else enum extends final finally float for goto if implements import instanceof int interface
+    long native new package private protected public return short static strictfp super switch
+    synchronized this throw throws transient try void volatile while var yield record true false null
+""".split())
+
+TOKEN_RE = re.compile(r'''
+    (?P<literal>"\s*"|'\s*'|\d[\w.]*)   # string contents are blanked by the masker
+  | (?P<word>[A-Za-z_$][\w$]*)
+  | (?P<op>::|->|\+\+|--|&&|\|\||[=!<>]=|\S)
+''', re.VERBOSE)
+
+LITERAL_TOKEN = "$L"
+IDENTIFIER_TOKEN = "$I"
+
+
+@dataclass
+class CodeUnit:
+    """A class or method of one file with its MinHash signature."""
+    kind: str  # "class" or "method"
+    name: str  # Outer$Inner or Outer$Inner.method
+    file: str
+    module: str
+    start: int  # first line, 1-based
+    end: int  # last line
+    tokens: int
+    signature: List[int]
+    blockers: Dict[str, int] = field(default_factory=dict)
+
+    def contains(self, other: "CodeUnit") -> bool:
+        return (self is not other and self.file == other.file
+                and self.start <= other.start and other.end <= self.end)
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "file": self.file,
+            "module": self.module,
+            "start": self.start,
+            "end": self.end,
+            "tokens": self.tokens,
+            "blockers": self.blockers,
+        }
+
+
+def normalized_tokens(lines: List[str], keep_identifiers: bool = False) -> List[Tuple[int, str]]:
+    """(line_number, token) of a file, with comments dropped and literals (and identifiers) normalized."""
+    masker = LineMasker(lines)
+    tokens = []
+    for index in range(len(lines)):
+        for match in TOKEN_RE.finditer(masker.masked(index)[0]):
+            text = match.group(0)
+            if match.lastgroup == "literal":
+                text = LITERAL_TOKEN
+            elif match.lastgroup == "word" and not keep_identifiers and text not in JAVA_KEYWORDS:
+                text = IDENTIFIER_TOKEN
+            tokens.append((index + 1, text))
+    return tokens
+
+
+def shingle_hashes(shingle: str) -> array:
+    """NUM_PERM independent 32-bit hash values of a shingle."""
+    return array("I", hashlib.shake_128(shingle.encode("utf-8")).digest(4 * NUM_PERM))
+
+
+def minhash(tokens: List[str], k: int) -> List[int]:
+    """
+    MinHash signature of the k-token shingles of a token sequence.
+
+    Repeated shingles are numbered (the second "a b c" becomes "a b c#2"), so
+    the signature estimates the Jaccard similarity of shingle multisets and a
+    list of 40 similar statements does not match a list of 4.
+    """
+    seen: Dict[str, int] = defaultdict(int)
+    shingles = []
+    for i in range(max(len(tokens) - k + 1, 1)):
+        shingle = " ".join(tokens[i:i + k])
+        seen[shingle] += 1
+        shingles.append(f"{shingle}#{seen[shingle]}")
+    return list(map(min, zip(*(shingle_hashes(s) for s in shingles))))
+
+
+def similarity(a: List[int], b: List[int]) -> float:
+    """Jaccard similarity estimated from two MinHash signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def lsh_parameters(threshold: float, num_perm: int = NUM_PERM) -> Tuple[int, int]:
+    """
+    (bands, rows) minimizing the false positive plus false negative
+    probability mass around threshold; units that share a band are candidates
+    with probability 1 - (1 - s^rows)^bands at similarity s.
+    """
+    def area(probability, low: float, high: float, steps: int = 50) -> float:
+        width = (high - low) / steps
+        return sum(probability(low + (i + 0.5) * width) for i in range(steps)) * width
+
+    best = None
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            false_positive = area(lambda s: 1 - (1 - s ** rows) ** bands, 0.0, threshold)
+            false_negative = area(lambda s: (1 - s ** rows) ** bands, threshold, 1.0)
+            error = false_positive + false_negative
+            if best is None or error < best[0]:
+                best = (error, bands, rows)
+    return best[1], best[2]
+
+
+def extract_units(source: SourceFile, shingle: int, min_tokens: int, keep_identifiers: bool,
+                  blocker_analyzer: ApiBlockerAnalyzer) -> List[CodeUnit]:
+    """Classes and methods of a Java file with at least min_tokens tokens."""
+    spans, classes = code_spans(source.lines)
+    ranges = [("class", name, start, end) for name, start, end in classes]
+    ranges += [("method", f"{s.class_path}.{s.method}", s.start, s.end) for s in spans]
+    if not ranges:
+        return []
+
+    tokens = normalized_tokens(source.lines, keep_identifiers)
+    finding_lines = [
+        (category, finding.line_number)
+        for category, report in blocker_analyzer.analyze(source).items()
+        for finding in report.findings
+    ]
+
+    units = []
+    for kind, name, start, end in ranges:
+        unit_tokens = [text for line, text in tokens if start <= line <= end]
+        if len(unit_tokens) < min_tokens:
+            continue
+        blockers: Dict[str, int] = defaultdict(int)
+        for category, line in finding_lines:
+            if start <= line <= end:
+                blockers[category] += 1
+        units.append(CodeUnit(
+            kind=kind,
+            name=name,
+            file=source.rel_path,
+            module=source.module,
+            start=start,
+            end=end,
+            tokens=len(unit_tokens),
+            signature=minhash(unit_tokens, shingle),
+            blockers=dict(sorted(blockers.items())),
+        ))
+    return units
+
+
+def find_clusters(units: List[CodeUnit], threshold: float) -> Tuple[List[List[int]], Dict[Tuple[int, int], float], int]:
+    """
+    Clusters (lists of unit indices) of near-duplicates, the estimated
+    similarity of every joined pair, and the number of LSH candidate pairs.
+    """
+    bands, rows = lsh_parameters(threshold)
+    buckets: Dict[tuple, List[int]] = defaultdict(list)
+    for index, unit in enumerate(units):
+        for band in range(bands):
+            key = (unit.kind, band, tuple(unit.signature[band * rows:(band + 1) * rows]))
+            buckets[key].append(index)
+
+    candidates: Set[Tuple[int, int]] = set()
+    for members in buckets.values():
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                candidates.add((a, b))
+
+    parent = list(range(len(units)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    edges: Dict[Tuple[int, int], float] = {}
+    for a, b in candidates:
+        if units[a].contains(units[b]) or units[b].contains(units[a]):
+            continue
+        score = similarity(units[a].signature, units[b].signature)
+        if score >= threshold:
+            edges[(a, b)] = score
+            parent[find(a)] = find(b)
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for index in range(len(units)):
+        groups[find(index)].append(index)
+    clusters = [members for members in groups.values() if len(members) > 1]
+    return clusters, edges, len(candidates)
+
+
+def fold_nested_clusters(clusters: List[List[int]], units: List[CodeUnit]) -> Dict[int, int]:
+    """Cluster index -> index of the class cluster all of whose members contain its members."""
+    owner_of: Dict[int, int] = {}
+    class_members: Dict[str, List[Tuple[CodeUnit, int]]] = defaultdict(list)
+    for cluster_index, members in enumerate(clusters):
+        for index in members:
+            if units[index].kind == "class":
+                class_members[units[index].file].append((units[index], cluster_index))
+
+    for cluster_index, members in enumerate(clusters):
+        common: Optional[Set[int]] = None
+        for index in members:
+            containing = {c for unit, c in class_members[units[index].file]
+                          if c != cluster_index and unit.contains(units[index])}
+            common = containing if common is None else common & containing
+            if not common:
+                break
+        if common:
+            owner_of[cluster_index] = min(common)
+    return owner_of
+
+
+def generate_report(by_module: Dict[str, List[CodeUnit]], settings: dict) -> dict:
+    """Generate the final JSON report structure."""
+    units = [unit for module_units in by_module.values() for unit in module_units]
+    units.sort(key=lambda u: (u.file, u.start, u.kind))
+    clusters, edges, candidate_count = find_clusters(units, settings["threshold"])
+    owner_of = fold_nested_clusters(clusters, units)
+
+    cluster_edges: Dict[int, List[float]] = defaultdict(list)
+    cluster_of = {index: c for c, members in enumerate(clusters) for index in members}
+    for (a, _), score in edges.items():
+        cluster_edges[cluster_of[a]].append(score)
+
+    entries = []
+    for cluster_index, members in enumerate(clusters):
+        if cluster_index in owner_of:
+            continue
+        member_units = sorted((units[i] for i in members), key=lambda u: (u.module, u.file, u.start))
+        scores = cluster_edges[cluster_index]
+        blockers: Dict[str, dict] = {}
+        for unit in member_units:
+            for category, count in unit.blockers.items():
+                entry = blockers.setdefault(category, {"members": 0, "findings": 0})
+                entry["members"] += 1
+                entry["findings"] += count
+        token_counts = [u.tokens for u in member_units]
+        entries.append({
+            "kind": member_units[0].kind,
+            "size": len(member_units),
+            "modules": sorted({u.module for u in member_units}),
+            "similarity": {
+                "min": round(min(scores), 3),
+                "mean": round(sum(scores) / len(scores), 3),
+                "max": round(max(scores), 3),
+            },
+            "tokens": sum(token_counts),
+            "duplicated_tokens": sum(token_counts) - max(token_counts),
+            "blockers": dict(sorted(blockers.items())),
+            "shared_blockers": sorted(c for c, b in blockers.items() if b["members"] == len(member_units)),
+            "nested_clusters": sum(1 for owner in owner_of.values() if owner == cluster_index),
+            "members": [u.to_dict() for u in member_units],
+        })
+    entries.sort(key=lambda c: (-len(c["modules"]), -c["duplicated_tokens"], c["members"][0]["file"]))
+
+    modules: Dict[str, dict] = {}
+    for module in sorted(by_module):
+        modules[module] = {"units": len(by_module[module]), "clusters": 0, "units_in_clusters": 0,
+                           "tokens_in_clusters": 0, "cross_module_clusters": 0}
+    for cluster in entries:
+        for module in cluster["modules"]:
+            modules[module]["clusters"] += 1
+            modules[module]["cross_module_clusters"] += len(cluster["modules"]) > 1
+        for member in cluster["members"]:
+            modules[member["module"]]["units_in_clusters"] += 1
+            modules[member["module"]]["tokens_in_clusters"] += member["tokens"]
+
+    kinds = defaultdict(int)
+    for unit in units:
+        kinds[unit.kind] += 1
+    bands, rows = lsh_parameters(settings["threshold"])
+    return {
+        "settings": {**settings, "num_perm": NUM_PERM, "bands": bands, "rows": rows},
+        "summary": {
+            "units": dict(sorted(kinds.items())),
+            "candidate_pairs": candidate_count,
+            "similar_pairs": len(edges),
+            "clusters": len(entries),
+            "folded_clusters": len(owner_of),
+            "cross_module_clusters": sum(1 for c in entries if len(c["modules"]) > 1),
+            "duplicated_tokens": sum(c["duplicated_tokens"] for c in entries),
+            "clusters_with_shared_blockers": sum(1 for c in entries if c["shared_blockers"]),
+        },
+        "clusters": entries,
+        "by_module": dict(sorted(
+            modules.items(), key=lambda item: (-item[1]["tokens_in_clusters"], item[0])
+        )),
+    }
+
+
+class DuplicateCodeAnalyzer(Analyzer):
+    """Analyzer plugin contributing the "duplicates" report section."""
+    name = "duplicates"
+
+    def __init__(self, threshold: float = 0.8, shingle: int = 5, min_tokens: int = 50,
+                 keep_identifiers: bool = False):
+        self.settings = {
+            "threshold": threshold,
+            "shingle": shingle,
+            "min_tokens": min_tokens,
+            "keep_identifiers": keep_identifiers,
+        }
+        self.blocker_analyzer = ApiBlockerAnalyzer()
+
+    def analyze(self, source: SourceFile) -> List[CodeUnit]:
+        if source.language != "java":
+            return []
+        return extract_units(source, self.settings["shingle"], self.settings["min_tokens"],
+                             self.settings["keep_identifiers"], self.blocker_analyzer)
+
+    def merge(self, results: List[List[CodeUnit]]) -> List[CodeUnit]:
+        merged = results[0]
+        for units in results[1:]:
+            merged.extend(units)
+        return merged
+
+    def report(self, module_results: Dict[str, List[CodeUnit]]) -> dict:
+        return {self.name: generate_report(module_results, self.settings)}
+
+    def dump_results(self, module_results: Dict[str, List[CodeUnit]]) -> dict:
+        return {module: [asdict(unit) for unit in units] for module, units in module_results.items()}
+
+    def load_results(self, data: dict) -> Dict[str, List[CodeUnit]]:
+        return {module: [CodeUnit(**unit) for unit in units] for module, units in data.items()}
+
+    def print_summary(self, report: dict) -> None:
+        print_summary(report[self.name])
+
+
+def print_summary(report: dict) -> None:
+    """Print a human-readable summary to console."""
+    print("\n" + "=" * 70)
+    print("DUPLICATE CODE ANALYSIS - SUMMARY")
+    print("=" * 70)
+
+    summary = report["summary"]
+    settings = report["settings"]
+    units = ", ".join(f"{count} {kind}es" if kind == "class" else f"{count} {kind}s"
+                      for kind, count in summary["units"].items())
+    print(f"\nCode units (>= {settings['min_tokens']} tokens): {units}")
+    print(f"LSH: {settings['bands']} bands x {settings['rows']} rows, "
+          f"{summary['candidate_pairs']} candidate pairs, "
+          f"{summary['similar_pairs']} with similarity >= {settings['threshold']}")
+    print(f"Clusters: {summary['clusters']} ({summary['cross_module_clusters']} across modules, "
+          f"{summary['folded_clusters']} nested clusters folded into class clusters)")
+    print(f"Duplicated tokens: {summary['duplicated_tokens']}")
+    print(f"Clusters sharing blockers: {summary['clusters_with_shared_blockers']}")
+
+    print("\n" + "-" * 70)
+    print("LARGEST CROSS-MODULE CLUSTERS:")
+    print("-" * 70)
+    for cluster in [c for c in report["clusters"] if len(c["modules"]) > 1][:15]:
+        print(f"\n  {cluster['kind']} x{cluster['size']}, similarity {cluster['similarity']['min']}"
+              f"-{cluster['similarity']['max']}, {cluster['duplicated_tokens']} duplicated tokens")
+        if cluster["shared_blockers"]:
+            print(f"    shared blockers: {', '.join(cluster['shared_blockers'])}")
+        for member in cluster["members"][:5]:
+            print(f"    - {member['module']}: {member['name']} ({member['tokens']} tokens)")
+        if cluster["size"] > 5:
+            print(f"    ... and {cluster['size'] - 5} more")
+
+    print("\n" + "-" * 70)
+    print("BY MODULE (tokens in duplicate clusters):")
+    print("-" * 70)
+    for module, data in list(report["by_module"].items())[:15]:
+        if data["tokens_in_clusters"]:
+            print(f"  {module}: {data['units_in_clusters']} units in {data['clusters']} clusters, "
+                  f"{data['tokens_in_clusters']} tokens ({data['cross_module_clusters']} across modules)")
+
+    print("\n" + "=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Find near-duplicate classes and methods across modules with MinHash/LSH"
+    )
+    parser.add_argument(
+        "--repo-root",
+        type=Path,
+        default=Path(__file__).parent.parent.parent,
+        help="Path to repository root (default: two levels up from script)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Output JSON file path (default: .ai_out/.../duplicate_code.json)"
+    )
+    parser.add_argument(
+        "--scope",
+        choices=list(SCOPES),
+        default="main",
+        help="Source sets to scan: main, test, testFixtures or all (default: main)"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.8,
+        help="Minimum estimated Jaccard similarity of duplicates (default: 0.8)"
+    )
+    parser.add_argument(
+        "--shingle",
+        type=int,
+        default=5,
+        help="Tokens per shingle (default: 5)"
+    )
+    parser.add_argument(
+        "--min-tokens",
+        type=int,
+        default=50,
+        help="Ignore classes and methods with fewer tokens (default: 50)"
+    )
+    parser.add_argument(
+        "--keep-identifiers",
+        action="store_true",
+        help="Compare identifiers as written instead of normalizing them"
+    )
+    args = parser.parse_args()
+
+    if not 0 < args.threshold <= 1:
+        parser.error("--threshold must be in (0, 1]")
+    if args.shingle < 1 or args.min_tokens < 1:
+        parser.error("--shingle and --min-tokens must be positive")
+
+    repo_root = args.repo_root.resolve()
+
+    if args.output:
+        output_path = args.output
+    else:
+        output_dir = repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / "duplicate_code.json"
+
+    print(f"Analyzing duplicate code in: {repo_root}")
+
+    java_files = find_java_files(repo_root, scope=args.scope)
+    print(f"Found {len(java_files)} Java files (scope: {args.scope})")
+
+    analyzer = DuplicateCodeAnalyzer(args.threshold, args.shingle, args.min_tokens, args.keep_identifiers)
+    results = analyze_by_module(java_files, repo_root, [analyzer])
+    report = generate_report(results[analyzer.name], analyzer.settings)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\nJSON report written to: {output_path}")
+    print_summary(report)
+
+
+if __name__ == "__main__":
+    main()
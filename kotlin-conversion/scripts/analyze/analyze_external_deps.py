@@ -248,7 +248,8 @@ def generate_report(module_deps: Dict[str, List[Dependency]]) -> dict:
             },
             "internal_dependencies": {
                 "count": len(internal_deps),
-                "modules": [d.artifact_id for d in internal_deps]
+                "modules": [d.artifact_id for d in internal_deps],
+                "scopes": {d.artifact_id: d.scope for d in internal_deps}
             }
         }
 
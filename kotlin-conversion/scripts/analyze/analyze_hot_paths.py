@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+"""
+Weight blocker findings by how hot their code is at runtime.
+
+java_api_blockers.json treats a Pattern.compile in a cold utility the same as
+one in the inline parser. This script ingests profiler output and JMH results
+and ranks findings and modules by the share of runtime spent in their code,
+so that migration (e.g. to kotlin.text.Regex) can start where runtime
+performance is most at risk.
+
+Inputs:
+- Collapsed stacks ("frame;frame;...;frame count" per line), as written by
+  async-profiler (-o collapsed, also via JMH -prof async:output=collapsed) or
+  by JFR-to-collapsed converters. Both com/x/Y.m_[j] and com.x.Y.m frames are
+  understood; lambda$m$0 frames count for method m.
+- JMH JSON results (-rf json). A profile whose path names a benchmark (as JMH
+  async-profiler output directories do) is weighted by the time per operation
+  of that benchmark; other profiles count equally. Profile weights sum to 1.
+
+Attribution:
+- A sample counts once for every repository method, class (file) and module
+  on its stack (inclusive weight), and as self weight for the repository frame
+  closest to the leaf.
+- A finding's weight is the inclusive weight of the method enclosing its line.
+  Findings in field initializers belong to <clinit> or <init>. A finding in a
+  method (or initializer) without samples has weight 0; only findings outside
+  every class body (imports, package-level code) fall back to the weight of
+  the class.
+- The blocker weight of a module or category is the share of samples passing
+  through code with at least one of its findings.
+
+Usage:
+    python analyze_hot_paths.py --profile PATH [--profile PATH ...] [--jmh PATH ...]
+                                [--repo-root PATH] [--blockers PATH] [--output PATH] [--top N]
+
+    --profile accepts collapsed-stack files or directories, which are searched
+    for files named *collapsed*.
+
+Prerequisites:
+    java_api_blockers.json (run analyze_java_api_blockers.py first).
+
+Output:
+    JSON report with profile and benchmark weights, the hottest repository
+    methods, and findings and modules ranked by hot-path weight.
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from analyze_class_blockers import PACKAGE_RE
+from analyze_java_api_blockers import LineMasker, find_java_files, get_module_name
+from analyze_module_feasibility import load_json_report
+
+
+# async-profiler frame type suffixes: _[j] JIT-compiled, _[i] inlined, _[k] kernel, ...
+FRAME_SUFFIX_RE = re.compile(r'_\[\w+\]$')
+LAMBDA_METHOD_RE = re.compile(r'^lambda\$(\w+?)\$\d+$')
+
+CLASS_DECL_RE = re.compile(r'\b(?:class|interface|enum|record|@interface)\s+(\w+)')
+METHOD_DECL_RE = re.compile(r'(\w+)\s*\((?:[^()]|\([^()]*\))*\)\s*(?:throws\s+[\w.,\s]+)?$')
+ANONYMOUS_RE = re.compile(r'\bnew\s+[\w.<>,\s?]+\((?:[^()]|\([^()]*\))*\)\s*$')
+NOT_METHODS = {"if", "for", "while", "switch", "catch", "synchronized", "try", "return", "new", "else", "do"}
+
+# JMH time units, in milliseconds
+TIME_UNITS_MS = {"ns": 1e-6, "us": 1e-3, "ms": 1.0, "s": 1000.0, "min": 60000.0}
+
+
+@dataclass
+class MethodSpan:
+    """A method body (or class-body initializer) of a Java file."""
+    class_path: str  # Outer$Inner
+    method: str
+    start: int  # first line, 1-based
+    end: int  # last line
+
+
+def code_spans(lines: List[str]) -> Tuple[List[MethodSpan], List[Tuple[str, int, int]]]:
+    """
+    Methods, constructors and initializer blocks of a Java file with their
+    line ranges, and (class_path, start, end) of every named class.
+
+    Braces are matched on code with comments and literals masked. Anonymous
+    and local classes and lambdas stay part of the enclosing method.
+    """
+    masker = LineMasker(lines)
+    spans: List[MethodSpan] = []
+    classes: List[Tuple[str, int, int]] = []
+    # Open braces: (kind, name, start line); kind is "class", "method", "anonymous" or "block"
+    stack: List[Tuple[str, str, int]] = []
+    header = ""
+
+    for index in range(len(lines)):
+        for char in masker.masked(index)[0]:
+            if char == '{':
+                head = header.strip()
+                enclosing_class = next((name for kind, name, _ in reversed(stack) if kind == "class"), None)
+                class_match = CLASS_DECL_RE.search(head)
+                method_match = METHOD_DECL_RE.search(head)
+                if any(kind in ("method", "anonymous") for kind, _, _ in stack):
+                    stack.append(("block", "", index + 1))
+                elif ANONYMOUS_RE.search(head):
+                    stack.append(("anonymous", "", index + 1))
+                elif class_match:
+                    name = class_match.group(1)
+                    stack.append(("class", f"{enclosing_class}${name}" if enclosing_class else name, index + 1))
+                elif enclosing_class and method_match and method_match.group(1) not in NOT_METHODS:
+                    name = method_match.group(1)
+                    simple = enclosing_class.rsplit("$", 1)[-1]
+                    stack.append(("method", "<init>" if name == simple else name, index + 1))
+                elif enclosing_class and stack[-1][0] == "class" and head in ("", "static"):
+                    stack.append(("method", "<clinit>" if head == "static" else "<init>", index + 1))
+                else:
+                    stack.append(("block", "", index + 1))
+                header = ""
+            elif char == '}':
+                if stack:
+                    kind, name, start = stack.pop()
+                    if kind == "method":
+                        enclosing_class = next(n for k, n, _ in reversed(stack) if k == "class")
+                        spans.append(MethodSpan(enclosing_class, name, start, index + 1))
+                    elif kind == "class":
+                        classes.append((name, start, index + 1))
+                header = ""
+            elif char == ';':
+                header = ""
+            else:
+                header += char
+        header += " "
+
+    return spans, classes
+
+
+def enclosing_method(line_number: int, lines: List[str],
+                     spans: List[MethodSpan], classes: List[Tuple[str, int, int]]) -> Optional[Tuple[str, str]]:
+    """(class_path, method) containing a line: the innermost method, else the initializer of the innermost class."""
+    containing = [s for s in spans if s.start <= line_number <= s.end]
+    if containing:
+        span = max(containing, key=lambda s: s.start)
+        return span.class_path, span.method
+    owners = [c for c in classes if c[1] <= line_number <= c[2]]
+    if not owners:
+        return None
+    class_path = max(owners, key=lambda c: c[1])[0]
+    line = lines[line_number - 1] if line_number <= len(lines) else ""
+    return class_path, "<clinit>" if re.search(r'\bstatic\b', line) else "<init>"
+
+
+def parse_frame(frame: str) -> Optional[Tuple[str, str]]:
+    """(class name with $ nesting, method) of a Java frame, or None for native and kernel frames."""
+    frame = FRAME_SUFFIX_RE.sub("", frame.strip())
+    if "(" in frame:
+        frame = frame[:frame.index("(")]
+    frame = frame.replace("/", ".")
+    if "." not in frame:
+        return None
+    class_name, method = frame.rsplit(".", 1)
+    lambda_match = LAMBDA_METHOD_RE.match(method)
+    if lambda_match:
+        method = lambda_match.group(1)
+    if "$$Lambda" in class_name:
+        class_name = class_name[:class_name.index("$$Lambda")]
+    return class_name, method
+
+
+def read_collapsed(path: Path) -> List[Tuple[List[str], int]]:
+    """(frames, sample count) per line of a collapsed-stack file; malformed lines are skipped."""
+    stacks = []
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack and count.isdigit():
+                stacks.append((stack.split(";"), int(count)))
+    return stacks
+
+
+def find_profiles(paths: List[Path]) -> List[Path]:
+    """Collapsed-stack files given directly or found under directories."""
+    profiles = []
+    for path in paths:
+        if path.is_dir():
+            profiles.extend(sorted(p for p in path.rglob("*collapsed*") if p.is_file()))
+        else:
+            profiles.append(path)
+    return profiles
+
+
+def time_per_op_ms(result: dict) -> Optional[float]:
+    """Milliseconds per operation of a JMH result, from throughput or time-per-op modes."""
+    metric = result.get("primaryMetric", {})
+    score, unit = metric.get("score"), metric.get("scoreUnit", "")
+    if not score:
+        return None
+    if unit.startswith("ops/"):
+        scale = TIME_UNITS_MS.get(unit[4:])
+        return scale / score if scale else None
+    if unit.endswith("/op"):
+        scale = TIME_UNITS_MS.get(unit[:-3])
+        return score * scale if scale else None
+    return None
+
+
+def load_benchmarks(paths: List[Path]) -> List[dict]:
+    """Benchmarks of JMH JSON result files."""
+    benchmarks = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for result in json.load(f):
+                metric = result.get("primaryMetric", {})
+                benchmarks.append({
+                    "benchmark": result["benchmark"],
+                    "mode": result.get("mode"),
+                    "score": metric.get("score"),
+                    "score_unit": metric.get("scoreUnit"),
+                    "ms_per_op": time_per_op_ms(result),
+                })
+    return benchmarks
+
+
+def profile_weights(profiles: List[Path], benchmarks: List[dict]) -> List[dict]:
+    """
+    Weight of each profile, summing to 1.
+
+    A profile whose path contains a benchmark name (the full name, or
+    Class.method) is weighted by that benchmark's time per operation relative
+    to the mean of the profiled benchmarks; other profiles have weight 1
+    before normalization.
+    """
+    matched: Dict[Path, dict] = {}
+    for profile in profiles:
+        text = profile.as_posix()
+        candidates = [b for b in benchmarks if b["ms_per_op"] and (
+            b["benchmark"] in text or ".".join(b["benchmark"].split(".")[-2:]) in text)]
+        if candidates:
+            matched[profile] = max(candidates, key=lambda b: len(b["benchmark"]))
+
+    times = [b["ms_per_op"] for b in matched.values()]
+    mean = sum(times) / len(times) if times else 1.0
+    raw = [matched[p]["ms_per_op"] / mean if p in matched else 1.0 for p in profiles]
+    total = sum(raw) or 1.0
+    return [
+        {
+            "path": str(profile),
+            "benchmark": matched[profile]["benchmark"] if profile in matched else None,
+            "weight": weight / total,
+        }
+        for profile, weight in zip(profiles, raw)
+    ]
+
+
+def class_files(repo_root: Path) -> Dict[str, Tuple[str, str]]:
+    """Top-level class FQN -> (repo-relative path, module) for the Java sources of every scope."""
+    classes = {}
+    for path in find_java_files(repo_root, scope="all"):
+        try:
+            head = path.read_text(encoding="utf-8", errors="replace")[:4096]
+        except OSError:
+            continue
+        match = PACKAGE_RE.search(head)
+        fqn = f"{match.group(1)}.{path.stem}" if match else path.stem
+        classes[fqn] = (path.relative_to(repo_root).as_posix(), get_module_name(path, repo_root))
+    return classes
+
+
+def attribute_samples(profiles: List[dict], classes: Dict[str, Tuple[str, str]]) -> dict:
+    """
+    Inclusive weight per repository method, file and module, and self weight
+    per method, from the weighted profiles. The repository methods and files
+    of every stack are kept too, for blocker_weight().
+    """
+    methods: Dict[Tuple[str, str, str], float] = defaultdict(float)  # (file, class_path, method)
+    self_weight: Dict[Tuple[str, str, str], float] = defaultdict(float)
+    files: Dict[str, float] = defaultdict(float)
+    modules: Dict[str, float] = defaultdict(float)
+    stacks: List[Tuple[float, frozenset, frozenset]] = []
+    outside = 0.0
+
+    for profile in profiles:
+        collapsed = read_collapsed(Path(profile["path"]))
+        total = sum(count for _, count in collapsed)
+        profile["samples"] = total
+        if not total:
+            continue
+        scale = profile["weight"] / total
+        for frames, count in collapsed:
+            weight = count * scale
+            seen_methods, seen_files, seen_modules = set(), set(), set()
+            leaf = None
+            for frame in frames:
+                parsed = parse_frame(frame)
+                if not parsed:
+                    continue
+                class_name, method = parsed
+                outer = class_name.split("$", 1)[0]
+                if outer not in classes:
+                    continue
+                rel_path, module = classes[outer]
+                # Anonymous classes (Outer$1) are attributed to their class only
+                class_path = class_name[len(outer.rsplit(".", 1)[0]) + 1:] if "." in outer else class_name
+                key = (rel_path, class_path, method)
+                if not re.search(r'\$\d+', class_path):
+                    seen_methods.add(key)
+                    leaf = key
+                seen_files.add(rel_path)
+                seen_modules.add(module)
+            for key in seen_methods:
+                methods[key] += weight
+            for rel_path in seen_files:
+                files[rel_path] += weight
+            for module in seen_modules:
+                modules[module] += weight
+            if leaf:
+                self_weight[leaf] += weight
+            if seen_files:
+                stacks.append((weight, frozenset(seen_methods), frozenset(seen_files)))
+            else:
+                outside += weight
+
+    return {
+        "methods": methods,
+        "self": self_weight,
+        "files": files,
+        "modules": modules,
+        "stacks": stacks,
+        "outside_repository": outside,
+    }
+
+
+def blocker_weight(findings: List[dict], stacks: List[Tuple[float, frozenset, frozenset]]) -> float:
+    """
+    Share of samples whose stack passes through code with one of the findings:
+    its method, or its class for findings matched by class. Unlike a sum of
+    finding weights, every sample counts at most once.
+    """
+    methods = {(f["file"], *f["method"].rsplit(".", 1)) for f in findings if f["match"] == "method"}
+    files = {f["file"] for f in findings if f["match"] == "class"}
+    if not methods and not files:
+        return 0.0
+    return sum(weight for weight, seen_methods, seen_files in stacks
+               if not methods.isdisjoint(seen_methods) or not files.isdisjoint(seen_files))
+
+
+def rank_findings(repo_root: Path, blockers: dict, weights: dict) -> List[dict]:
+    """Every finding of java_api_blockers.json with the hot-path weight of its method, hottest first."""
+    by_file: Dict[str, List[Tuple[str, dict]]] = defaultdict(list)
+    for category, data in blockers.get("totals", {}).items():
+        for finding in data.get("findings", []):
+            by_file[finding["file"]].append((category, finding))
+
+    ranked = []
+    for rel_path, findings in sorted(by_file.items()):
+        path = repo_root / rel_path
+        lines = path.read_text(encoding="utf-8", errors="replace").splitlines() if path.exists() else []
+        spans, classes = code_spans(lines) if path.suffix == ".java" else ([], [])
+        for category, finding in findings:
+            located = enclosing_method(finding["line_number"], lines, spans, classes)
+            if located:
+                weight, match = weights["methods"].get((rel_path, *located), 0.0), "method"
+            elif weights["files"].get(rel_path):
+                weight, match = weights["files"][rel_path], "class"
+            else:
+                weight, match = 0.0, "none"
+            ranked.append({
+                "file": rel_path,
+                "module": get_module_name(path, repo_root),
+                "line_number": finding["line_number"],
+                "category": category,
+                "pattern_matched": finding["pattern_matched"],
+                "line_content": finding["line_content"],
+                "method": f"{located[0]}.{located[1]}" if located else None,
+                "match": match,
+                "weight": round(weight, 6),
+            })
+    ranked.sort(key=lambda f: (-f["weight"], f["match"] != "method", f["file"], f["line_number"]))
+    return ranked
+
+
+def generate_report(profiles: List[dict], benchmarks: List[dict], weights: dict,
+                    findings: List[dict], blockers: dict, top: int) -> dict:
+    """Generate the final JSON report structure."""
+    modules = {}
+    for module in sorted(set(weights["modules"]) | set(blockers.get("by_module", {}))):
+        module_findings = [f for f in findings if f["module"] == module]
+        modules[module] = {
+            "hot_weight": round(weights["modules"].get(module, 0.0), 6),
+            "blockers": sum(c["count"] for c in blockers.get("by_module", {}).get(module, {}).values()),
+            "hot_findings": sum(1 for f in module_findings if f["weight"] > 0),
+            "hot_blocker_weight": round(blocker_weight(module_findings, weights["stacks"]), 6),
+        }
+
+    by_category = {}
+    for category in sorted({f["category"] for f in findings}):
+        category_findings = [f for f in findings if f["category"] == category]
+        by_category[category] = {
+            "findings": len(category_findings),
+            "hot_findings": sum(1 for f in category_findings if f["weight"] > 0),
+            "weight": round(blocker_weight(category_findings, weights["stacks"]), 6),
+        }
+
+    hottest = sorted(weights["methods"].items(), key=lambda item: -item[1])[:top]
+    sampled = any(data.get("findings_sampled") for data in blockers.get("totals", {}).values())
+
+    return {
+        "summary": {
+            "profiles": len(profiles),
+            "samples": sum(p.get("samples", 0) for p in profiles),
+            "benchmarks": len(benchmarks),
+            "repository_weight": round(1 - weights["outside_repository"], 6),
+            "findings": len(findings),
+            "hot_findings": sum(1 for f in findings if f["weight"] > 0),
+            "blocker_weight": round(blocker_weight(findings, weights["stacks"]), 6),
+            "findings_sampled": sampled,
+        },
+        "profiles": [{**p, "weight": round(p["weight"], 6)} for p in profiles],
+        "benchmarks": benchmarks,
+        "hot_methods": [
+            {
+                "file": rel_path,
+                "method": f"{class_path}.{method}",
+                "inclusive": round(weight, 6),
+                "self": round(weights["self"].get((rel_path, class_path, method), 0.0), 6),
+            }
+            for (rel_path, class_path, method), weight in hottest
+        ],
+        "modules": dict(sorted(
+            modules.items(), key=lambda item: (-item[1]["hot_blocker_weight"], -item[1]["hot_weight"], item[0])
+        )),
+        "by_category": dict(sorted(by_category.items(), key=lambda item: -item[1]["weight"])),
+        "findings": findings,
+    }
+
+
+def print_summary(report: dict, top: int) -> None:
+    """Print a human-readable summary to console."""
+    print("\n" + "=" * 70)
+    print("HOT-PATH WEIGHTED BLOCKERS - SUMMARY")
+    print("=" * 70)
+
+    summary = report["summary"]
+    print(f"\nProfiles: {summary['profiles']} ({summary['samples']} samples), "
+          f"JMH benchmarks: {summary['benchmarks']}")
+    print(f"Samples in repository code: {summary['repository_weight']:.1%}, "
+          f"through code with blockers: {summary['blocker_weight']:.1%}")
+    print(f"Findings on hot paths: {summary['hot_findings']} of {summary['findings']}"
+          f"{' (findings are a sample)' if summary['findings_sampled'] else ''}")
+
+    print("\n" + "-" * 70)
+    print("HOTTEST METHODS (inclusive / self):")
+    print("-" * 70)
+    for method in report["hot_methods"][:top]:
+        print(f"  {method['inclusive']:6.1%} {method['self']:6.1%}  {method['method']}")
+
+    print("\n" + "-" * 70)
+    print("MODULES BY HOT BLOCKER WEIGHT (samples through code with blockers):")
+    print("-" * 70)
+    for module, data in report["modules"].items():
+        if data["hot_blocker_weight"] > 0 or data["hot_weight"] > 0:
+            print(f"  {module}: {data['hot_blocker_weight']:.1%} in {data['hot_findings']} of "
+                  f"{data['blockers']} blockers (module {data['hot_weight']:.1%})")
+
+    print("\n" + "-" * 70)
+    print("HOTTEST FINDINGS:")
+    print("-" * 70)
+    for finding in [f for f in report["findings"] if f["weight"] > 0][:top]:
+        print(f"  {finding['weight']:6.1%} [{finding['category']}] {finding['method'] or '(class)'} "
+              f"({finding['file'].rsplit('/', 1)[-1]}:{finding['line_number']}, by {finding['match']})")
+
+    print("\n" + "=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rank blocker findings and modules by hot-path weight from profiles and JMH results"
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        action="append",
+        default=[],
+        help="Collapsed-stack profile, or a directory searched for *collapsed* files (repeatable)"
+    )
+    parser.add_argument(
+        "--jmh",
+        type=Path,
+        action="append",
+        default=[],
+        help="JMH JSON result file (repeatable)"
+    )
+    parser.add_argument(
+        "--repo-root",
+        type=Path,
+        default=Path(__file__).parent.parent.parent,
+        help="Path to repository root (default: two levels up from script)"
+    )
+    parser.add_argument(
+        "--blockers",
+        type=Path,
+        default=None,
+        help="Blocker report to rank (default: .ai_out/.../java_api_blockers.json)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Output JSON file path (default: .ai_out/.../hot_paths.json)"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        help="Hot methods kept in the report and lines printed per section (default: 20)"
+    )
+    args = parser.parse_args()
+
+    if not args.profile and not args.jmh:
+        parser.error("give at least one --profile or --jmh")
+
+    repo_root = args.repo_root.resolve()
+    output_dir = repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis"
+    blockers = load_json_report(args.blockers or output_dir / "java_api_blockers.json")
+    if blockers is None:
+        print("Error: java_api_blockers.json not found; run analyze_java_api_blockers.py first")
+        sys.exit(1)
+    if "estimation" in blockers:
+        print("Error: the blocker report is an --estimate report without findings")
+        sys.exit(1)
+
+    profiles = find_profiles(args.profile)
+    missing = [p for p in profiles if not p.exists()] + [p for p in args.jmh if not p.exists()]
+    if missing:
+        print(f"Error: not found: {', '.join(map(str, missing))}")
+        sys.exit(1)
+
+    benchmarks = load_benchmarks(args.jmh)
+    weighted = profile_weights(profiles, benchmarks)
+    print(f"Attributing {len(weighted)} profiles ({len(benchmarks)} JMH benchmarks) to: {repo_root}")
+
+    weights = attribute_samples(weighted, class_files(repo_root))
+    findings = rank_findings(repo_root, blockers, weights)
+    report = generate_report(weighted, benchmarks, weights, findings, blockers, args.top)
+
+    if args.output:
+        output_path = args.output
+    else:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / "hot_paths.json"
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\nJSON report written to: {output_path}")
+    print_summary(report, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,10 @@
 """
 Analyze Java API usage that blocks Kotlin Multiplatform conversion.
 
-This script scans Java source files for usage of APIs that lack Kotlin-MP equivalents
-and generates a JSON report of findings.
+This script scans Java and Kotlin source files for usage of APIs that lack
+Kotlin-MP equivalents and generates a JSON report of findings. Both languages
+are collected in one traversal; each category has shared patterns plus
+Java-only and Kotlin-only variants (e.g. "synchronized" methods vs @Synchronized).
 
 Detects:
 - java.util.regex.Pattern/Matcher - Core regex, requires migration to kotlin.text.Regex
@@ -12,21 +14,68 @@ Detects:
 - java.lang.reflect.* - Reflection, needs redesign
 - synchronized / ThreadLocal - Concurrency primitives
 
+Each source file is read once and handed to every enabled analyzer plugin
+(see Analyzer); the API_CATEGORIES scan is the "api_blockers" plugin and
+other plugins, such as "regex_literals", add their own report section.
+
+Only production code (the Gradle main source sets) is scanned by default;
+--scope selects test, testFixtures or all source sets instead, and the
+report's "scan" section counts files per scope either way.
+
+A scan can be split across machines: --shard i/N scans the files whose
+path hashes to shard i of N and writes a partial report, and the merge
+command combines any set of partial reports into the report a single full
+run would have produced. For a few files at a time (editors, pre-commit
+hooks), analysis_server.py keeps the analyzers warm and answers per file.
+
+Every file passes the ScanLimits guards first: binary and generated files
+are skipped, and files over the size, line length or per-file time limits
+are skipped or scanned in a degraded mode (--on-limit). The report's
+"skipped" section lists every such file with the reason.
+
+Peak memory is measured per stage (walk, scan, merge, report, serialize).
+With --memory-budget, a run whose projected peak exceeds the budget keeps a
+bounded sample of findings and streams the report to disk.
+
 Usage:
-    python analyze_java_api_blockers.py [--repo-root PATH] [--output PATH]
+    python analyze_java_api_blockers.py [--repo-root PATH] [--output PATH] [--scope main]
+                                        [--analyzers api_blockers,regex_literals]
+                                        [--max-findings-per-category K] [--findings-seed N]
+                                        [--max-file-bytes N] [--max-line-length N]
+                                        [--file-time-budget SECONDS] [--on-limit degrade|skip]
+                                        [--memory-budget MB] [--memory-profile rss|tracemalloc]
+    python analyze_java_api_blockers.py --estimate [--precision 0.1] [--confidence 0.95]
+                                        [--max-sample-fraction 0.4] [--verify-estimate]
+    python analyze_java_api_blockers.py scan --shard 1/4 [--output PATH] [...]
+    python analyze_java_api_blockers.py merge PARTIAL.json [PARTIAL.json ...] [--output PATH]
 
 Output:
-    JSON report with file locations and counts per category.
+    JSON report with file locations and counts per category, and a compact
+    progress snapshot per full run (converted/unconverted LOC and remaining
+    blockers per module) under .ai_out/.../progress/.
 """
 
 import argparse
+import importlib
 import json
+import math
 import os
+import random
 import re
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import zlib
 from collections import defaultdict
-from dataclasses import dataclass, field
+from collections.abc import Mapping
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from statistics import NormalDist
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 
 @dataclass
@@ -40,16 +89,56 @@ class Finding:
 
 @dataclass
 class CategoryReport:
-    """Report for a single API category."""
+    """
+    Report for a single API category.
+
+    count and files are always exact. When max_findings is set, findings is a
+    uniform reservoir sample of at most max_findings of the counted findings.
+    by_scope splits count by scan scope (main, test, testFixtures).
+    """
     count: int = 0
     files: Set[str] = field(default_factory=set)
     findings: List[Finding] = field(default_factory=list)
+    max_findings: Optional[int] = None
+    by_scope: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, finding: Finding, rng: random.Random) -> None:
+        """Count a finding, keeping it if the reservoir still selects it."""
+        self.count += 1
+        self.files.add(finding.file)
+        if self.max_findings is None or len(self.findings) < self.max_findings:
+            self.findings.append(finding)
+        else:
+            slot = rng.randrange(self.count)
+            if slot < self.max_findings:
+                self.findings[slot] = finding
+
+    def merge(self, other: "CategoryReport", rng: random.Random) -> None:
+        """Fold another report into this one, preserving a uniform sample of findings."""
+        if self.max_findings is None:
+            self.findings.extend(other.findings)
+        else:
+            self.findings = merge_reservoirs(
+                self.findings, self.count, other.findings, other.count, self.max_findings, rng
+            )
+        self.count += other.count
+        self.files.update(other.files)
+        for scope, count in other.by_scope.items():
+            self.by_scope[scope] = self.by_scope.get(scope, 0) + count
+
+    @property
+    def sampled(self) -> bool:
+        return self.count > len(self.findings)
 
     def to_dict(self) -> dict:
+        # Sorted so that the report does not depend on scan order (or sharding)
+        findings = sorted(self.findings, key=lambda f: (f.file, f.line_number))
         return {
             "count": self.count,
             "file_count": len(self.files),
             "files": sorted(self.files),
+            "by_scope": dict(sorted(self.by_scope.items())),
+            "findings_sampled": self.sampled,
             "findings": [
                 {
                     "file": f.file,
@@ -57,12 +146,48 @@ class CategoryReport:
                     "line_content": f.line_content.strip(),
                     "pattern_matched": f.pattern_matched
                 }
-                for f in self.findings
+                for f in findings
             ]
         }
 
 
-# API categories and their detection patterns
+def merge_reservoirs(
+    a: List[Finding],
+    a_count: int,
+    b: List[Finding],
+    b_count: int,
+    k: int,
+    rng: random.Random
+) -> List[Finding]:
+    """
+    Combine two uniform reservoir samples into one uniform sample of at most k items.
+
+    a and b are uniform samples of a_count and b_count underlying items. Each output
+    slot draws from a or b in proportion to the items not yet drawn from it, which
+    is equivalent to sampling without replacement from the union.
+    """
+    if a_count + b_count <= k:
+        return a + b
+    a = list(a)
+    b = list(b)
+    rng.shuffle(a)
+    rng.shuffle(b)
+    sample = []
+    a_left, b_left = a_count, b_count
+    while len(sample) < k:
+        if rng.randrange(a_left + b_left) < a_left:
+            sample.append(a.pop())
+            a_left -= 1
+        else:
+            sample.append(b.pop())
+            b_left -= 1
+    return sample
+
+
+# API categories and their detection patterns. "patterns" apply to Java and
+# Kotlin sources, "java_patterns" and "kotlin_patterns" to one language only.
+# Matches inside comments and string literals are discarded (see LineMasker),
+# except that categories with "in_strings" look inside string literals.
 API_CATEGORIES = {
     "regex_pattern_matcher": {
         "description": "java.util.regex.Pattern/Matcher usage - requires kotlin.text.Regex migration",
@@ -72,8 +197,14 @@ API_CATEGORIES = {
             (r'import\s+java\.util\.regex\.Pattern\b', "import Pattern"),
             (r'import\s+java\.util\.regex\.Matcher\b', "import Matcher"),
             (r'import\s+java\.util\.regex\.\*', "import java.util.regex.*"),
-            (r'\bMatcher\s+\w+\s*=', "Matcher variable declaration"),
             (r'\.matcher\s*\(', ".matcher() call"),
+        ],
+        "java_patterns": [
+            (r'\bMatcher\s+\w+\s*=', "Matcher variable declaration"),
+        ],
+        "kotlin_patterns": [
+            (r':\s*Matcher\b', "Matcher type annotation"),
+            (r'\.toPattern\s*\(', "Regex.toPattern()"),
         ]
     },
     "java_io": {
@@ -89,6 +220,10 @@ API_CATEGORIES = {
             (r'import\s+java\.io\.BufferedWriter\b', "import java.io.BufferedWriter"),
             (r'import\s+java\.io\.IOException\b', "import java.io.IOException"),
             (r'import\s+java\.io\.\*', "import java.io.*"),
+        ],
+        "kotlin_patterns": [
+            (r'\.(?:bufferedReader|bufferedWriter|inputStream|outputStream|printWriter)\s*\(',
+             "kotlin.io stream extension"),
         ]
     },
     "java_nio": {
@@ -98,6 +233,9 @@ API_CATEGORIES = {
             (r'import\s+java\.nio\.file\.\w+', "import java.nio.file.*"),
             (r'import\s+java\.nio\.charset\.\w+', "import java.nio.charset.*"),
             (r'import\s+java\.nio\.\*', "import java.nio.*"),
+        ],
+        "kotlin_patterns": [
+            (r'import\s+kotlin\.io\.path\.\w+', "import kotlin.io.path.*"),
         ]
     },
     "java_awt": {
@@ -114,11 +252,18 @@ API_CATEGORIES = {
         "impact": "LOW",
         "patterns": [
             (r'import\s+java\.lang\.reflect\.\w+', "import java.lang.reflect.*"),
-            (r'\.getClass\s*\(\s*\)\s*\.getMethod', "getClass().getMethod()"),
             (r'\.getDeclaredMethod\s*\(', ".getDeclaredMethod()"),
             (r'\.getField\s*\(', ".getField()"),
             (r'\.getDeclaredField\s*\(', ".getDeclaredField()"),
             (r'Method\.invoke\s*\(', "Method.invoke()"),
+        ],
+        "java_patterns": [
+            (r'\.getClass\s*\(\s*\)\s*\.getMethod', "getClass().getMethod()"),
+        ],
+        "kotlin_patterns": [
+            (r'::class\.java\b', "::class.java"),
+            (r'\.javaClass\.getMethod', "javaClass.getMethod()"),
+            (r'import\s+kotlin\.reflect\.full\.\w+', "import kotlin.reflect.full.*"),
         ]
     },
     "concurrency": {
@@ -126,35 +271,236 @@ API_CATEGORIES = {
         "impact": "LOW",
         "patterns": [
             (r'\bsynchronized\s*\(', "synchronized block"),
-            (r'\bsynchronized\s+\w+\s*\(', "synchronized method"),
             (r'ThreadLocal<', "ThreadLocal usage"),
             (r'import\s+java\.util\.concurrent\.\w+', "import java.util.concurrent.*"),
+        ],
+        "java_patterns": [
+            (r'\bsynchronized\s+\w+\s*\(', "synchronized method"),
+        ],
+        "kotlin_patterns": [
+            (r'@Synchronized\b', "@Synchronized method"),
+            (r'import\s+kotlin\.concurrent\.\w+', "import kotlin.concurrent.*"),
         ]
     },
     "unicode_regex_patterns": {
         "description": "Unicode property patterns in regex - may have JS compatibility issues",
         "impact": "HIGH",
+        "in_strings": True,
         "patterns": [
             (r'\\\\p\{[A-Za-z]+\}', "Unicode property pattern \\p{...}"),
+        ],
+        "kotlin_patterns": [
+            (r'(?<!\\)\\p\{[A-Za-z]+\}', "Unicode property pattern \\p{...} in raw string"),
         ]
     }
 }
 
+SOURCE_EXTENSIONS = ('.java', '.kt')
+
+LANGUAGES = ("java", "kotlin")
+
+
+def language_of(file_path: Path) -> str:
+    return "kotlin" if file_path.suffix == ".kt" else "java"
+
+
+def category_patterns(category: str, language: Optional[str] = None) -> List[tuple]:
+    """(pattern, name) pairs of a category for one language, or for both if language is None."""
+    config = API_CATEGORIES[category]
+    patterns = list(config["patterns"])
+    for lang in ([language] if language else LANGUAGES):
+        patterns.extend(config.get(f"{lang}_patterns", []))
+    return patterns
+
+
+# Scan scope profiles and the scopes of the Gradle source sets they cover
+SCOPES = {
+    "main": ("main",),
+    "test": ("test",),
+    "testFixtures": ("testFixtures",),
+    "all": ("main", "test", "testFixtures"),
+}
+
+
+def source_set_scope(source_set: str) -> str:
+    """
+    Scope of a Gradle source set (a directory under <module>/src/).
+
+    main and testFixtures are their own scopes; every other source set
+    (test, integrationTest, jmh, ...) is test code.
+    """
+    if source_set in ("main", "testFixtures"):
+        return source_set
+    return "test"
+
+
+def file_scope(file_path: Path, repo_root: Path) -> str:
+    """Scope of a source file; files outside a src/<source set>/ layout count as main."""
+    parts = file_path.relative_to(repo_root).parts[:-1]
+    if "src" in parts:
+        index = parts.index("src")
+        if index + 1 < len(parts):
+            return source_set_scope(parts[index + 1])
+    return "main"
+
+
+# Lexer states at a line boundary
+CODE, BLOCK_COMMENT, TEXT_BLOCK = 0, 1, 2
+
+
+def mask_line(line: str, state: int) -> Tuple[str, str, int]:
+    """
+    Lex one line starting in state.
+
+    Returns the line with comments and string/char literals blanked, the line
+    with only comments blanked, and the state at the end of the line. Blanking
+    keeps the length so match positions are unchanged.
+    """
+    code = list(line)
+    comments = list(line)
+    i, n = 0, len(line)
+    while i < n:
+        if state == BLOCK_COMMENT:
+            end = line.find("*/", i)
+            stop = n if end < 0 else end + 2
+            code[i:stop] = comments[i:stop] = " " * (stop - i)
+            i = stop
+            if end >= 0:
+                state = CODE
+        elif state == TEXT_BLOCK:
+            end = line.find('"""', i)
+            stop = n if end < 0 else end
+            code[i:stop] = " " * (stop - i)
+            i = n if end < 0 else end + 3
+            if end >= 0:
+                state = CODE
+        else:
+            ch = line[i]
+            if ch == "/" and line.startswith("//", i):
+                code[i:] = comments[i:] = " " * (n - i)
+                break
+            if ch == "/" and line.startswith("/*", i):
+                state = BLOCK_COMMENT
+                code[i:i + 2] = comments[i:i + 2] = "  "
+                i += 2
+            elif ch == '"' and line.startswith('"""', i):
+                state = TEXT_BLOCK
+                i += 3
+            elif ch == '"' or ch == "'":
+                j = i + 1
+                while j < n and line[j] != ch:
+                    j += 2 if line[j] == "\\" else 1
+                code[i + 1:min(j, n)] = " " * (min(j, n) - i - 1)
+                i = j + 1
+            else:
+                i += 1
+    return "".join(code), "".join(comments), state
+
+
+def advance_state(line: str, state: int) -> int:
+    """State at the end of a line, without building masked copies when it cannot change."""
+    if state == CODE and "/*" not in line and '"""' not in line:
+        return CODE
+    if state == BLOCK_COMMENT and "*/" not in line:
+        return BLOCK_COMMENT
+    if state == TEXT_BLOCK and '"""' not in line:
+        return TEXT_BLOCK
+    return mask_line(line, state)[2]
+
+
+class LineMasker:
+    """
+    Masks comments and string literals of the lines of one file on demand.
+
+    Lines must be requested in increasing order. The lexer state is kept as a
+    checkpoint after the last requested line, so every line is lexed at most
+    once and lines between candidates are only scanned for state changes.
+    """
+
+    def __init__(self, lines: List[str]):
+        self.lines = lines
+        self.checkpoint = 0
+        self.state = CODE
 
-def find_java_files(repo_root: Path) -> List[Path]:
-    """Find all Java source files in the repository, excluding test directories."""
+    def masked(self, index: int) -> Tuple[str, str]:
+        """(code-only, comment-masked) versions of lines[index]."""
+        for skipped in range(self.checkpoint, index):
+            self.state = advance_state(self.lines[skipped], self.state)
+        code, comments, self.state = mask_line(self.lines[index], self.state)
+        self.checkpoint = index + 1
+        return code, comments
+
+
+def find_java_files(repo_root: Path, extensions: tuple = ('.java',), scope: str = "main") -> List[Path]:
+    """
+    Find the source files of the given scan scope (see SCOPES).
+
+    Source set directories outside the scope are pruned from the walk, so the
+    default main scope never descends into src/test.
+    """
+    wanted = SCOPES[scope]
     java_files = []
     for root, dirs, files in os.walk(repo_root):
         # Skip hidden directories and common non-source directories
-        dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ('target', 'build')]
+        # (sorted so that file order, and with it findings sampling, is reproducible)
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.') and d not in ('target', 'build'))
+        if os.path.basename(root) == 'src':
+            dirs[:] = [d for d in dirs if source_set_scope(d) in wanted]
 
-        for file in files:
-            if file.endswith('.java'):
+        for file in sorted(files):
+            if file.endswith(extensions):
                 java_files.append(Path(root) / file)
 
     return java_files
 
 
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse "i/N" (1 <= i <= N) into (i, N)."""
+    match = re.fullmatch(r'\s*(\d+)\s*/\s*(\d+)\s*', value)
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise ValueError(f"Invalid shard '{value}' (expected i/N with 1 <= i <= N)")
+    return int(match.group(1)), int(match.group(2))
+
+
+def in_shard(file_path: Path, repo_root: Path, shard: Optional[Tuple[int, int]]) -> bool:
+    """Whether a file belongs to shard (i, N), by a stable hash of its repo-relative path."""
+    if shard is None:
+        return True
+    index, count = shard
+    rel_path = file_path.relative_to(repo_root).as_posix()
+    return zlib.crc32(rel_path.encode("utf-8")) % count == index - 1
+
+
+def collect_scan_files(
+    repo_root: Path,
+    scope: str,
+    extensions: tuple = ('.java',),
+    shard: Optional[Tuple[int, int]] = None
+) -> Tuple[List[Path], dict]:
+    """
+    Walk the source files of every scope once.
+
+    Returns the files of the scan scope (of one shard), and the scan summary:
+    files and bytes per scope, and which of them the scan scope covers.
+    """
+    by_scope = {name: {"files": 0, "bytes": 0, "scanned": name in SCOPES[scope]} for name in SCOPES["all"]}
+    scan_files = []
+    for file_path in find_java_files(repo_root, extensions, "all"):
+        if not in_shard(file_path, repo_root, shard):
+            continue
+        entry = by_scope[file_scope(file_path, repo_root)]
+        entry["files"] += 1
+        entry["bytes"] += file_path.stat().st_size
+        if entry["scanned"]:
+            scan_files.append(file_path)
+    return scan_files, {
+        "scope": scope,
+        "scanned_files": sum(e["files"] for e in by_scope.values() if e["scanned"]),
+        "scanned_bytes": sum(e["bytes"] for e in by_scope.values() if e["scanned"]),
+        "by_scope": by_scope,
+    }
+
+
 def get_module_name(file_path: Path, repo_root: Path) -> str:
     """Extract module name from file path."""
     rel_path = file_path.relative_to(repo_root)
@@ -164,71 +510,770 @@ def get_module_name(file_path: Path, repo_root: Path) -> str:
     return "unknown"
 
 
-def analyze_file(file_path: Path, repo_root: Path) -> Dict[str, CategoryReport]:
-    """Analyze a single Java file for blocking API usage."""
-    results = {cat: CategoryReport() for cat in API_CATEGORIES}
-    rel_path = str(file_path.relative_to(repo_root))
+@dataclass
+class SourceFile:
+    """A source file read once and shared by every analyzer."""
+    path: Path
+    rel_path: str
+    module: str
+    data: bytes
+    text: str
+    lines: List[str]
+    scope: str = "main"
+    language: str = "java"
+    # perf_counter() time by which analyzers should stop (see ScanLimits), and
+    # the line at which one did
+    deadline: Optional[float] = None
+    stopped_at: Optional[int] = None
 
-    try:
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-            lines = f.readlines()
-    except Exception as e:
-        print(f"Warning: Could not read {file_path}: {e}")
-        return results
 
-    for line_num, line in enumerate(lines, start=1):
-        for category, config in API_CATEGORIES.items():
-            for pattern_str, pattern_name in config["patterns"]:
-                if re.search(pattern_str, line):
-                    results[category].count += 1
-                    results[category].files.add(rel_path)
-                    results[category].findings.append(Finding(
+class Analyzer:
+    """
+    Base class for analysis plugins.
+
+    The scan reads each file once into a SourceFile and passes it to every
+    analyzer. An analyzer returns a per-file result from analyze(), folds the
+    results of one module together in merge(), and turns the merged results of
+    all modules into its own section of the JSON report in report().
+    """
+    name = ""
+
+    def analyze(self, source: SourceFile) -> Any:
+        raise NotImplementedError
+
+    def merge(self, results: List[Any]) -> Any:
+        raise NotImplementedError
+
+    def report(self, module_results: Dict[str, Any]) -> dict:
+        raise NotImplementedError
+
+    def dump_results(self, module_results: Dict[str, Any]) -> Any:
+        """JSON-serializable form of the merged module results, for partial (sharded) reports."""
+        raise NotImplementedError
+
+    def load_results(self, data: Any) -> Dict[str, Any]:
+        """Inverse of dump_results()."""
+        raise NotImplementedError
+
+    def print_summary(self, report: dict) -> None:
+        """Print this analyzer's section of the combined report."""
+
+
+class ApiBlockerAnalyzer(Analyzer):
+    """
+    Line-based scan for the API_CATEGORIES patterns of the file's language.
+
+    max_findings bounds the findings kept per category (per file, module and
+    in the totals) by reservoir sampling seeded with seed. With mask, a match
+    on the raw line is only a candidate: it counts if the pattern still
+    matches once comments (and, unless the category is "in_strings", string
+    literals) are masked, which LineMasker does for candidate lines only.
+    The scan stops between lines once the file's deadline has passed.
+    """
+    name = "api_blockers"
+
+    def __init__(self, max_findings: Optional[int] = None, seed: int = 0, mask: bool = True):
+        self.max_findings = max_findings
+        self.rng = random.Random(seed)
+        self.mask = mask
+        # Report by_module and totals as LazyMappings, for write_json_streaming()
+        self.stream = False
+        self.rules = {
+            language: [
+                (category, re.compile(pattern_str), pattern_name,
+                 API_CATEGORIES[category].get("in_strings", False))
+                for category in API_CATEGORIES
+                for pattern_str, pattern_name in category_patterns(category, language)
+            ]
+            for language in LANGUAGES
+        }
+
+    def analyze(self, source: SourceFile) -> Dict[str, CategoryReport]:
+        results = {cat: CategoryReport(max_findings=self.max_findings) for cat in API_CATEGORIES}
+        rel_path = source.rel_path
+        rules = self.rules[source.language]
+        masker = LineMasker(source.lines) if self.mask else None
+        deadline = source.deadline
+
+        for line_num, line in enumerate(source.lines, start=1):
+            if deadline is not None and time.perf_counter() > deadline:
+                source.stopped_at = line_num
+                break
+            masked = None
+            for category, pattern, pattern_name, in_strings in rules:
+                if pattern.search(line):
+                    if masker:
+                        if masked is None:
+                            masked = masker.masked(line_num - 1)
+                        if not pattern.search(masked[1] if in_strings else masked[0]):
+                            continue
+                    results[category].add(Finding(
                         file=rel_path,
                         line_number=line_num,
                         line_content=line,
                         pattern_matched=pattern_name
-                    ))
+                    ), self.rng)
+
+        for report in results.values():
+            if report.count:
+                report.by_scope[source.scope] = report.count
+        return results
+
+    def merge(self, results: List[Dict[str, CategoryReport]]) -> Dict[str, CategoryReport]:
+        return merge_reports(results, self.max_findings, self.rng)
+
+    def report(self, module_results: Dict[str, Dict[str, CategoryReport]]) -> dict:
+        return generate_report(module_results, self.max_findings, self.rng, lazy=self.stream)
+
+    def dump_results(self, module_results: Dict[str, Dict[str, CategoryReport]]) -> dict:
+        return {
+            module: {
+                category: {
+                    "count": report.count,
+                    "files": sorted(report.files),
+                    "by_scope": report.by_scope,
+                    "findings": [asdict(f) for f in report.findings],
+                }
+                for category, report in categories.items()
+                if report.count > 0
+            }
+            for module, categories in module_results.items()
+        }
+
+    def load_results(self, data: dict) -> Dict[str, Dict[str, CategoryReport]]:
+        module_results = {}
+        for module, categories in data.items():
+            reports = {cat: CategoryReport(max_findings=self.max_findings) for cat in API_CATEGORIES}
+            for category, entry in categories.items():
+                findings = [Finding(**f) for f in entry["findings"]]
+                if self.max_findings is not None and len(findings) > self.max_findings:
+                    # Partials written with a larger (or no) bound: subsample uniformly
+                    findings = merge_reservoirs(findings, entry["count"], [], 0, self.max_findings, self.rng)
+                reports[category] = CategoryReport(
+                    count=entry["count"],
+                    files=set(entry["files"]),
+                    findings=findings,
+                    max_findings=self.max_findings,
+                    by_scope=entry["by_scope"],
+                )
+            module_results[module] = reports
+        return module_results
+
+    def print_summary(self, report: dict) -> None:
+        print_summary(report)
+
+
+def count_loc(lines: List[str]) -> int:
+    """Lines that are neither blank nor comment-only."""
+    return sum(1 for line in lines if line.strip() and not line.lstrip().startswith(("//", "/*", "*")))
+
+
+class LocAnalyzer(Analyzer):
+    """Files and lines of code per language, i.e. converted (Kotlin) vs unconverted (Java) code."""
+    name = "loc"
+
+    def analyze(self, source: SourceFile) -> Dict[str, Dict[str, int]]:
+        return {source.language: {"files": 1, "loc": count_loc(source.lines)}}
+
+    def merge(self, results: List[Dict[str, Dict[str, int]]]) -> Dict[str, Dict[str, int]]:
+        merged = {language: {"files": 0, "loc": 0} for language in LANGUAGES}
+        for result in results:
+            for language, counts in result.items():
+                merged[language]["files"] += counts["files"]
+                merged[language]["loc"] += counts["loc"]
+        return merged
+
+    def report(self, module_results: Dict[str, Dict[str, Dict[str, int]]]) -> dict:
+        totals = self.merge(list(module_results.values()))
+
+        def converted(counts: Dict[str, Dict[str, int]]) -> float:
+            total = counts["java"]["loc"] + counts["kotlin"]["loc"]
+            return round(100 * counts["kotlin"]["loc"] / total, 1) if total else 0.0
+
+        return {self.name: {
+            "totals": {**totals, "converted_pct": converted(totals)},
+            "by_module": {
+                module: {**counts, "converted_pct": converted(counts)}
+                for module, counts in sorted(module_results.items())
+            },
+        }}
+
+    def dump_results(self, module_results: Dict[str, Dict[str, Dict[str, int]]]) -> dict:
+        return module_results
+
+    def load_results(self, data: dict) -> Dict[str, Dict[str, Dict[str, int]]]:
+        return data
+
+    def print_summary(self, report: dict) -> None:
+        totals = report[self.name]["totals"]
+        print(f"Lines of code: {totals['java']['loc']} Java in {totals['java']['files']} files, "
+              f"{totals['kotlin']['loc']} Kotlin in {totals['kotlin']['files']} files "
+              f"({totals['converted_pct']}% converted)")
+
+
+# Analyzer plugins by name. Plugins living in other scripts are given as
+# "module.ClassName" and imported only when requested.
+ANALYZER_PLUGINS = {
+    "api_blockers": ApiBlockerAnalyzer,
+    "loc": LocAnalyzer,
+    "regex_literals": "analyze_regex_literals.RegexLiteralAnalyzer",
+    "duplicates": "analyze_duplicate_code.DuplicateCodeAnalyzer",
+}
+
+
+def load_analyzers(names: List[str]) -> List[Analyzer]:
+    """Instantiate analyzer plugins by name."""
+    analyzers = []
+    for name in names:
+        if name not in ANALYZER_PLUGINS:
+            raise ValueError(f"Unknown analyzer '{name}' (available: {', '.join(ANALYZER_PLUGINS)})")
+        plugin = ANALYZER_PLUGINS[name]
+        if isinstance(plugin, str):
+            module_name, class_name = plugin.rsplit(".", 1)
+            plugin = getattr(importlib.import_module(module_name), class_name)
+        analyzers.append(plugin())
+    return analyzers
+
+
+@dataclass
+class ScanLimits:
+    """
+    Per-file guards of a scan. A limit of None is disabled.
+
+    Files over max_file_bytes, lines over max_line_length and files whose
+    analyzers run past file_time_budget seconds are either skipped or scanned
+    in a degraded mode (on_limit): only the first max_file_bytes, lines cut to
+    max_line_length, or the results up to the line where the budget ran out.
+    Files that are not UTF-8 are likewise skipped or decoded with replacement
+    characters. Binary files, and generated files unless scan_generated is
+    set, are always skipped. The time budget is checked between lines, so it
+    is max_line_length that bounds the time a single line can take.
+    """
+    max_file_bytes: Optional[int] = 1024 * 1024
+    max_line_length: Optional[int] = 10_000
+    file_time_budget: Optional[float] = 10.0
+    on_limit: str = "degrade"
+    scan_generated: bool = False
+
+
+ON_LIMIT_ACTIONS = ("degrade", "skip")
+
+
+@dataclass
+class SkippedFile:
+    """A file that was skipped, or scanned in a degraded mode, because of a ScanLimits guard."""
+    file: str
+    module: str
+    reason: str
+    action: str
+    detail: str = ""
+
+
+# Bytes checked for NUL when telling binary files from text
+BINARY_SNIFF_BYTES = 8192
+
+# Lines checked for a generated-code marker, up to the first type declaration
+GENERATED_HEADER_LINES = 50
+GENERATED_MARKER = re.compile(
+    r'@(?:javax\.annotation\.(?:processing\.)?|jakarta\.annotation\.)?Generated\b'
+    r'|\b(?:DO NOT EDIT|[Aa]uto-generated|[Gg]enerated by)\b'
+)
+TYPE_DECLARATION = re.compile(r'^\s*(?:[\w@]+\s+)*(?:class|interface|enum|record|object)\s+\w')
+
+
+def is_generated(lines: List[str]) -> bool:
+    """Whether the header of a file (up to its first type declaration) marks it as generated code."""
+    for line in lines[:GENERATED_HEADER_LINES]:
+        if GENERATED_MARKER.search(line):
+            return True
+        if TYPE_DECLARATION.match(line):
+            return False
+    return False
+
+
+def read_source_file(
+    file_path: Path,
+    repo_root: Path,
+    limits: Optional[ScanLimits] = None,
+    skipped: Optional[List[SkippedFile]] = None
+) -> Optional[SourceFile]:
+    """
+    Read and decode a source file once, splitting it into lines.
+
+    With limits, the ScanLimits guards are applied and every file they skip
+    or degrade is appended to skipped. Returns None for unreadable or skipped
+    files.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            if limits and limits.max_file_bytes is not None:
+                data = f.read(limits.max_file_bytes + 1)
+            else:
+                data = f.read()
+    except Exception as e:
+        print(f"Warning: Could not read {file_path}: {e}")
+        return None
+    return decode_source(file_path, repo_root, data, limits, skipped)
 
+
+def decode_source(
+    file_path: Path,
+    repo_root: Path,
+    data: bytes,
+    limits: Optional[ScanLimits] = None,
+    skipped: Optional[List[SkippedFile]] = None,
+    module: Optional[str] = None
+) -> Optional[SourceFile]:
+    """
+    Decode the bytes of a source file (read from disk or an editor buffer) into a SourceFile.
+
+    Applies the same ScanLimits guards as read_source_file(). module overrides
+    the module derived from the path. Returns None for skipped files.
+    """
+    rel_path = str(file_path.relative_to(repo_root))
+    if module is None:
+        module = get_module_name(file_path, repo_root)
+
+    def guard(reason: str, detail: str, degradable: bool = True) -> bool:
+        """Record a hit limit; True if the file is to be skipped."""
+        action = limits.on_limit if degradable else "skip"
+        if skipped is not None:
+            skipped.append(SkippedFile(rel_path, module, reason, action, detail))
+        return action == "skip"
+
+    if limits:
+        if b'\0' in data[:BINARY_SNIFF_BYTES]:
+            guard("binary", "NUL byte in header", degradable=False)
+            return None
+        if limits.max_file_bytes is not None and len(data) > limits.max_file_bytes:
+            size = file_path.stat().st_size if file_path.exists() else len(data)
+            if guard("file_size", f"{size} bytes, limit {limits.max_file_bytes}"):
+                return None
+            # Keep whole lines only
+            data = data[:limits.max_file_bytes]
+            data = data[:data.rfind(b'\n') + 1] or data
+        try:
+            text = data.decode('utf-8')
+        except UnicodeDecodeError as e:
+            if guard("encoding", f"not UTF-8 at byte {e.start}"):
+                return None
+            text = data.decode('utf-8', errors='replace')
+    else:
+        text = data.decode('utf-8', errors='replace')
+
+    lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    if lines and not lines[-1]:
+        lines.pop()
+
+    if limits:
+        if not limits.scan_generated and is_generated(lines):
+            guard("generated", "generated-code marker in header", degradable=False)
+            return None
+        if limits.max_line_length is not None:
+            long_lines = [i for i, line in enumerate(lines) if len(line) > limits.max_line_length]
+            if long_lines:
+                longest = max(len(lines[i]) for i in long_lines)
+                if guard("line_length", f"{len(long_lines)} lines over {limits.max_line_length} chars, "
+                                        f"longest {longest}"):
+                    return None
+                for i in long_lines:
+                    lines[i] = lines[i][:limits.max_line_length]
+                text = '\n'.join(lines)
+
+    return SourceFile(
+        path=file_path,
+        rel_path=rel_path,
+        module=module,
+        data=data,
+        text=text,
+        lines=lines,
+        scope=file_scope(file_path, repo_root),
+        language=language_of(file_path)
+    )
+
+
+# Cumulative time spent in each analyzer's analyze() during this process
+analyzer_seconds: Dict[str, float] = defaultdict(float)
+
+
+def analyze_file(
+    file_path: Path,
+    repo_root: Path,
+    analyzers: List[Analyzer],
+    limits: Optional[ScanLimits] = None,
+    skipped: Optional[List[SkippedFile]] = None
+) -> Dict[str, Any]:
+    """Read a single file once and run every analyzer on it, keyed by analyzer name."""
+    source = read_source_file(file_path, repo_root, limits, skipped)
+    if source is None:
+        return {}
+    return analyze_source(source, analyzers, limits, skipped)
+
+
+def analyze_source(
+    source: SourceFile,
+    analyzers: List[Analyzer],
+    limits: Optional[ScanLimits] = None,
+    skipped: Optional[List[SkippedFile]] = None
+) -> Dict[str, Any]:
+    """Run every analyzer on a decoded source file, keyed by analyzer name."""
+    if limits and limits.file_time_budget is not None:
+        source.deadline = time.perf_counter() + limits.file_time_budget
+
+    results = {}
+    for analyzer in analyzers:
+        started = time.perf_counter()
+        results[analyzer.name] = analyzer.analyze(source)
+        analyzer_seconds[analyzer.name] += time.perf_counter() - started
+
+    if source.stopped_at is not None:
+        detail = f"stopped at line {source.stopped_at} of {len(source.lines)} after {limits.file_time_budget:g}s"
+        action = limits.on_limit
+        if skipped is not None:
+            skipped.append(SkippedFile(source.rel_path, source.module, "time_budget", action, detail))
+        if action == "skip":
+            return {}
     return results
 
 
-def merge_reports(reports: List[Dict[str, CategoryReport]]) -> Dict[str, CategoryReport]:
+def skipped_section(limits: Optional[ScanLimits], skipped: List[SkippedFile]) -> dict:
+    """The report's "skipped" section: the limits in force and every file they skipped or degraded."""
+    by_reason: Dict[str, Dict[str, int]] = {}
+    for entry in skipped:
+        counts = by_reason.setdefault(entry.reason, {"skip": 0, "degrade": 0})
+        counts[entry.action] += 1
+    return {
+        "limits": asdict(limits) if limits else None,
+        "skipped_files": len({e.file for e in skipped if e.action == "skip"}),
+        "degraded_files": len({e.file for e in skipped if e.action == "degrade"}),
+        "by_reason": dict(sorted(by_reason.items())),
+        "files": [asdict(e) for e in sorted(skipped, key=lambda e: (e.file, e.reason))],
+    }
+
+
+class LazyMapping(Mapping):
+    """A read-only mapping over known keys whose values are computed on every access and not kept."""
+
+    def __init__(self, keys: List[str], compute: Callable[[str], Any]):
+        self._keys = keys
+        self._index = set(keys)
+        self._compute = compute
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._index:
+            raise KeyError(key)
+        return self._compute(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+def _json_chunks(obj: Any, indent: int, level: int) -> Iterable[str]:
+    if isinstance(obj, Mapping) and obj:
+        inner = "\n" + " " * (indent * (level + 1))
+        yield "{"
+        for i, (key, value) in enumerate(obj.items()):
+            yield ("," if i else "") + inner + json.dumps(key) + ": "
+            yield from _json_chunks(value, indent, level + 1)
+        yield "\n" + " " * (indent * level) + "}"
+    else:
+        yield json.dumps(dict(obj) if isinstance(obj, Mapping) else obj, indent=indent).replace(
+            "\n", "\n" + " " * (indent * level))
+
+
+def write_json_streaming(obj: Any, f, indent: int = 2) -> None:
+    """
+    Write obj as json.dump(obj, f, indent=indent) would, one mapping item at a
+    time, so that LazyMapping values are built, written and dropped in turn.
+    """
+    for chunk in _json_chunks(obj, indent, 0):
+        f.write(chunk)
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size of this process, where /proc is available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def max_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process so far."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+MEMORY_MODES = ("rss", "tracemalloc")
+
+
+class MemoryProfile:
+    """
+    Peak memory per stage of a run (walk, scan, merge, report, serialize).
+
+    "rss" samples the resident set size of the process from a background
+    thread every interval seconds; it costs next to nothing and measures what
+    the OOM killer sees. Without /proc only the process high-water mark is
+    known, so a stage's peak is the peak so far. "tracemalloc" traces Python
+    allocations instead: exact heap peaks, but a several times slower scan.
+    """
+
+    def __init__(self, mode: str = "rss", interval: float = 0.01):
+        self.mode = mode
+        self.stages: Dict[str, dict] = {}
+        self._peak = 0
+        self._stop = threading.Event()
+        if mode == "tracemalloc":
+            tracemalloc.start()
+        elif rss_bytes() is not None:
+            self._peak = rss_bytes()
+            sampler = threading.Thread(target=self._sample, args=(interval,), daemon=True)
+            sampler.start()
+
+    def _sample(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self._peak = max(self._peak, rss_bytes() or 0)
+
+    def current(self) -> int:
+        """Bytes in use now: RSS, or traced Python memory."""
+        if self.mode == "tracemalloc":
+            return tracemalloc.get_traced_memory()[0]
+        return rss_bytes() or max_rss_bytes() or 0
+
+    @contextmanager
+    def stage(self, name: str):
+        """Record the time, start, end and peak memory of the enclosed block as stage name."""
+        start = self.current()
+        if self.mode == "tracemalloc":
+            tracemalloc.reset_peak()
+        self._peak = start
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = self.current()
+            if self.mode == "tracemalloc":
+                peak = tracemalloc.get_traced_memory()[1]
+            elif rss_bytes() is not None:
+                peak = max(self._peak, end)
+            else:
+                peak = max_rss_bytes() or end
+            mib = 1024 * 1024
+            self.stages[name] = {
+                "seconds": round(time.perf_counter() - started, 3),
+                "start_mb": round(start / mib, 1),
+                "end_mb": round(end / mib, 1),
+                "peak_mb": round(peak / mib, 1),
+            }
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self.mode == "tracemalloc":
+            tracemalloc.stop()
+
+    def to_dict(self) -> dict:
+        return {"mode": self.mode, "stages": dict(self.stages)}
+
+    def print_summary(self) -> None:
+        print(f"Peak memory per stage ({self.mode}):")
+        for name, stage in self.stages.items():
+            print(f"  {name}: {stage['peak_mb']:.1f} MiB peak, {stage['start_mb']:.1f} -> {stage['end_mb']:.1f} MiB, "
+                  f"{stage['seconds']:.2f}s")
+
+
+# Projected memory growth of a full scan per byte of source scanned, with every
+# finding kept and the report built in memory. flexmark-java grows by well under
+# one byte per source byte; the headroom is for trees with far denser findings.
+PEAK_BYTES_PER_SOURCE_BYTE = 4.0
+
+# Findings kept per category once --memory-budget switches to bounded retention
+BUDGET_MAX_FINDINGS = 1000
+
+
+def projected_peak(profile: MemoryProfile, scanned_bytes: int) -> int:
+    """Projected peak memory of scanning scanned_bytes of source from the current memory use."""
+    return profile.current() + int(scanned_bytes * PEAK_BYTES_PER_SOURCE_BYTE)
+
+
+def merge_reports(
+    reports: List[Dict[str, CategoryReport]],
+    max_findings: Optional[int] = None,
+    rng: Optional[random.Random] = None
+) -> Dict[str, CategoryReport]:
     """Merge multiple file reports into a single report."""
-    merged = {cat: CategoryReport() for cat in API_CATEGORIES}
+    rng = rng or random.Random(0)
+    merged = {cat: CategoryReport(max_findings=max_findings) for cat in API_CATEGORIES}
 
     for report in reports:
         for category, category_report in report.items():
-            merged[category].count += category_report.count
-            merged[category].files.update(category_report.files)
-            merged[category].findings.extend(category_report.findings)
+            merged[category].merge(category_report, rng)
 
     return merged
 
 
-def analyze_by_module(java_files: List[Path], repo_root: Path) -> Dict[str, Dict[str, CategoryReport]]:
-    """Analyze files grouped by module."""
-    module_reports = defaultdict(list)
+def analyze_by_module(
+    java_files: List[Path],
+    repo_root: Path,
+    analyzers: List[Analyzer],
+    limits: Optional[ScanLimits] = None,
+    skipped: Optional[List[SkippedFile]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Analyze files grouped by module in a single pass.
+
+    Returns analyzer name -> module -> merged analyzer result. File results are
+    folded into their module as they arrive so only one per-file result per
+    analyzer is alive at a time. Files hitting limits are recorded in skipped.
+    """
+    by_name = {analyzer.name: analyzer for analyzer in analyzers}
+    module_results: Dict[str, Dict[str, Any]] = {a.name: {} for a in analyzers}
 
     for file_path in java_files:
         module = get_module_name(file_path, repo_root)
-        report = analyze_file(file_path, repo_root)
-        module_reports[module].append(report)
+        for name, result in analyze_file(file_path, repo_root, analyzers, limits, skipped).items():
+            merged = module_results[name]
+            merged[module] = by_name[name].merge([merged[module], result] if module in merged else [result])
+
+    return module_results
+
+
+def build_report(analyzers: List[Analyzer], results: Dict[str, Dict[str, Any]]) -> dict:
+    """Combine the report sections contributed by each analyzer."""
+    report: dict = {}
+    for analyzer in analyzers:
+        report.update(analyzer.report(results[analyzer.name]))
+    return report
 
+
+def partial_report(
+    analyzers: List[Analyzer],
+    results: Dict[str, Dict[str, Any]],
+    shard: Tuple[int, int],
+    scan: dict,
+    max_findings: Optional[int],
+    mask: bool = True,
+    limits: Optional[ScanLimits] = None,
+    skipped: Optional[List[SkippedFile]] = None
+) -> dict:
+    """The per-shard report: merged module results of every analyzer, for merge_partial_reports()."""
     return {
-        module: merge_reports(reports)
-        for module, reports in module_reports.items()
+        "partial": {
+            "shard": f"{shard[0]}/{shard[1]}",
+            "analyzers": [a.name for a in analyzers],
+            "scope": scan["scope"],
+            "max_findings": max_findings,
+            "mask": mask,
+            "limits": asdict(limits) if limits else None,
+        },
+        "scan": scan,
+        "skipped": [asdict(e) for e in skipped or []],
+        "results": {a.name: a.dump_results(results[a.name]) for a in analyzers},
     }
 
 
-def generate_report(module_reports: Dict[str, Dict[str, CategoryReport]]) -> dict:
-    """Generate the final JSON report structure."""
+def merge_partial_reports(
+    partials: List[dict],
+    seed: int = 0,
+    stream: bool = False,
+    max_findings: Optional[int] = None
+) -> Tuple[List[Analyzer], dict]:
+    """
+    Combine partial reports into the report of a single full run.
+
+    Module results of the same module are folded together with each analyzer's
+    merge(), so sampled findings are combined by reservoir merging. A
+    max_findings below the partials' own bound (as under --memory-budget)
+    subsamples the findings while loading. Returns the analyzers and the
+    report (with lazy sections if stream).
+    """
+    first = partials[0]["partial"]
+    for partial in partials[1:]:
+        meta = partial["partial"]
+        for key in ("analyzers", "scope", "max_findings", "mask", "limits"):
+            if meta.get(key) != first.get(key):
+                raise ValueError(f"Partial reports disagree on {key}: {first[key]} vs {meta[key]}")
+
+    shards = [p["partial"]["shard"] for p in partials]
+    duplicates = sorted({s for s in shards if shards.count(s) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate shards: {', '.join(duplicates)}")
+    counts = {int(s.split("/")[1]) for s in shards}
+    if len(counts) > 1:
+        raise ValueError(f"Partial reports come from different shard counts: {sorted(counts)}")
+    missing = sorted(set(range(1, counts.pop() + 1)) - {int(s.split("/")[0]) for s in shards})
+
+    analyzers = load_analyzers(first["analyzers"])
+    for analyzer in analyzers:
+        if isinstance(analyzer, ApiBlockerAnalyzer):
+            analyzer.max_findings = first["max_findings"]
+            if max_findings is not None and (analyzer.max_findings is None or max_findings < analyzer.max_findings):
+                analyzer.max_findings = max_findings
+            analyzer.rng.seed(seed)
+            analyzer.stream = stream
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for analyzer in analyzers:
+        merged: Dict[str, Any] = {}
+        for partial in partials:
+            for module, result in analyzer.load_results(partial["results"][analyzer.name]).items():
+                merged[module] = analyzer.merge([merged[module], result] if module in merged else [result])
+        results[analyzer.name] = dict(sorted(merged.items()))
+
+    scan = {"scope": first["scope"], "scanned_files": 0, "scanned_bytes": 0, "by_scope": {}}
+    for partial in partials:
+        part = partial["scan"]
+        scan["scanned_files"] += part["scanned_files"]
+        scan["scanned_bytes"] += part["scanned_bytes"]
+        for name, entry in part["by_scope"].items():
+            total = scan["by_scope"].setdefault(name, {"files": 0, "bytes": 0, "scanned": entry["scanned"]})
+            total["files"] += entry["files"]
+            total["bytes"] += entry["bytes"]
+    if missing:
+        scan["missing_shards"] = missing
+
+    limits = ScanLimits(**first["limits"]) if first.get("limits") else None
+    skipped = [SkippedFile(**e) for partial in partials for e in partial.get("skipped", [])]
+    report = {"scan": scan, "skipped": skipped_section(limits, skipped)}
+    return analyzers, {**report, **build_report(analyzers, results)}
+
+
+def generate_report(
+    module_reports: Dict[str, Dict[str, CategoryReport]],
+    max_findings: Optional[int] = None,
+    rng: Optional[random.Random] = None,
+    lazy: bool = False
+) -> dict:
+    """
+    Generate the final JSON report structure.
+
+    With lazy, by_module and totals are LazyMappings that convert one module
+    or category at a time, for write_json_streaming().
+    """
     # Aggregate totals
-    totals = {cat: CategoryReport() for cat in API_CATEGORIES}
-    for module, categories in module_reports.items():
-        for category, report in categories.items():
-            totals[category].count += report.count
-            totals[category].files.update(report.files)
-            totals[category].findings.extend(report.findings)
+    totals = merge_reports(list(module_reports.values()), max_findings, rng)
+
+    def module_dict(module: str) -> dict:
+        return {
+            category: report.to_dict()
+            for category, report in module_reports[module].items()
+            if report.count > 0
+        }
+
+    modules = [
+        module for module, categories in sorted(module_reports.items())
+        if any(r.count > 0 for r in categories.values())
+    ]
+    by_module = LazyMapping(modules, module_dict)
+    category_totals = LazyMapping(list(API_CATEGORIES), lambda category: totals[category].to_dict())
 
     return {
         "summary": {
@@ -236,38 +1281,380 @@ def generate_report(module_reports: Dict[str, Dict[str, CategoryReport]]) -> dic
                 "description": API_CATEGORIES[category]["description"],
                 "impact": API_CATEGORIES[category]["impact"],
                 "total_occurrences": totals[category].count,
-                "files_affected": len(totals[category].files)
+                "files_affected": len(totals[category].files),
+                "by_scope": dict(sorted(totals[category].by_scope.items()))
             }
             for category in API_CATEGORIES
         },
-        "by_module": {
-            module: {
-                category: report.to_dict()
-                for category, report in categories.items()
-                if report.count > 0
-            }
-            for module, categories in sorted(module_reports.items())
-            if any(r.count > 0 for r in categories.values())
+        "by_module": by_module if lazy else dict(by_module),
+        "totals": category_totals if lazy else dict(category_totals),
+    }
+
+
+@dataclass
+class StratumStats:
+    """Running per-file sums for one module (stratum) and one category."""
+    sum_count: float = 0.0
+    sum_count_sq: float = 0.0
+    files_hit: int = 0
+
+    def add(self, count: int) -> None:
+        self.sum_count += count
+        self.sum_count_sq += count * count
+        if count:
+            self.files_hit += 1
+
+
+def _stratified_total(strata: List[tuple], hit_sq_mean: float = 1.0) -> tuple:
+    """
+    Estimate a population total from stratified simple random samples.
+
+    strata holds (population size N, sample size n, sum, sum of squares, files
+    hit) per stratum. Returns (estimate, variance) using the finite population
+    correction. The sample variance of a stratum without a single hit is zero,
+    and that of one with two samples or fewer is unreliable, so the unsampled
+    part of such strata is given a conservative variance instead:
+    - no hit: the rule of three over all strata without a hit (hit rate at most
+      3 / files sampled there) times hit_sq_mean, the mean square count of a hit
+    - two samples or fewer: the within-stratum variance pooled over all strata
+    """
+    pooled_ss = 0.0
+    pooled_df = 0
+    sampled_no_hit = 0
+    for population, sampled, total, total_sq, hits in strata:
+        if sampled > 1:
+            pooled_ss += max(0.0, total_sq - total * total / sampled)
+            pooled_df += sampled - 1
+        if not hits:
+            sampled_no_hit += sampled
+    pooled_var = pooled_ss / pooled_df if pooled_df else 0.0
+    no_hit_var = min(1.0, 3 / sampled_no_hit) * hit_sq_mean if sampled_no_hit else 0.0
+
+    estimate = 0.0
+    variance = 0.0
+    for population, sampled, total, total_sq, hits in strata:
+        if sampled == 0:
+            continue
+        mean = total / sampled
+        estimate += population * mean
+        if sampled < population:
+            sample_var = max(0.0, (total_sq - sampled * mean * mean) / (sampled - 1)) if sampled > 1 else 0.0
+            if not hits:
+                sample_var = max(sample_var, no_hit_var)
+            elif sampled <= 2:
+                sample_var = max(sample_var, pooled_var)
+            variance += population * population * (1 - sampled / population) * sample_var / sampled
+    return estimate, variance
+
+
+def _interval(estimate: float, variance: float, z: float) -> dict:
+    half_width = z * math.sqrt(variance)
+    return {
+        "value": round(estimate, 1),
+        "low": round(max(0.0, estimate - half_width), 1),
+        "high": round(estimate + half_width, 1),
+        "half_width": round(half_width, 1),
+    }
+
+
+def estimate_report(
+    java_files: List[Path],
+    repo_root: Path,
+    precision: float = 0.1,
+    confidence: float = 0.95,
+    min_count: int = 50,
+    max_fraction: float = 0.4,
+    batch_fraction: float = 0.05,
+    seed: int = 0,
+    mask: bool = True,
+    limits: Optional[ScanLimits] = None,
+    skipped: Optional[List[SkippedFile]] = None
+) -> dict:
+    """
+    Estimate per-category counts from a stratified random sample of files.
+
+    Files are stratified by module. Each round raises the sampled fraction of
+    every module by batch_fraction (proportional allocation, at least one file
+    per module). After the second round the scan stops as soon as the
+    confidence interval of every category total is within +/- precision of
+    max(estimate, min_count), so rare categories are bounded in absolute terms,
+    or once max_fraction of the files are sampled, whichever comes first.
+    Returns a report shaped like generate_report(), with estimate intervals.
+    """
+    rng = random.Random(seed)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    analyzer = ApiBlockerAnalyzer(max_findings=0, mask=mask)
+
+    strata: Dict[str, List[Path]] = defaultdict(list)
+    for file_path in java_files:
+        strata[get_module_name(file_path, repo_root)].append(file_path)
+    for files in strata.values():
+        rng.shuffle(files)
+
+    sampled = {module: 0 for module in strata}
+    stats = {module: {cat: StratumStats() for cat in API_CATEGORIES} for module in strata}
+
+    def hit_sq_mean(category: str) -> float:
+        """Mean square count of a hit; pooled over all categories while the category has few hits."""
+        rows = [stats[module][category] for module in strata]
+        if sum(st.files_hit for st in rows) < 3:
+            rows = [st for module in strata for st in stats[module].values()]
+        hits = sum(st.files_hit for st in rows)
+        return sum(st.sum_count_sq for st in rows) / hits if hits else 1.0
+
+    def totals_for(category: str, modules: List[str], files_hit: bool = False) -> tuple:
+        rows = []
+        for module in modules:
+            st = stats[module][category]
+            if files_hit:
+                rows.append((len(strata[module]), sampled[module], st.files_hit, st.files_hit, st.files_hit))
+            else:
+                rows.append((len(strata[module]), sampled[module], st.sum_count, st.sum_count_sq, st.files_hit))
+        return _stratified_total(rows, 1.0 if files_hit else hit_sq_mean(category))
+
+    rounds = 0
+    converged = False
+    while not converged:
+        rounds += 1
+        fraction = min(max_fraction, rounds * batch_fraction)
+        for module, files in strata.items():
+            target = max(1, round(len(files) * fraction))
+            for file_path in files[sampled[module]:target]:
+                counts = analyze_file(file_path, repo_root, [analyzer], limits, skipped).get(analyzer.name)
+                for category in API_CATEGORIES:
+                    stats[module][category].add(counts[category].count if counts else 0)
+                sampled[module] += 1
+
+        if rounds >= 2:
+            converged = all(
+                z * math.sqrt(variance) <= precision * max(estimate, min_count)
+                for estimate, variance in (totals_for(category, list(strata)) for category in API_CATEGORIES)
+            )
+        if fraction >= max_fraction:
+            break
+
+    summary = {}
+    totals = {}
+    for category in API_CATEGORIES:
+        occurrences = _interval(*totals_for(category, list(strata)), z)
+        files_affected = _interval(*totals_for(category, list(strata), files_hit=True), z)
+        summary[category] = {
+            "description": API_CATEGORIES[category]["description"],
+            "impact": API_CATEGORIES[category]["impact"],
+            "total_occurrences": round(occurrences["value"]),
+            "files_affected": round(files_affected["value"]),
+            "estimate": {"total_occurrences": occurrences, "files_affected": files_affected},
+        }
+        totals[category] = {"count": round(occurrences["value"]), "estimate": occurrences}
+
+    by_module = {}
+    for module in sorted(strata):
+        categories = {}
+        for category in API_CATEGORIES:
+            occurrences = _interval(*totals_for(category, [module]), z)
+            if occurrences["value"] > 0:
+                files_affected = _interval(*totals_for(category, [module], files_hit=True), z)
+                categories[category] = {
+                    "count": round(occurrences["value"]),
+                    "file_count": round(files_affected["value"]),
+                    "estimate": {"count": occurrences, "file_count": files_affected},
+                }
+        if categories:
+            by_module[module] = categories
+
+    return {
+        "estimation": {
+            "sampled_files": sum(sampled.values()),
+            "total_files": len(java_files),
+            "rounds": rounds,
+            "converged": converged,
+            "precision": precision,
+            "confidence": confidence,
+            "min_count": min_count,
+            "max_fraction": max_fraction,
+            "strata": len(strata),
+            "seed": seed,
         },
-        "totals": {
-            category: totals[category].to_dict()
+        "summary": summary,
+        "by_module": by_module,
+        "totals": totals,
+    }
+
+
+def verify_estimate(
+    report: dict,
+    java_files: List[Path],
+    repo_root: Path,
+    mask: bool = True,
+    limits: Optional[ScanLimits] = None
+) -> dict:
+    """
+    Check an estimate_report() against a full scan of the same files.
+
+    The estimate passes when it stopped within its sample budget (max_fraction
+    of the files, plus at most one file per module for rounding) and every
+    category interval holds the true count.
+    """
+    analyzer = ApiBlockerAnalyzer(max_findings=0, mask=mask)
+    occurrences = {category: 0 for category in API_CATEGORIES}
+    files_affected = {category: 0 for category in API_CATEGORIES}
+    for file_path in java_files:
+        counts = analyze_file(file_path, repo_root, [analyzer], limits, []).get(analyzer.name)
+        for category in API_CATEGORIES:
+            if counts and counts[category].count:
+                occurrences[category] += counts[category].count
+                files_affected[category] += 1
+
+    estimation = report["estimation"]
+    missed = []
+    for category, data in report["summary"].items():
+        for key, true_count in (("total_occurrences", occurrences[category]),
+                                ("files_affected", files_affected[category])):
+            interval = data["estimate"][key]
+            if not interval["low"] <= true_count <= interval["high"]:
+                missed.append({"category": category, "count": key, "true": true_count,
+                               "low": interval["low"], "high": interval["high"]})
+    budget = estimation["max_fraction"] * estimation["total_files"] + estimation["strata"]
+    within_budget = estimation["sampled_files"] <= budget
+    return {
+        "sampled_fraction": round(estimation["sampled_files"] / max(1, estimation["total_files"]), 3),
+        "within_budget": within_budget,
+        "true_counts": {
+            category: {"total_occurrences": occurrences[category], "files_affected": files_affected[category]}
             for category in API_CATEGORIES
+        },
+        "missed": missed,
+        "passed": within_budget and not missed,
+    }
+
+
+def progress_snapshot(report: dict, repo_root: Path) -> Optional[dict]:
+    """
+    Compact per-module conversion progress: converted/unconverted LOC and
+    remaining blocker counts. None unless both api_blockers and loc ran.
+    """
+    if "loc" not in report or "by_module" not in report:
+        return None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=repo_root, capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    loc = report["loc"]
+    modules = {}
+    for module in sorted(set(loc["by_module"]) | set(report["by_module"])):
+        counts = loc["by_module"].get(module)
+        blockers = report["by_module"].get(module, {})
+        modules[module] = {
+            "java_loc": counts["java"]["loc"] if counts else 0,
+            "kotlin_loc": counts["kotlin"]["loc"] if counts else 0,
+            "converted_pct": counts["converted_pct"] if counts else 0.0,
+            "blockers": {category: data["count"] for category, data in blockers.items()},
         }
+    return {
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "commit": commit,
+        "scope": report.get("scan", {}).get("scope"),
+        "totals": {
+            "java_loc": loc["totals"]["java"]["loc"],
+            "kotlin_loc": loc["totals"]["kotlin"]["loc"],
+            "converted_pct": loc["totals"]["converted_pct"],
+            "blockers": {
+                category: data["total_occurrences"]
+                for category, data in report["summary"].items()
+                if data["total_occurrences"]
+            },
+        },
+        "modules": modules,
     }
 
 
+def write_snapshot(snapshot: dict, snapshot_dir: Path) -> Path:
+    """Write a snapshot as compact JSON named after its timestamp."""
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    stamp = snapshot["timestamp"].replace("-", "").replace(":", "")
+    path = snapshot_dir / f"snapshot-{stamp}.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    return path
+
+
+def memory_section(profile: MemoryProfile, budget_mb: Optional[float], projected: int, budget_mode: bool) -> dict:
+    """The report's "memory" section: peak memory of the stages so far and the --memory-budget decision."""
+    return {
+        **profile.to_dict(),
+        "budget_mb": budget_mb,
+        "projected_peak_mb": round(projected / (1024 * 1024), 1),
+        "budget_mode": budget_mode,
+    }
+
+
+def write_report(report: dict, output_path: Path, stream: bool) -> None:
+    """Write the JSON report, streaming its lazy sections if stream."""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        if stream:
+            write_json_streaming(report, f)
+        else:
+            json.dump(report, f, indent=2)
+
+
 def print_summary(report: dict) -> None:
-    """Print a human-readable summary to console."""
+    """Print a human-readable summary to console. Estimated values are marked with '~'."""
+    estimation = report.get("estimation")
+    mark = "~" if estimation else ""
+
+    def interval(value, estimate) -> str:
+        if not estimate:
+            return f"{value}"
+        return f"~{value} ({estimate['low']:g}-{estimate['high']:g})"
+
     print("\n" + "=" * 70)
     print("JAVA API BLOCKERS ANALYSIS - SUMMARY")
     print("=" * 70)
 
+    scan = report.get("scan")
+    if scan:
+        skipped = [f"{name} ({e['files']} files)" for name, e in scan["by_scope"].items()
+                   if not e["scanned"] and e["files"]]
+        print(f"\nScope: {scan['scope']} ({scan['scanned_files']} files, {scan['scanned_bytes'] / 1024:.0f} KiB)"
+              f"{'; not scanned: ' + ', '.join(skipped) if skipped else ''}")
+        if scan.get("missing_shards"):
+            print(f"WARNING: merged without shards {', '.join(map(str, scan['missing_shards']))}; "
+                  f"counts are incomplete")
+
+    guarded = report.get("skipped")
+    if guarded and guarded["files"]:
+        reasons = ", ".join(
+            f"{reason}: {counts['skip']} skipped, {counts['degrade']} degraded"
+            for reason, counts in guarded["by_reason"].items()
+        )
+        print(f"Limits: {guarded['skipped_files']} files skipped, {guarded['degraded_files']} degraded ({reasons})")
+
+    if estimation:
+        print(f"\nESTIMATE from {estimation['sampled_files']} of {estimation['total_files']} files "
+              f"({estimation['confidence']:.0%} confidence intervals, target +/-{estimation['precision']:.0%}"
+              f"{'' if estimation['converged'] else ', not converged'})")
+        verification = estimation.get("verification")
+        if verification:
+            print(f"Verified against a full scan: {'PASSED' if verification['passed'] else 'FAILED'} "
+                  f"(sampled {verification['sampled_fraction']:.0%} of the files, "
+                  f"{'within' if verification['within_budget'] else 'over'} the "
+                  f"{estimation['max_fraction']:.0%} budget; {len(verification['missed'])} intervals miss)")
+            for miss in verification["missed"]:
+                print(f"  MISS {miss['category']} {miss['count']}: {miss['true']} not in "
+                      f"{miss['low']:g}-{miss['high']:g}")
+
     for category, data in report["summary"].items():
         if data["total_occurrences"] > 0:
+            estimate = data.get("estimate", {})
             print(f"\n[{data['impact']}] {category}")
             print(f"  Description: {data['description']}")
-            print(f"  Occurrences: {data['total_occurrences']}")
-            print(f"  Files affected: {data['files_affected']}")
+            print(f"  Occurrences: {interval(data['total_occurrences'], estimate.get('total_occurrences'))}")
+            print(f"  Files affected: {interval(data['files_affected'], estimate.get('files_affected'))}")
+            if len(data.get("by_scope", {})) > 1:
+                print(f"  By scope: {', '.join(f'{k}: {v}' for k, v in data['by_scope'].items())}")
 
     print("\n" + "-" * 70)
     print("BY MODULE (modules with blockers):")
@@ -275,10 +1662,10 @@ def print_summary(report: dict) -> None:
 
     for module, categories in report["by_module"].items():
         total = sum(c["count"] for c in categories.values())
-        print(f"\n  {module}: {total} occurrences")
+        print(f"\n  {module}: {mark}{total} occurrences")
         for cat, data in categories.items():
             if data["count"] > 0:
-                print(f"    - {cat}: {data['count']} in {data['file_count']} files")
+                print(f"    - {cat}: {mark}{data['count']} in {mark}{data['file_count']} files")
 
     print("\n" + "=" * 70)
 
@@ -287,6 +1674,19 @@ def main():
     parser = argparse.ArgumentParser(
         description="Analyze Java API usage that blocks Kotlin Multiplatform conversion"
     )
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["scan", "merge"],
+        default="scan",
+        help="scan the sources (default), or merge partial reports written by --shard"
+    )
+    parser.add_argument(
+        "partials",
+        nargs="*",
+        type=Path,
+        help="Partial reports to merge (merge)"
+    )
     parser.add_argument(
         "--repo-root",
         type=Path,
@@ -297,32 +1697,350 @@ def main():
         "--output",
         type=Path,
         default=None,
-        help="Output JSON file path (default: .ai_out/.../java_api_blockers.json)"
+        help="Output JSON file path (default: .ai_out/.../java_api_blockers.json, "
+             "or java_api_blockers.shard-I-of-N.json with --shard)"
+    )
+    parser.add_argument(
+        "--shard",
+        default=None,
+        metavar="I/N",
+        help="Scan only the files whose path hashes to shard I of N and write a partial report"
+    )
+    parser.add_argument(
+        "--scope",
+        choices=list(SCOPES),
+        default="main",
+        help="Source sets to scan: main, test, testFixtures or all (default: main)"
+    )
+    parser.add_argument(
+        "--analyzers",
+        default="api_blockers,loc",
+        help=f"Comma-separated analyzer plugins to run in the same pass "
+             f"(default: api_blockers,loc; available: {', '.join(ANALYZER_PLUGINS)})"
+    )
+    parser.add_argument(
+        "--no-mask",
+        action="store_true",
+        help="Count pattern matches inside comments and string literals too"
+    )
+    parser.add_argument(
+        "--max-file-bytes",
+        type=int,
+        default=ScanLimits.max_file_bytes,
+        help=f"Files larger than this hit the size limit; 0 disables it (default: {ScanLimits.max_file_bytes})"
+    )
+    parser.add_argument(
+        "--max-line-length",
+        type=int,
+        default=ScanLimits.max_line_length,
+        help=f"Lines longer than this hit the line length limit; 0 disables it "
+             f"(default: {ScanLimits.max_line_length})"
+    )
+    parser.add_argument(
+        "--file-time-budget",
+        type=float,
+        default=ScanLimits.file_time_budget,
+        metavar="SECONDS",
+        help=f"Analyzer time per file before the scan of the file stops; 0 disables it "
+             f"(default: {ScanLimits.file_time_budget:g})"
+    )
+    parser.add_argument(
+        "--on-limit",
+        choices=ON_LIMIT_ACTIONS,
+        default=ScanLimits.on_limit,
+        help="Skip files that hit a limit, or scan them in a degraded mode: truncated file, "
+             "truncated lines, results up to the time budget (default: degrade)"
+    )
+    parser.add_argument(
+        "--scan-generated",
+        action="store_true",
+        help="Scan files whose header marks them as generated code (@Generated, \"DO NOT EDIT\", ...)"
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=float,
+        default=None,
+        metavar="MB",
+        help="If the projected peak memory exceeds MB MiB, keep at most "
+             f"{BUDGET_MAX_FINDINGS} findings per category (unless --max-findings-per-category "
+             "is given) and stream the report to disk"
+    )
+    parser.add_argument(
+        "--memory-profile",
+        choices=MEMORY_MODES,
+        default="rss",
+        help="How peak memory per stage is measured: sampled RSS (default) or tracemalloc "
+             "(Python allocations only, slower). Stages are in the report's \"memory\" "
+             "section, except serialize which is only printed"
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        type=Path,
+        default=None,
+        help="Directory for per-run progress snapshots (default: .ai_out/.../progress)"
+    )
+    parser.add_argument(
+        "--no-snapshot",
+        action="store_true",
+        help="Do not write a progress snapshot"
+    )
+    parser.add_argument(
+        "--max-findings-per-category",
+        type=int,
+        default=None,
+        metavar="K",
+        help="Keep a uniform random sample of at most K findings per category "
+             "(counts and files stay exact; default: keep all findings)"
+    )
+    parser.add_argument(
+        "--findings-seed",
+        type=int,
+        default=0,
+        help="Random seed for findings sampling (default: 0)"
+    )
+    parser.add_argument(
+        "--estimate",
+        action="store_true",
+        help="Estimate counts from a stratified random sample of files per module "
+             "instead of scanning every file (api_blockers only)"
+    )
+    parser.add_argument(
+        "--precision",
+        type=float,
+        default=0.1,
+        help="Relative half-width of the confidence intervals at which --estimate stops (default: 0.1)"
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="Confidence level of the --estimate intervals (default: 0.95)"
+    )
+    parser.add_argument(
+        "--min-count",
+        type=int,
+        default=50,
+        help="Counts below this are held to an absolute tolerance of precision * min-count "
+             "by --estimate (default: 50)"
+    )
+    parser.add_argument(
+        "--max-sample-fraction",
+        type=float,
+        default=0.4,
+        help="Fraction of the files at which --estimate stops even if not converged (default: 0.4)"
+    )
+    parser.add_argument(
+        "--verify-estimate",
+        action="store_true",
+        help="Also scan every file and check that --estimate stopped within its sample budget "
+             "and that its intervals hold the true counts; exit 1 otherwise"
+    )
+    parser.add_argument(
+        "--estimate-seed",
+        type=int,
+        default=0,
+        help="Random seed for --estimate file sampling (default: 0)"
     )
     args = parser.parse_args()
 
+    if args.max_findings_per_category is not None and args.max_findings_per_category < 0:
+        parser.error("--max-findings-per-category must not be negative")
+    if not 0 < args.confidence < 1:
+        parser.error("--confidence must be between 0 and 1")
+    if args.precision <= 0:
+        parser.error("--precision must be positive")
+    if not 0 < args.max_sample_fraction <= 1:
+        parser.error("--max-sample-fraction must be in (0, 1]")
+    if args.verify_estimate and not args.estimate:
+        parser.error("--verify-estimate requires --estimate")
+    if min(args.max_file_bytes, args.max_line_length, args.file_time_budget) < 0:
+        parser.error("limits must not be negative")
+    if args.memory_budget is not None and args.memory_budget <= 0:
+        parser.error("--memory-budget must be positive")
+    if args.command == "merge" and not args.partials:
+        parser.error("merge needs at least one partial report")
+    if args.command == "scan" and args.partials:
+        parser.error("partial reports are only accepted by merge")
+    shard = None
+    if args.shard:
+        if args.command == "merge" or args.estimate:
+            parser.error("--shard only applies to a full scan")
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+
     repo_root = args.repo_root.resolve()
+    snapshot_dir = None
+    if not args.no_snapshot:
+        snapshot_dir = args.snapshot_dir or repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis" / "progress"
+
+    profile = MemoryProfile(args.memory_profile)
+    mib = 1024 * 1024
+
+    if args.command == "merge":
+        for path in args.partials:
+            if not path.is_file():
+                parser.error(f"{path} does not exist or is not a file")
+        partial_bytes = sum(path.stat().st_size for path in args.partials)
+        projected = projected_peak(profile, partial_bytes)
+        stream = args.memory_budget is not None and projected > args.memory_budget * mib
+        budget_findings = None
+        if stream:
+            budget_findings = (args.max_findings_per_category if args.max_findings_per_category is not None
+                               else BUDGET_MAX_FINDINGS)
+            print(f"Projected peak {projected / mib:.0f} MiB exceeds the memory budget of {args.memory_budget:g} MiB: "
+                  f"streaming the report and keeping at most {budget_findings} findings per category")
+        with profile.stage("merge"):
+            partials = []
+            for path in args.partials:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        partials.append(json.load(f))
+                except (OSError, ValueError) as e:
+                    parser.error(f"Could not read partial report {path}: {e}")
+                if "partial" not in partials[-1]:
+                    parser.error(f"{path} is not a partial report")
+            try:
+                analyzers, report = merge_partial_reports(partials, args.findings_seed, stream, budget_findings)
+            except ValueError as e:
+                parser.error(str(e))
+            del partials
+        report["memory"] = memory_section(profile, args.memory_budget, projected, stream)
+        output_path = args.output
+        if not output_path:
+            output_dir = repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis"
+            output_dir.mkdir(parents=True, exist_ok=True)
+            output_path = output_dir / "java_api_blockers.json"
+        with profile.stage("serialize"):
+            write_report(report, output_path, stream)
+        print(f"Merged {len(args.partials)} partial reports")
+        print(f"\nJSON report written to: {output_path}")
+        snapshot = progress_snapshot(report, repo_root) if snapshot_dir else None
+        if snapshot:
+            print(f"Progress snapshot written to: {write_snapshot(snapshot, snapshot_dir)}")
+        for analyzer in analyzers:
+            analyzer.print_summary(report)
+        profile.stop()
+        profile.print_summary()
+        return
+
+    try:
+        analyzers = load_analyzers([n.strip() for n in args.analyzers.split(",") if n.strip()])
+    except ValueError as e:
+        parser.error(str(e))
+    for analyzer in analyzers:
+        if isinstance(analyzer, ApiBlockerAnalyzer):
+            analyzer.max_findings = args.max_findings_per_category
+            analyzer.rng.seed(args.findings_seed)
+            analyzer.mask = not args.no_mask
 
     if args.output:
         output_path = args.output
     else:
         output_dir = repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis"
         output_dir.mkdir(parents=True, exist_ok=True)
-        output_path = output_dir / "java_api_blockers.json"
+        if args.estimate:
+            output_name = "java_api_blockers_estimate.json"
+        elif shard:
+            output_name = f"java_api_blockers.shard-{shard[0]}-of-{shard[1]}.json"
+        else:
+            output_name = "java_api_blockers.json"
+        output_path = output_dir / output_name
 
-    print(f"Analyzing Java files in: {repo_root}")
+    limits = ScanLimits(
+        max_file_bytes=args.max_file_bytes or None,
+        max_line_length=args.max_line_length or None,
+        file_time_budget=args.file_time_budget or None,
+        on_limit=args.on_limit,
+        scan_generated=args.scan_generated,
+    )
+    skipped: List[SkippedFile] = []
 
-    java_files = find_java_files(repo_root)
-    print(f"Found {len(java_files)} Java files")
+    print(f"Analyzing Java and Kotlin files in: {repo_root}")
 
-    module_reports = analyze_by_module(java_files, repo_root)
-    report = generate_report(module_reports)
+    with profile.stage("walk"):
+        java_files, scan = collect_scan_files(repo_root, args.scope, SOURCE_EXTENSIONS, shard)
+    kotlin_count = sum(1 for f in java_files if language_of(f) == "kotlin")
+    print(f"Found {len(java_files) - kotlin_count} Java and {kotlin_count} Kotlin files (scope: {args.scope}"
+          f"{f', shard {shard[0]}/{shard[1]}' if shard else ''})")
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(report, f, indent=2)
+    projected = projected_peak(profile, scan["scanned_bytes"])
+    budget_mode = args.memory_budget is not None and projected > args.memory_budget * mib
+    if budget_mode:
+        print(f"Projected peak {projected / mib:.0f} MiB exceeds the memory budget of {args.memory_budget:g} MiB: "
+              f"streaming the report and keeping at most "
+              f"{args.max_findings_per_category if args.max_findings_per_category is not None else BUDGET_MAX_FINDINGS}"
+              f" findings per category")
+        for analyzer in analyzers:
+            if isinstance(analyzer, ApiBlockerAnalyzer):
+                if analyzer.max_findings is None:
+                    analyzer.max_findings = BUDGET_MAX_FINDINGS
+                analyzer.stream = True
+
+    if args.estimate:
+        started = time.perf_counter()
+        with profile.stage("scan"):
+            report = estimate_report(
+                java_files, repo_root, args.precision, args.confidence, args.min_count,
+                max_fraction=args.max_sample_fraction, seed=args.estimate_seed, mask=not args.no_mask,
+                limits=limits, skipped=skipped
+            )
+        elapsed = time.perf_counter() - started
+        if args.verify_estimate:
+            report["estimation"]["verification"] = verify_estimate(
+                report, java_files, repo_root, mask=not args.no_mask, limits=limits
+            )
+        report = {"scan": scan, "skipped": skipped_section(limits, skipped), **report}
+        report["memory"] = memory_section(profile, args.memory_budget, projected, False)
+        with profile.stage("serialize"):
+            write_report(report, output_path, False)
+        print(f"\nJSON report written to: {output_path}")
+        print_summary(report)
+        print(f"Estimated in {elapsed:.2f}s")
+        profile.stop()
+        profile.print_summary()
+        if args.verify_estimate and not report["estimation"]["verification"]["passed"]:
+            sys.exit(1)
+        return
+
+    with profile.stage("scan"):
+        results = analyze_by_module(java_files, repo_root, analyzers, limits, skipped)
+    if shard:
+        max_findings = next(
+            (a.max_findings for a in analyzers if isinstance(a, ApiBlockerAnalyzer)), args.max_findings_per_category
+        )
+        with profile.stage("report"):
+            report = partial_report(
+                analyzers, results, shard, scan, max_findings, not args.no_mask, limits, skipped
+            )
+        with profile.stage("serialize"):
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f)
+        print(f"\nPartial report for shard {shard[0]}/{shard[1]} written to: {output_path}")
+        profile.stop()
+        profile.print_summary()
+        return
+
+    with profile.stage("report"):
+        report = {"scan": scan, "skipped": skipped_section(limits, skipped), **build_report(analyzers, results)}
+    report["memory"] = memory_section(profile, args.memory_budget, projected, budget_mode)
+
+    with profile.stage("serialize"):
+        write_report(report, output_path, budget_mode)
 
     print(f"\nJSON report written to: {output_path}")
-    print_summary(report)
+    snapshot = progress_snapshot(report, repo_root) if snapshot_dir else None
+    if snapshot:
+        print(f"Progress snapshot written to: {write_snapshot(snapshot, snapshot_dir)}")
+    for analyzer in analyzers:
+        analyzer.print_summary(report)
+
+    print("Analyzer time:")
+    for analyzer in analyzers:
+        print(f"  {analyzer.name}: {analyzer_seconds[analyzer.name]:.2f}s")
+    profile.stop()
+    profile.print_summary()
 
 
 if __name__ == "__main__":
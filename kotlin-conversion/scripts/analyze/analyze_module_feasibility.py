@@ -5,6 +5,8 @@ Aggregate analysis to produce module-level Kotlin Multiplatform feasibility asse
 This script combines the results from:
 - analyze_java_api_blockers.py (Java API usage analysis)
 - analyze_external_deps.py (External dependency analysis)
+- benchmark_regex_literals.py (Regex replay timings, optional)
+- analyze_build_profile.py (Compile and test time per module, optional)
 
 And produces a per-module feasibility assessment with tier classification.
 
@@ -44,9 +46,11 @@ class ModuleAssessment:
     blocking_deps: List[str]
     replaceable_deps: List[str]
     notes: List[str]
+    regex_performance: Optional[dict] = None
+    build_cost: Optional[dict] = None
 
     def to_dict(self) -> dict:
-        return {
+        result = {
             "module_name": self.module_name,
             "tier": self.tier,
             "tier_description": {
@@ -61,6 +65,11 @@ class ModuleAssessment:
             "replaceable_deps": self.replaceable_deps,
             "notes": self.notes
         }
+        if self.regex_performance is not None:
+            result["regex_performance"] = self.regex_performance
+        if self.build_cost is not None:
+            result["build_cost"] = self.build_cost
+        return result
 
 
 # Module tier classification based on research
@@ -178,7 +187,9 @@ def run_prerequisite_scripts(repo_root: Path, scripts_dir: Path) -> bool:
 def assess_module(
     module_name: str,
     api_data: Optional[dict],
-    deps_data: Optional[dict]
+    deps_data: Optional[dict],
+    regex_bench: Optional[dict] = None,
+    build_cost: Optional[dict] = None
 ) -> ModuleAssessment:
     """
     Produce a feasibility assessment for a single module.
@@ -243,6 +254,17 @@ def assess_module(
     if api_blocker_count > regex_count:
         other_count = api_blocker_count - regex_count
         notes.append(f"Has {other_count} other Java API usages requiring migration")
+    if regex_bench and (regex_bench["outliers"] or regex_bench["timeouts"]):
+        notes.append(
+            f"{regex_bench['outliers']} regex literals are slow on the spec corpus "
+            f"({regex_bench['timeouts']} timeouts) - check them on the Kotlin/JS regex engine"
+        )
+    if build_cost and build_cost["slowed"]:
+        notes.append(
+            f"Compile time up {build_cost['compile_change_pct']:.0f}% "
+            f"({build_cost['baseline_compile']:.1f}s -> {build_cost['compile']:.1f}s) "
+            f"with Kotlin share {build_cost['kotlin_pct_change']:+.1f} points"
+        )
 
     return ModuleAssessment(
         module_name=module_name,
@@ -252,14 +274,18 @@ def assess_module(
         regex_usage_count=regex_count,
         blocking_deps=blocking_deps,
         replaceable_deps=replaceable_deps,
-        notes=notes
+        notes=notes,
+        regex_performance=regex_bench,
+        build_cost=build_cost
     )
 
 
 def generate_report(
     api_report: dict,
     deps_report: dict,
-    all_modules: List[str]
+    all_modules: List[str],
+    regex_benchmark: Optional[dict] = None,
+    build_profile: Optional[dict] = None
 ) -> dict:
     """Generate the final aggregated report."""
 
@@ -268,8 +294,10 @@ def generate_report(
     for module in all_modules:
         api_data = api_report.get("by_module", {}).get(module, {})
         deps_data = deps_report.get("modules", {}).get(module, {})
+        regex_bench = (regex_benchmark or {}).get("by_module", {}).get(module)
+        build_cost = (build_profile or {}).get("by_module", {}).get(module)
 
-        assessment = assess_module(module, api_data, deps_data)
+        assessment = assess_module(module, api_data, deps_data, regex_bench, build_cost)
         assessments[module] = assessment.to_dict()
 
     # Group by tier
@@ -439,9 +467,14 @@ def main():
     # Load prerequisite reports
     api_report_path = repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis" / "java_api_blockers.json"
     deps_report_path = repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis" / "external_deps.json"
+    regex_benchmark_path = repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis" / "regex_benchmark.json"
+    build_profile_path = repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis" / "build_profile.json"
 
     api_report = load_json_report(api_report_path) or {"by_module": {}}
     deps_report = load_json_report(deps_report_path) or {"modules": {}}
+    # Optional: only present when benchmark_regex_literals.py / analyze_build_profile.py have run
+    regex_benchmark = load_json_report(regex_benchmark_path)
+    build_profile = load_json_report(build_profile_path)
 
     if not api_report.get("by_module") and not deps_report.get("modules"):
         print("Error: No analysis reports found. Run prerequisite scripts first.")
@@ -455,7 +488,7 @@ def main():
 
     print(f"Aggregating feasibility analysis for {len(all_modules)} modules...")
 
-    report = generate_report(api_report, deps_report, all_modules)
+    report = generate_report(api_report, deps_report, all_modules, regex_benchmark, build_profile)
 
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(report, f, indent=2)
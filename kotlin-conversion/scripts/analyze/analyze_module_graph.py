@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Build the internal module dependency graph and schedule conversion/build waves.
+
+settings.gradle.kts lists the modules "in dependency order" by hand. This
+script derives the order instead:
+
+- Builds the internal module DAG from the project(":x") dependencies in each
+  module's build.gradle.kts, falling back to the internal_dependencies of
+  external_deps.json for modules without a Gradle build file.
+- Propagates tier 3 (JVM-only) to every module that depends on a tier 3
+  module through a non-test configuration.
+- Detects dependency cycles (Tarjan SCCs); a cycle is scheduled as one unit.
+- Computes topological waves (Kahn levels): all modules of a wave only depend
+  on earlier waves and can be converted or compiled concurrently.
+- Computes the critical path weighted by lines of code and the single module
+  that currently limits throughput.
+
+Conversion waves follow main (api/implementation/compileOnly/runtimeOnly)
+dependencies only. Build waves also follow test dependencies, since a
+module's tests cannot compile before its test dependencies are built.
+
+Usage:
+    python analyze_module_graph.py [--repo-root PATH] [--output PATH] [--scope main]
+
+Prerequisites:
+    module_feasibility.json is used for tiers when present; otherwise the
+    RESEARCH_TIERS of analyze_module_feasibility.py are used.
+
+Output:
+    JSON report with the graph, effective tiers, cycles, waves and critical path.
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from analyze_class_blockers import strongly_connected_components
+from analyze_java_api_blockers import SCOPES, find_java_files, get_module_name
+from analyze_module_feasibility import RESEARCH_TIERS, load_json_report
+
+
+INCLUDE_RE = re.compile(r'include\s*\(\s*((?:"[^"]*"\s*,?\s*)+)\)')
+PROJECT_DEP_RE = re.compile(r'^\s*(\w+)\s*\(\s*project\s*\(\s*"(:[^"]+)"\s*\)\s*\)', re.MULTILINE)
+
+
+def parse_settings(repo_root: Path) -> List[str]:
+    """Modules included by settings.gradle.kts, in the order listed."""
+    settings = repo_root / "settings.gradle.kts"
+    if not settings.exists():
+        return []
+    text = settings.read_text(encoding="utf-8")
+    modules = []
+    for match in INCLUDE_RE.finditer(text):
+        for name in re.findall(r'"([^"]*)"', match.group(1)):
+            modules.append(name.lstrip(":").replace(":", "/"))
+    return modules
+
+
+def is_test_configuration(configuration: str) -> bool:
+    return configuration.startswith("test")
+
+
+def parse_gradle_dependencies(build_file: Path) -> List[Tuple[str, str]]:
+    """(configuration, module) pairs of the project(":x") dependencies of a build file."""
+    text = build_file.read_text(encoding="utf-8")
+    return [
+        (configuration, path.lstrip(":").replace(":", "/"))
+        for configuration, path in PROJECT_DEP_RE.findall(text)
+    ]
+
+
+def build_module_graph(repo_root: Path, deps_report: Optional[dict]) -> dict:
+    """
+    Collect modules and their main/test internal dependencies.
+
+    Returns module -> {"main": set, "test": set, "missing": set,
+    "source": "gradle"|"pom"|"settings"}.
+    """
+    graph: Dict[str, dict] = {}
+    for module in parse_settings(repo_root):
+        graph[module] = {"main": set(), "test": set(), "source": "settings"}
+
+    for build_file in sorted(repo_root.glob("*/build.gradle.kts")):
+        module = build_file.parent.name
+        node = graph.setdefault(module, {"main": set(), "test": set(), "source": "settings"})
+        node["source"] = "gradle"
+        for configuration, dep in parse_gradle_dependencies(build_file):
+            node["test" if is_test_configuration(configuration) else "main"].add(dep)
+
+    # Modules that exist in the tree but have no Gradle build file yet
+    for module, data in (deps_report or {}).get("modules", {}).items():
+        if module in graph and graph[module]["source"] == "gradle":
+            continue
+        if module not in graph and not (repo_root / module).is_dir():
+            continue
+        node = graph.setdefault(module, {"main": set(), "test": set(), "source": "pom"})
+        node["source"] = "pom"
+        internal = data.get("internal_dependencies", {})
+        scopes = internal.get("scopes", {})
+        for dep in internal.get("modules", []):
+            node["test" if scopes.get(dep, "compile") == "test" else "main"].add(dep)
+
+    # Dependencies on modules outside the tree cannot be scheduled
+    for module, node in graph.items():
+        for kind in ("main", "test"):
+            missing = node[kind] - set(graph)
+            node[kind] -= missing
+            node.setdefault("missing", set()).update(missing)
+        node["test"] -= node["main"]
+        node["test"].discard(module)
+        node["main"].discard(module)
+
+    return graph
+
+
+def module_loc(repo_root: Path, scope: str = "main") -> Dict[str, int]:
+    """Non-blank source lines per module, the weight of a module in the schedule."""
+    loc: Dict[str, int] = defaultdict(int)
+    for file_path in find_java_files(repo_root, ('.java', '.kt'), scope):
+        try:
+            text = file_path.read_text(encoding="utf-8", errors="replace")
+        except OSError as e:
+            print(f"Warning: Could not read {file_path}: {e}")
+            continue
+        loc[get_module_name(file_path, repo_root)] += sum(1 for line in text.splitlines() if line.strip())
+    return loc
+
+
+def load_tiers(repo_root: Path, modules: List[str]) -> Dict[str, Optional[int]]:
+    """Tiers from module_feasibility.json when available, else RESEARCH_TIERS."""
+    feasibility_path = repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis" / "module_feasibility.json"
+    assessed = (load_json_report(feasibility_path) or {}).get("modules", {})
+    return {
+        module: assessed[module]["tier"] if module in assessed else RESEARCH_TIERS.get(module)
+        for module in modules
+    }
+
+
+def propagate_jvm_only(graph: Dict[str, dict], tiers: Dict[str, Optional[int]]) -> Dict[str, dict]:
+    """
+    Mark every module that reaches a tier 3 module over main dependencies as tier 3.
+
+    Returns module -> {"tier", "effective_tier", "jvm_only_via"}, where
+    jvm_only_via is the tier 3 dependency through which the status arrived.
+    """
+    dependents: Dict[str, Set[str]] = defaultdict(set)
+    for module, node in graph.items():
+        for dep in node["main"]:
+            dependents[dep].add(module)
+
+    via: Dict[str, Optional[str]] = {}
+    frontier = sorted(m for m in graph if tiers.get(m) == 3)
+    for module in frontier:
+        via[module] = None
+    while frontier:
+        next_frontier = []
+        for module in frontier:
+            for dependent in sorted(dependents[module]):
+                if dependent not in via:
+                    via[dependent] = module
+                    next_frontier.append(dependent)
+        frontier = next_frontier
+
+    return {
+        module: {
+            "tier": tiers.get(module),
+            "effective_tier": 3 if module in via else tiers.get(module),
+            "jvm_only_via": via.get(module),
+        }
+        for module in sorted(graph)
+    }
+
+
+def schedule(graph: Dict[str, dict], loc: Dict[str, int], kinds: Tuple[str, ...]) -> dict:
+    """
+    Topological waves and LOC-weighted critical path over the given dependency kinds.
+
+    Cycles are condensed first, so every unit of the schedule is either a single
+    module or one dependency cycle converted together.
+    """
+    modules = sorted(graph)
+    edges = {m: sorted(set().union(*(graph[m][k] for k in kinds))) for m in modules}
+    components = strongly_connected_components(modules, edges)
+    unit_of = {m: i for i, component in enumerate(components) for m in component}
+    unit_deps = [
+        sorted({unit_of[d] for m in component for d in edges[m]} - {i})
+        for i, component in enumerate(components)
+    ]
+    unit_weight = [sum(loc.get(m, 0) for m in component) for component in components]
+
+    # Kahn's algorithm, level by level
+    remaining = [len(deps) for deps in unit_deps]
+    dependents: Dict[int, List[int]] = defaultdict(list)
+    for unit, deps in enumerate(unit_deps):
+        for dep in deps:
+            dependents[dep].append(unit)
+    level = [u for u, count in enumerate(remaining) if count == 0]
+    waves = []
+    while level:
+        waves.append(level)
+        next_level = []
+        for unit in level:
+            for dependent in dependents[unit]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    next_level.append(dependent)
+        level = next_level
+
+    # Earliest finish (longest weighted path ending at each unit), in wave order
+    finish = [0] * len(components)
+    best_dep: List[Optional[int]] = [None] * len(components)
+    for wave in waves:
+        for unit in wave:
+            start = 0
+            for dep in unit_deps[unit]:
+                if finish[dep] > start:
+                    start, best_dep[unit] = finish[dep], dep
+            finish[unit] = start + unit_weight[unit]
+    makespan = max(finish, default=0)
+
+    # Latest finish that does not delay the makespan, in reverse wave order
+    latest = [makespan] * len(components)
+    for wave in reversed(waves):
+        for unit in wave:
+            for dep in unit_deps[unit]:
+                latest[dep] = min(latest[dep], latest[unit] - unit_weight[unit])
+
+    path = []
+    unit = max(range(len(components)), key=lambda u: finish[u]) if components else None
+    while unit is not None:
+        path.append(unit)
+        unit = best_dep[unit]
+    path.reverse()
+
+    def names(unit: int) -> List[str]:
+        return sorted(components[unit])
+
+    bottleneck = max(path, key=lambda u: unit_weight[u]) if path else None
+    total_weight = sum(unit_weight)
+    return {
+        "waves": [
+            {
+                "wave": i + 1,
+                "modules": sorted(m for unit in wave for m in names(unit)),
+                "parallelism": len(wave),
+                "loc": sum(unit_weight[u] for u in wave),
+                "limited_by": names(max(wave, key=lambda u: unit_weight[u])),
+            }
+            for i, wave in enumerate(waves)
+        ],
+        "critical_path": {
+            "modules": [m for unit in path for m in names(unit)],
+            "loc": makespan,
+            "bottleneck": names(bottleneck) if bottleneck is not None else [],
+            "bottleneck_loc": unit_weight[bottleneck] if bottleneck is not None else 0,
+        },
+        "total_loc": total_weight,
+        "max_speedup": round(total_weight / makespan, 2) if makespan else None,
+        "slack_loc": {
+            m: latest[unit_of[m]] - finish[unit_of[m]]
+            for m in modules
+        },
+    }
+
+
+def generate_report(graph: Dict[str, dict], tiers: Dict[str, dict], loc: Dict[str, int]) -> dict:
+    """Generate the final JSON report structure."""
+    modules = sorted(graph)
+    all_edges = {m: sorted(graph[m]["main"] | graph[m]["test"]) for m in modules}
+    cycles = [
+        sorted(component)
+        for component in strongly_connected_components(modules, all_edges)
+        if len(component) > 1
+    ]
+    conversion = schedule(graph, loc, ("main",))
+    build = schedule(graph, loc, ("main", "test"))
+
+    newly_jvm_only = sorted(
+        m for m, t in tiers.items() if t["effective_tier"] == 3 and t["tier"] != 3
+    )
+    return {
+        "summary": {
+            "total_modules": len(modules),
+            "main_dependencies": sum(len(graph[m]["main"]) for m in modules),
+            "test_dependencies": sum(len(graph[m]["test"]) for m in modules),
+            "cycles": len(cycles),
+            "conversion_waves": len(conversion["waves"]),
+            "build_waves": len(build["waves"]),
+            "newly_jvm_only": newly_jvm_only,
+            "conversion_bottleneck": conversion["critical_path"]["bottleneck"],
+            "build_bottleneck": build["critical_path"]["bottleneck"],
+        },
+        "cycles": cycles,
+        "conversion_schedule": conversion,
+        "build_schedule": build,
+        "modules": {
+            m: {
+                "source": graph[m]["source"],
+                "loc": loc.get(m, 0),
+                "main_dependencies": sorted(graph[m]["main"]),
+                "test_dependencies": sorted(graph[m]["test"]),
+                "missing_dependencies": sorted(graph[m]["missing"]),
+                **tiers[m],
+            }
+            for m in modules
+        },
+    }
+
+
+def print_summary(report: dict) -> None:
+    """Print a human-readable summary to console."""
+    print("\n" + "=" * 70)
+    print("MODULE DEPENDENCY GRAPH - SUMMARY")
+    print("=" * 70)
+
+    summary = report["summary"]
+    print(f"\nModules: {summary['total_modules']} "
+          f"({summary['main_dependencies']} main, {summary['test_dependencies']} test dependencies)")
+
+    if report["cycles"]:
+        print(f"\nDependency cycles ({len(report['cycles'])}):")
+        for cycle in report["cycles"]:
+            print(f"  ! {' <-> '.join(cycle)}")
+    else:
+        print("\nNo dependency cycles")
+
+    if summary["newly_jvm_only"]:
+        print("\nJVM-only through a tier 3 dependency:")
+        for module in summary["newly_jvm_only"]:
+            data = report["modules"][module]
+            print(f"  X {module} (tier {data['tier']}, via {data['jvm_only_via']})")
+
+    for title, key in (("CONVERSION WAVES (main dependencies)", "conversion_schedule"),
+                       ("BUILD WAVES (main + test dependencies)", "build_schedule")):
+        plan = report[key]
+        print("\n" + "-" * 70)
+        print(title)
+        print("-" * 70)
+        for wave in plan["waves"]:
+            print(f"  Wave {wave['wave']:>2}: {wave['parallelism']} parallel, {wave['loc']:>6} LOC, "
+                  f"limited by {', '.join(wave['limited_by'])}")
+            print(f"           {', '.join(wave['modules'])}")
+        path = plan["critical_path"]
+        print(f"\n  Critical path ({path['loc']} of {plan['total_loc']} LOC, "
+              f"max speedup {plan['max_speedup']}x):")
+        print(f"    {' -> '.join(path['modules'])}")
+        print(f"  Bottleneck: {', '.join(path['bottleneck'])} ({path['bottleneck_loc']} LOC)")
+
+    print("\n" + "=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the module dependency graph and compute conversion/build waves"
+    )
+    parser.add_argument(
+        "--repo-root",
+        type=Path,
+        default=Path(__file__).parent.parent.parent,
+        help="Path to repository root (default: two levels up from script)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Output JSON file path (default: .ai_out/.../module_graph.json)"
+    )
+    parser.add_argument(
+        "--scope",
+        choices=list(SCOPES),
+        default="main",
+        help="Source sets counted in module LOC weights: main, test, testFixtures or all (default: main)"
+    )
+    args = parser.parse_args()
+
+    repo_root = args.repo_root.resolve()
+    if not repo_root.exists():
+        print(f"Error: Repository root does not exist: {repo_root}")
+        sys.exit(1)
+
+    output_dir = repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis"
+    if args.output:
+        output_path = args.output
+    else:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / "module_graph.json"
+
+    deps_report = load_json_report(output_dir / "external_deps.json")
+    graph = build_module_graph(repo_root, deps_report)
+    if not graph:
+        print("Error: No modules found (settings.gradle.kts, build.gradle.kts or external_deps.json)")
+        sys.exit(1)
+
+    print(f"Building module graph for {len(graph)} modules in: {repo_root}")
+    loc = module_loc(repo_root, args.scope)
+    tiers = propagate_jvm_only(graph, load_tiers(repo_root, sorted(graph)))
+    report = {"loc_scope": args.scope, **generate_report(graph, tiers, loc)}
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\nJSON report written to: {output_path}")
+    print_summary(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1372 @@
+#!/usr/bin/env python3
+"""
+Extract regex literals passed to Pattern.compile and score them for porting risk.
+
+This script resolves the regex string handed to every Pattern.compile() /
+Pattern.matches() call, including String constants concatenated from other
+constants declared in the same file, parses it into a Java-regex AST and scores it for:
+
+Catastrophic backtracking:
+- Nested quantifiers whose inner repetition can restart the outer one ((a+)+, (\\s*\\w+)*)
+- Overlapping alternations under a quantifier ((a|ab)*, (\\\\.|\\\\)*)
+- Adjacent overlapping quantifiers (\\s*\\s*, .*.*) - polynomial backtracking
+- Unanchored leading quantifiers used with find() ( *$) - quadratic scans
+
+Kotlin/JS regex engine differences:
+- Possessive quantifiers, atomic groups, \\G - not supported by the JS engine
+- Lookbehind - supported by modern JS engines only, often slower
+- Unicode classes \\p{...} - require unicode mode, Java/POSIX names are unsupported
+- Class intersection (&&), \\Q...\\E quoting, \\A \\z \\Z, inline flags - Java-only syntax
+
+Duplicates:
+- Literals compiled at several sites are indexed by normalized pattern text and
+  flags (a leading inline flag group such as (?i) counts as the matching Pattern
+  flag), ranked by occurrences and modules spanned - candidates for a shared
+  precompiled constant. Unresolved constants are keyed by their fully qualified
+  name (over the file's imports and package); sites with runtime fragments are skipped
+
+Usage:
+    python analyze_regex_literals.py [--repo-root PATH] [--output PATH] [--scope main]
+
+Output:
+    JSON report with every regex literal per module, ranked by risk score, and
+    an index of literals compiled at more than one site.
+"""
+
+import argparse
+import json
+import re
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from analyze_class_blockers import IMPORT_RE, PACKAGE_RE
+from analyze_java_api_blockers import SCOPES, Analyzer, SourceFile, analyze_by_module, find_java_files
+
+
+# Stand-in character for string fragments that could not be resolved statically
+OPAQUE_CHAR = "\ue000"
+
+MAX_CODE_POINT = 0x10FFFF
+
+# Repetition bounds at or above this count are treated as unbounded for backtracking
+UNBOUNDED_THRESHOLD = 10
+
+# Risk weights per finding kind
+RISK_WEIGHTS = {
+    "nested_quantifier": 50,
+    "overlapping_alternation": 30,
+    "adjacent_quantifiers": 15,
+    "unanchored_leading_quantifier": 10,
+    "nested_quantifier_separated": 5,
+    "possessive_quantifier": 10,
+    "atomic_group": 10,
+    "g_anchor": 10,
+    "class_intersection": 10,
+    "java_unicode_property": 10,
+    "lookbehind": 5,
+    "unicode_property": 5,
+    "quote_block": 3,
+    "input_anchor": 3,
+    "inline_flags": 3,
+    "java_only_escape": 3,
+}
+
+JS_FEATURE_NOTES = {
+    "possessive_quantifier": "Possessive quantifiers (*+, ++, ?+) are not supported by the JS engine",
+    "atomic_group": "Atomic groups (?>...) are not supported by the JS engine",
+    "g_anchor": "\\G (end of previous match) is not supported by the JS engine",
+    "class_intersection": "Character class intersection (&&) is Java-only syntax",
+    "java_unicode_property": "Java/POSIX property names (\\p{Alpha}, \\p{javaLowerCase}, \\p{InBlock}) are unsupported in JS",
+    "lookbehind": "Lookbehind needs an ES2018+ engine and is slower than lookahead",
+    "unicode_property": "Unicode property classes require unicode mode in JS",
+    "quote_block": "\\Q...\\E quoting is Java-only syntax",
+    "input_anchor": "\\A, \\z and \\Z are Java-only anchors",
+    "inline_flags": "Inline flags (?i), (?s), (?x) are not supported mid-pattern in JS",
+    "java_only_escape": "\\h, \\R, \\X and \\e escapes are Java-only",
+}
+
+BLOCKING_JS_FEATURES = {
+    "possessive_quantifier", "atomic_group", "g_anchor", "class_intersection", "java_unicode_property",
+}
+
+# Unicode general categories and scripts that JS understands in unicode mode
+JS_UNICODE_PROPERTY = re.compile(
+    r'^(?:L[ultmo]?|M[nce]?|N[dlo]?|P[cdseifo]?|S[mcko]?|Z[slp]?|C[cfson]?|'
+    r'(?:sc|Script|gc|General_Category)=\w+|\w+=\w+)$'
+)
+
+# Approximate ASCII ranges for POSIX and common Java property classes
+POSIX_PROPERTY_RANGES = {
+    "Lower": ((0x61, 0x7A),),
+    "Upper": ((0x41, 0x5A),),
+    "ASCII": ((0x00, 0x7F),),
+    "Alpha": ((0x41, 0x5A), (0x61, 0x7A)),
+    "Digit": ((0x30, 0x39),),
+    "Alnum": ((0x30, 0x39), (0x41, 0x5A), (0x61, 0x7A)),
+    "Punct": ((0x21, 0x2F), (0x3A, 0x40), (0x5B, 0x60), (0x7B, 0x7E)),
+    "Blank": ((0x09, 0x09), (0x20, 0x20)),
+    "Space": ((0x09, 0x0D), (0x20, 0x20)),
+    "XDigit": ((0x30, 0x39), (0x41, 0x46), (0x61, 0x66)),
+    "Cntrl": ((0x00, 0x1F), (0x7F, 0x7F)),
+}
+
+ESCAPE_CLASS_RANGES = {
+    "d": ((0x30, 0x39),),
+    "w": ((0x30, 0x39), (0x41, 0x5A), (0x5F, 0x5F), (0x61, 0x7A)),
+    "s": ((0x09, 0x0D), (0x20, 0x20)),
+    "h": ((0x09, 0x09), (0x20, 0x20), (0xA0, 0xA0), (0x1680, 0x1680), (0x2000, 0x200A),
+          (0x202F, 0x202F), (0x205F, 0x205F), (0x3000, 0x3000)),
+    "v": ((0x0A, 0x0D), (0x85, 0x85), (0x2028, 0x2029)),
+}
+
+CONTROL_ESCAPES = {"t": "\t", "n": "\n", "r": "\r", "f": "\f", "a": "\a", "e": "\x1b"}
+
+JAVA_STRING_ESCAPES = {
+    "b": "\b", "t": "\t", "n": "\n", "f": "\f", "r": "\r", "s": " ",
+    '"': '"', "'": "'", "\\": "\\", "\n": "",
+}
+
+# Inline flag letters and the Pattern flag constants they are equivalent to
+INLINE_FLAG_NAMES = {
+    "i": "CASE_INSENSITIVE", "m": "MULTILINE", "s": "DOTALL", "x": "COMMENTS",
+    "u": "UNICODE_CASE", "d": "UNIX_LINES", "U": "UNICODE_CHARACTER_CLASS",
+}
+
+LEADING_INLINE_FLAGS = re.compile(r'^\(\?([idmsuxU]+)\)')
+
+# Names of constants (static final fields), the only unresolved fragments duplicates are keyed on
+CONSTANT_NAME = re.compile(r'^[A-Z][A-Z0-9_]*$')
+
+# Calls whose first argument is a regex
+REGEX_CALLS = {"compile": "Pattern.compile", "matches": "Pattern.matches"}
+
+JAVA_TOKEN = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<textblock>"""[ \t\f]*\r?\n.*?(?<!\\)""")
+  | (?P<string>"(?:[^"\\\n]|\\.)*")
+  | (?P<char>'(?:[^'\\\n]|\\.)+')
+  | (?P<ident>[A-Za-z_$][\w$]*)
+  | (?P<number>\d[\w.]*)
+  | (?P<op>.)
+''', re.S | re.X)
+
+UNICODE_ESCAPE = re.compile(r'(?<!\\)((?:\\\\)*)\\u+([0-9a-fA-F]{4})')
+
+
+# =============================================================================
+# Java source lexing and constant resolution
+# =============================================================================
+
+@dataclass
+class Token:
+    """A single Java source token."""
+    kind: str
+    value: str
+    line: int
+
+
+def decode_unicode_escapes(text: str) -> str:
+    """Apply the Java \\uXXXX pre-translation, keeping escaped line terminators as escapes."""
+    def replace(match):
+        char = chr(int(match.group(2), 16))
+        if char in "\r\n":
+            return match.group(0)
+        return match.group(1) + char
+    return UNICODE_ESCAPE.sub(replace, text)
+
+
+def unescape_java_string(body: str) -> str:
+    """Decode the escape sequences of a Java string or char literal body."""
+    out = []
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char != "\\" or i + 1 >= len(body):
+            out.append(char)
+            i += 1
+            continue
+        nxt = body[i + 1]
+        if nxt in JAVA_STRING_ESCAPES:
+            out.append(JAVA_STRING_ESCAPES[nxt])
+            i += 2
+        elif nxt in "01234567":
+            octal = re.match(r'[0-3]?[0-7]{1,2}|[0-7]', body[i + 1:i + 4])
+            out.append(chr(int(octal.group(0), 8)))
+            i += 1 + len(octal.group(0))
+        elif nxt == "u":
+            escape = re.match(r'u+([0-9a-fA-F]{4})', body[i + 1:])
+            if escape:
+                out.append(chr(int(escape.group(1), 16)))
+                i += 1 + len(escape.group(0))
+            else:
+                out.append(nxt)
+                i += 2
+        else:
+            out.append(nxt)
+            i += 2
+    return "".join(out)
+
+
+def tokenize_java(text: str) -> List[Token]:
+    """Tokenize Java source, dropping whitespace and comments and decoding literals."""
+    tokens = []
+    line = 1
+    for match in JAVA_TOKEN.finditer(decode_unicode_escapes(text)):
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "string":
+            tokens.append(Token("string", unescape_java_string(value[1:-1]), line))
+        elif kind == "textblock":
+            body = value[3:-3].split("\n", 1)[1]
+            tokens.append(Token("string", unescape_java_string(_strip_text_block(body)), line))
+        elif kind == "char":
+            tokens.append(Token("char", unescape_java_string(value[1:-1]), line))
+        elif kind not in ("ws", "comment"):
+            tokens.append(Token(kind, value, line))
+        line += value.count("\n")
+    return tokens
+
+
+def _strip_text_block(body: str) -> str:
+    """Remove the common indentation of a Java text block."""
+    lines = body.split("\n")
+    indents = [len(l) - len(l.lstrip()) for l in lines if l.strip()]
+    if lines and not lines[-1].strip():
+        indents.append(len(lines[-1]))
+    common = min(indents) if indents else 0
+    return "\n".join(l[common:].rstrip() for l in lines)
+
+
+# A string expression is a list of parts: ("lit", text) or ("ref", name) / ("opaque", description)
+Parts = List[Tuple[str, str]]
+
+
+def _skip_balanced(tokens: List[Token], i: int) -> int:
+    """Skip from an opening parenthesis to just past its matching close."""
+    depth = 0
+    while i < len(tokens):
+        value = tokens[i].value if tokens[i].kind == "op" else ""
+        if value in ("(", "[", "{"):
+            depth += 1
+        elif value in (")", "]", "}"):
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+
+def _skip_to_end_of_expression(tokens: List[Token], i: int) -> int:
+    """Skip to the next ',' ')' or ';' at nesting depth zero."""
+    while i < len(tokens):
+        token = tokens[i]
+        if token.kind == "op":
+            if token.value in ("(", "[", "{"):
+                i = _skip_balanced(tokens, i)
+                continue
+            if token.value in (",", ")", ";", "}", "]"):
+                return i
+        i += 1
+    return i
+
+
+def parse_string_expression(tokens: List[Token], i: int) -> Tuple[Parts, int]:
+    """
+    Parse a '+' concatenation of string operands starting at token i.
+
+    Returns (parts, index of the terminating ',' ')' or ';').
+    Anything that is not a literal, a constant reference or a parenthesized
+    concatenation becomes an opaque part.
+    """
+    parts: Parts = []
+    while i < len(tokens):
+        token = tokens[i]
+        if token.kind in ("string", "char", "number"):
+            parts.append(("lit", token.value))
+            i += 1
+        elif token.kind == "ident":
+            name = token.value
+            i += 1
+            while i + 1 < len(tokens) and tokens[i].value == "." and tokens[i + 1].kind == "ident":
+                name += "." + tokens[i + 1].value
+                i += 2
+            if i < len(tokens) and tokens[i].value == "(":
+                i = _skip_balanced(tokens, i)
+                while i + 1 < len(tokens) and tokens[i].value == "." and tokens[i + 1].kind == "ident":
+                    i += 2
+                    if i < len(tokens) and tokens[i].value == "(":
+                        i = _skip_balanced(tokens, i)
+                parts.append(("opaque", name + "(...)"))
+            else:
+                parts.append(("ref", name))
+        elif token.value == "(":
+            inner, end = parse_string_expression(tokens, i + 1)
+            if end < len(tokens) and tokens[end].value == ")":
+                parts.extend(inner)
+                i = end + 1
+            else:
+                parts.append(("opaque", "(...)"))
+                i = _skip_balanced(tokens, i)
+        else:
+            break
+
+        if i < len(tokens) and tokens[i].value == "+":
+            i += 1
+            continue
+        break
+
+    if i < len(tokens) and tokens[i].value not in (",", ")", ";"):
+        # Ternaries, casts and other operators are not evaluated statically
+        parts = [("opaque", "expression")]
+        i = _skip_to_end_of_expression(tokens, i)
+    return parts, i
+
+
+def collect_string_constants(tokens: List[Token]) -> Dict[str, Optional[Parts]]:
+    """
+    Collect String/char declarations with initializers in a file.
+
+    Names declared more than once with different initializers map to None.
+    """
+    constants: Dict[str, Optional[Parts]] = {}
+    for i in range(len(tokens) - 3):
+        if tokens[i].value not in ("String", "char") or tokens[i].kind != "ident":
+            continue
+        j = i + 1
+        while j + 2 < len(tokens) and tokens[j].kind == "ident" and tokens[j + 1].value == "=":
+            name = tokens[j].value
+            parts, end = parse_string_expression(tokens, j + 2)
+            if name in constants and constants[name] != parts:
+                constants[name] = None
+            else:
+                constants[name] = parts
+            if end < len(tokens) and tokens[end].value == ",":
+                j = end + 1
+            else:
+                break
+    return constants
+
+
+def resolve_parts(
+    parts: Parts,
+    constants: Dict[str, Optional[Parts]],
+    class_name: str,
+    stack: Tuple[str, ...] = ()
+) -> Parts:
+    """Expand constant references recursively, leaving unknown references in place."""
+    resolved: Parts = []
+    for kind, value in parts:
+        if kind != "ref":
+            resolved.append((kind, value))
+            continue
+        name = value
+        if name.startswith(class_name + "."):
+            name = name[len(class_name) + 1:]
+        definition = constants.get(name)
+        if definition is None or name in stack:
+            resolved.append((kind, value))
+        else:
+            resolved.extend(resolve_parts(definition, constants, class_name, stack + (name,)))
+    return resolved
+
+
+# =============================================================================
+# Java regex AST
+# =============================================================================
+
+Ranges = Tuple[Tuple[int, int], ...]
+UNIVERSE: Ranges = ((0, MAX_CODE_POINT),)
+EMPTY: Ranges = ()
+
+
+def ranges_union(*sets: Ranges) -> Ranges:
+    """Union of code point range sets."""
+    merged: List[List[int]] = []
+    for lo, hi in sorted(r for s in sets for r in s):
+        if merged and lo <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], hi)
+        else:
+            merged.append([lo, hi])
+    return tuple((lo, hi) for lo, hi in merged)
+
+
+def ranges_negate(ranges: Ranges) -> Ranges:
+    """Complement of a code point range set."""
+    result = []
+    start = 0
+    for lo, hi in ranges_union(ranges):
+        if lo > start:
+            result.append((start, lo - 1))
+        start = hi + 1
+    if start <= MAX_CODE_POINT:
+        result.append((start, MAX_CODE_POINT))
+    return tuple(result)
+
+
+def ranges_intersect(a: Ranges, b: Ranges) -> Ranges:
+    """Intersection of two code point range sets."""
+    return ranges_negate(ranges_union(ranges_negate(a), ranges_negate(b)))
+
+
+def ranges_overlap(a: Ranges, b: Ranges) -> bool:
+    """Whether two code point range sets share any code point."""
+    return any(lo1 <= hi2 and lo2 <= hi1 for lo1, hi1 in a for lo2, hi2 in b)
+
+
+@dataclass
+class RegexNode:
+    """
+    A node of a parsed Java regex.
+
+    kind is one of: char, anchor, concat, alt, group, repeat, backref, flags, opaque.
+    Single-character matchers (char) carry the set of code points they accept.
+    """
+    kind: str
+    children: List["RegexNode"] = field(default_factory=list)
+    ranges: Ranges = EMPTY
+    group: str = ""  # capture, noncapture, lookahead, lookbehind, atomic (for kind == group)
+    min: int = 0
+    max: Optional[int] = None
+    mode: str = "greedy"  # greedy, lazy, possessive (for kind == repeat)
+    text: str = ""
+
+    @property
+    def unbounded(self) -> bool:
+        return self.kind == "repeat" and (self.max is None or self.max >= UNBOUNDED_THRESHOLD)
+
+
+class RegexSyntaxError(ValueError):
+    """Raised when a regex literal cannot be parsed."""
+
+
+class JavaRegexParser:
+    """Recursive-descent parser for java.util.regex syntax."""
+
+    def __init__(self, pattern: str, flags: Optional[List[str]] = None):
+        self.pattern = pattern
+        self.pos = 0
+        self.comments = "COMMENTS" in (flags or [])
+        self.features: Dict[str, int] = defaultdict(int)
+
+    def parse(self) -> RegexNode:
+        node = self._parse_alternation()
+        if self.pos < len(self.pattern):
+            raise RegexSyntaxError(f"Unmatched ')' at offset {self.pos}")
+        return node
+
+    def _peek(self, offset: int = 0) -> str:
+        index = self.pos + offset
+        return self.pattern[index] if index < len(self.pattern) else ""
+
+    def _next(self) -> str:
+        if self.pos >= len(self.pattern):
+            raise RegexSyntaxError("Unexpected end of pattern")
+        char = self.pattern[self.pos]
+        self.pos += 1
+        return char
+
+    def _skip_comment_mode_whitespace(self) -> None:
+        while self.comments and self.pos < len(self.pattern):
+            if self._peek().isspace():
+                self.pos += 1
+            elif self._peek() == "#":
+                end = self.pattern.find("\n", self.pos)
+                self.pos = len(self.pattern) if end < 0 else end + 1
+            else:
+                break
+
+    def _parse_alternation(self) -> RegexNode:
+        branches = [self._parse_concat()]
+        while self._peek() == "|":
+            self.pos += 1
+            branches.append(self._parse_concat())
+        return branches[0] if len(branches) == 1 else RegexNode("alt", branches)
+
+    def _parse_concat(self) -> RegexNode:
+        items = []
+        while True:
+            self._skip_comment_mode_whitespace()
+            if self._peek() in ("", "|", ")"):
+                break
+            items.extend(self._parse_quantified())
+        return items[0] if len(items) == 1 else RegexNode("concat", items)
+
+    def _parse_quantified(self) -> List[RegexNode]:
+        atoms = self._parse_atom()
+        if not atoms:
+            return atoms
+        self._skip_comment_mode_whitespace()
+        bounds = self._parse_quantifier()
+        while bounds is not None:
+            low, high = bounds
+            mode = "greedy"
+            if self._peek() == "?":
+                mode = "lazy"
+                self.pos += 1
+            elif self._peek() == "+":
+                mode = "possessive"
+                self.pos += 1
+                self.features["possessive_quantifier"] += 1
+            # A quantifier applies to the last atom only (relevant after \Q...\E)
+            atoms[-1] = RegexNode("repeat", [atoms[-1]], min=low, max=high, mode=mode)
+            bounds = self._parse_quantifier()
+        return atoms
+
+    def _parse_quantifier(self) -> Optional[Tuple[int, Optional[int]]]:
+        char = self._peek()
+        if char == "*":
+            self.pos += 1
+            return 0, None
+        if char == "+":
+            self.pos += 1
+            return 1, None
+        if char == "?":
+            self.pos += 1
+            return 0, 1
+        if char == "{":
+            match = re.match(r'\{(\d+)(,(\d*))?\}', self.pattern[self.pos:])
+            if match:
+                self.pos += len(match.group(0))
+                low = int(match.group(1))
+                if match.group(2) is None:
+                    return low, low
+                return low, int(match.group(3)) if match.group(3) else None
+        return None
+
+    def _parse_atom(self) -> List[RegexNode]:
+        char = self._next()
+        if char == "(":
+            return [self._parse_group()]
+        if char == "[":
+            return [RegexNode("char", ranges=self._parse_class())]
+        if char == ".":
+            return [RegexNode("char", ranges=ranges_negate(((0x0A, 0x0A),)))]
+        if char in "^$":
+            return [RegexNode("anchor", text=char)]
+        if char == "\\":
+            return self._parse_escape()
+        if char == OPAQUE_CHAR:
+            return [RegexNode("opaque")]
+        return [RegexNode("char", ranges=((ord(char), ord(char)),))]
+
+    def _parse_group(self) -> RegexNode:
+        kind = "capture"
+        if self._peek() == "?":
+            self.pos += 1
+            marker = self._peek()
+            if marker == ":":
+                kind = "noncapture"
+                self.pos += 1
+            elif marker in "=!":
+                kind = "lookahead"
+                self.pos += 1
+            elif marker == ">":
+                kind = "atomic"
+                self.pos += 1
+                self.features["atomic_group"] += 1
+            elif marker == "<" and self._peek(1) in "=!":
+                kind = "lookbehind"
+                self.pos += 2
+                self.features["lookbehind"] += 1
+            elif marker == "<":
+                end = self.pattern.find(">", self.pos)
+                if end < 0:
+                    raise RegexSyntaxError("Unterminated group name")
+                self.pos = end + 1
+            else:
+                match = re.match(r'[idmsuxU]*(?:-[idmsuxU]*)?', self.pattern[self.pos:])
+                flags = match.group(0)
+                self.pos += len(flags)
+                self.features["inline_flags"] += 1
+                if "x" in flags.split("-")[0]:
+                    self.comments = True
+                if self._peek() == ")":
+                    self.pos += 1
+                    return RegexNode("flags", text=flags)
+                if self._next() != ":":
+                    raise RegexSyntaxError(f"Unknown group construct at offset {self.pos}")
+                kind = "noncapture"
+        child = self._parse_alternation()
+        if self._peek() != ")":
+            raise RegexSyntaxError("Unterminated group")
+        self.pos += 1
+        return RegexNode("group", [child], group=kind)
+
+    def _parse_escape(self) -> List[RegexNode]:
+        char = self._next()
+        if char in "dDwWsShHvV":
+            ranges = ESCAPE_CLASS_RANGES[char.lower()]
+            if char in "hH":
+                self.features["java_only_escape"] += 1
+            return [RegexNode("char", ranges=ranges_negate(ranges) if char.isupper() else ranges)]
+        if char in "pP":
+            ranges = self._parse_property()
+            return [RegexNode("char", ranges=ranges_negate(ranges) if char == "P" else ranges)]
+        if char in "bB^$":
+            return [RegexNode("anchor", text="\\" + char)]
+        if char in "AzZ":
+            self.features["input_anchor"] += 1
+            return [RegexNode("anchor", text="\\" + char)]
+        if char == "G":
+            self.features["g_anchor"] += 1
+            return [RegexNode("anchor", text="\\G")]
+        if char == "Q":
+            self.features["quote_block"] += 1
+            end = self.pattern.find("\\E", self.pos)
+            end = len(self.pattern) if end < 0 else end
+            quoted = self.pattern[self.pos:end]
+            self.pos = min(end + 2, len(self.pattern))
+            return [RegexNode("char", ranges=((ord(c), ord(c)),)) for c in quoted]
+        if char in "RX":
+            self.features["java_only_escape"] += 1
+            return [RegexNode("repeat", [RegexNode("char", ranges=UNIVERSE)], min=1, max=2)]
+        if char.isdigit() and char != "0":
+            while self._peek().isdigit():
+                self.pos += 1
+            return [RegexNode("backref")]
+        if char == "k" and self._peek() == "<":
+            self.pos = self.pattern.find(">", self.pos) + 1 or len(self.pattern)
+            return [RegexNode("backref")]
+        code = self._parse_char_escape(char)
+        return [RegexNode("char", ranges=((code, code),))]
+
+    def _parse_char_escape(self, char: str) -> int:
+        """Decode a single-character escape (after the backslash) to a code point."""
+        if char in CONTROL_ESCAPES:
+            if char == "e":
+                self.features["java_only_escape"] += 1
+            return ord(CONTROL_ESCAPES[char])
+        if char == "0":
+            match = re.match(r'[0-3]?[0-7]{1,2}', self.pattern[self.pos:])
+            if not match:
+                raise RegexSyntaxError("Illegal octal escape")
+            self.pos += len(match.group(0))
+            return int(match.group(0), 8)
+        if char == "x":
+            match = re.match(r'\{([0-9a-fA-F]+)\}|[0-9a-fA-F]{2}', self.pattern[self.pos:])
+            if not match:
+                raise RegexSyntaxError("Illegal hexadecimal escape")
+            self.pos += len(match.group(0))
+            return min(int(match.group(1) or match.group(0), 16), MAX_CODE_POINT)
+        if char == "u":
+            match = re.match(r'[0-9a-fA-F]{4}', self.pattern[self.pos:])
+            if not match:
+                raise RegexSyntaxError("Illegal unicode escape")
+            self.pos += 4
+            return int(match.group(0), 16)
+        if char == "c":
+            return ord(self._next()) ^ 64
+        if char == OPAQUE_CHAR:
+            return 0
+        return ord(char)
+
+    def _parse_property(self) -> Ranges:
+        """Parse the name of a \\p / \\P class and approximate its code points."""
+        if self._peek() == "{":
+            end = self.pattern.find("}", self.pos)
+            if end < 0:
+                raise RegexSyntaxError("Unclosed character family")
+            name = self.pattern[self.pos + 1:end]
+            self.pos = end + 1
+        else:
+            name = self._next()
+
+        if JS_UNICODE_PROPERTY.match(name):
+            self.features["unicode_property"] += 1
+        else:
+            self.features["java_unicode_property"] += 1
+        base = name[2:] if name.startswith("Is") else name
+        return POSIX_PROPERTY_RANGES.get(base, UNIVERSE)
+
+    def _parse_class(self) -> Ranges:
+        """Parse a character class after '[' and return the code points it accepts."""
+        negated = self._peek() == "^"
+        if negated:
+            self.pos += 1
+        result = self._parse_class_union(first=True)
+        while self._peek() == "&" and self._peek(1) == "&":
+            self.pos += 2
+            self.features["class_intersection"] += 1
+            result = ranges_intersect(result, self._parse_class_union(first=False))
+        if self._next() != "]":
+            raise RegexSyntaxError("Unclosed character class")
+        return ranges_negate(result) if negated else result
+
+    def _parse_class_union(self, first: bool) -> Ranges:
+        """Parse class members up to the closing ']' or an '&&' operator."""
+        result: Ranges = EMPTY
+        while True:
+            char = self._peek()
+            if char == "":
+                raise RegexSyntaxError("Unclosed character class")
+            if (char == "]" and not first) or (char == "&" and self._peek(1) == "&"):
+                return result
+            first = False
+            if char == "[":
+                self.pos += 1
+                result = ranges_union(result, self._parse_class())
+                continue
+            low = self._parse_class_char()
+            if isinstance(low, tuple):
+                result = ranges_union(result, low)
+                continue
+            if self._peek() == "-" and self._peek(1) not in ("]", "", "["):
+                self.pos += 1
+                high = self._parse_class_char()
+                if isinstance(high, tuple):
+                    result = ranges_union(result, ((low, low), (ord("-"), ord("-"))), high)
+                    continue
+                result = ranges_union(result, ((min(low, high), max(low, high)),))
+            else:
+                result = ranges_union(result, ((low, low),))
+
+    def _parse_class_char(self):
+        """Parse one class member: a code point, or a range set for escapes like \\d."""
+        char = self._next()
+        if char == OPAQUE_CHAR:
+            return UNIVERSE
+        if char != "\\":
+            return ord(char)
+        char = self._next()
+        if char in "dDwWsShHvV":
+            ranges = ESCAPE_CLASS_RANGES[char.lower()]
+            return ranges_negate(ranges) if char.isupper() else ranges
+        if char in "pP":
+            ranges = self._parse_property()
+            return ranges_negate(ranges) if char == "P" else ranges
+        if char == "Q":
+            self.features["quote_block"] += 1
+            end = self.pattern.find("\\E", self.pos)
+            end = len(self.pattern) if end < 0 else end
+            quoted = self.pattern[self.pos:end]
+            self.pos = min(end + 2, len(self.pattern))
+            return ranges_union(*(((ord(c), ord(c)),) for c in quoted)) if quoted else EMPTY
+        return self._parse_char_escape(char)
+
+
+# =============================================================================
+# Risk analysis
+# =============================================================================
+
+def is_nullable(node: RegexNode) -> bool:
+    """Whether the node can match the empty string."""
+    if node.kind == "char":
+        return False
+    if node.kind in ("concat",):
+        return all(is_nullable(c) for c in node.children)
+    if node.kind == "alt":
+        return any(is_nullable(c) for c in node.children)
+    if node.kind == "repeat":
+        return node.min == 0 or is_nullable(node.children[0])
+    if node.kind == "group":
+        return node.group in ("lookahead", "lookbehind") or is_nullable(node.children[0])
+    return True
+
+
+def first_chars(node: RegexNode) -> Ranges:
+    """Code points the node can start a match with."""
+    if node.kind == "char":
+        return node.ranges
+    if node.kind == "opaque":
+        return UNIVERSE
+    if node.kind == "concat":
+        result: Ranges = EMPTY
+        for child in node.children:
+            result = ranges_union(result, first_chars(child))
+            if not is_nullable(child):
+                break
+        return result
+    if node.kind == "alt":
+        return ranges_union(*(first_chars(c) for c in node.children))
+    if node.kind == "repeat":
+        return first_chars(node.children[0]) if node.max != 0 else EMPTY
+    if node.kind == "group" and node.group not in ("lookahead", "lookbehind"):
+        return first_chars(node.children[0])
+    return EMPTY
+
+
+def tail_repeats(node: RegexNode) -> List[RegexNode]:
+    """Unbounded repeats that can consume the last characters of a match of node."""
+    if node.kind == "concat":
+        result = []
+        for child in reversed(node.children):
+            result.extend(tail_repeats(child))
+            if not is_nullable(child):
+                break
+        return result
+    if node.kind == "alt":
+        return [r for c in node.children for r in tail_repeats(c)]
+    if node.kind == "group" and node.group in ("capture", "noncapture"):
+        return tail_repeats(node.children[0])
+    if node.kind == "repeat" and node.mode != "possessive":
+        inner = tail_repeats(node.children[0])
+        return ([node] + inner) if node.unbounded else inner
+    return []
+
+
+def node_to_text(node: RegexNode) -> str:
+    """Compact description of a node for findings."""
+    if node.kind == "repeat":
+        child = node.children[0]
+        inner = node_to_text(child)
+        if child.kind in ("concat", "alt"):
+            inner = f"(?:{inner})"
+        suffix = {(0, None): "*", (1, None): "+", (0, 1): "?"}.get((node.min, node.max))
+        if suffix is None:
+            suffix = f"{{{node.min},{'' if node.max is None else node.max}}}"
+        return inner + suffix + {"lazy": "?", "possessive": "+"}.get(node.mode, "")
+    if node.kind == "char":
+        if len(node.ranges) == 1 and node.ranges[0][0] == node.ranges[0][1]:
+            return re.escape(chr(node.ranges[0][0]))
+        return "[...]"
+    if node.kind == "concat":
+        return "".join(node_to_text(c) for c in node.children)
+    if node.kind == "alt":
+        return "|".join(node_to_text(c) for c in node.children)
+    if node.kind == "group":
+        return "(" + node_to_text(node.children[0]) + ")"
+    if node.kind == "opaque":
+        return "<?>"
+    return node.text
+
+
+def find_backtracking_risks(root: RegexNode) -> List[dict]:
+    """Walk the AST and report constructs prone to catastrophic backtracking."""
+    risks: List[dict] = []
+
+    def visit(node: RegexNode, protected: bool) -> None:
+        if node.kind == "group" and node.group in ("atomic", "lookahead", "lookbehind"):
+            protected = protected or node.group == "atomic"
+        if node.kind == "repeat" and node.mode == "possessive":
+            protected = True
+
+        if not protected and node.kind == "repeat" and node.unbounded:
+            body = node.children[0]
+            body_first = first_chars(body)
+            inner = [r for r in tail_repeats(body)]
+            ambiguous = [r for r in inner if ranges_overlap(first_chars(r.children[0]), body_first)]
+            if ambiguous:
+                risks.append({
+                    "kind": "nested_quantifier",
+                    "detail": f"{node_to_text(ambiguous[0])} can restart the enclosing repetition {node_to_text(node)}",
+                })
+            elif any(d.unbounded for d in _descendant_repeats(body)):
+                risks.append({
+                    "kind": "nested_quantifier_separated",
+                    "detail": f"nested repetition inside {node_to_text(node)} separated by a mandatory token",
+                })
+            for alt in _descendant_alternations(body):
+                firsts = [first_chars(b) for b in alt.children]
+                if any(ranges_overlap(firsts[a], firsts[b])
+                       for a in range(len(firsts)) for b in range(a + 1, len(firsts))):
+                    risks.append({
+                        "kind": "overlapping_alternation",
+                        "detail": f"alternatives of {node_to_text(alt)} can start with the same character under {node_to_text(node)}",
+                    })
+                    break
+
+        if not protected and node.kind == "concat":
+            _find_adjacent_repeats(node, risks)
+
+        for child in node.children:
+            visit(child, protected)
+
+    visit(root, False)
+    _find_unanchored_leading_repeat(root, risks)
+    return risks
+
+
+def _descendant_repeats(node: RegexNode) -> List[RegexNode]:
+    if node.kind == "group" and node.group in ("atomic", "lookahead", "lookbehind"):
+        return []
+    result = []
+    for child in node.children:
+        if child.kind == "group" and child.group in ("atomic", "lookahead", "lookbehind"):
+            continue
+        if child.kind == "repeat" and child.mode != "possessive":
+            result.append(child)
+        result.extend(_descendant_repeats(child))
+    return result
+
+
+def _descendant_alternations(node: RegexNode) -> List[RegexNode]:
+    if node.kind == "group" and node.group in ("atomic", "lookahead", "lookbehind"):
+        return []
+    result = [node] if node.kind == "alt" else []
+    for child in node.children:
+        if child.kind == "group" and child.group in ("atomic", "lookahead", "lookbehind"):
+            continue
+        if child.kind == "repeat" and child.unbounded:
+            continue  # reported when visiting the inner repetition itself
+        result.extend(_descendant_alternations(child))
+    return result
+
+
+def _find_adjacent_repeats(node: RegexNode, risks: List[dict]) -> None:
+    """Report unbounded repeats separated only by nullable items that accept the same characters."""
+    children = node.children
+    for i, left in enumerate(children):
+        if not (left.kind == "repeat" and left.unbounded and left.mode != "possessive"):
+            continue
+        for right in children[i + 1:]:
+            if right.kind == "repeat" and right.unbounded and right.mode != "possessive":
+                if ranges_overlap(first_chars(left.children[0]), first_chars(right.children[0])):
+                    risks.append({
+                        "kind": "adjacent_quantifiers",
+                        "detail": f"{node_to_text(left)} and {node_to_text(right)} compete for the same characters",
+                    })
+                break
+            if not is_nullable(right):
+                break
+
+
+def _find_unanchored_leading_repeat(root: RegexNode, risks: List[dict]) -> None:
+    """Report patterns whose find() retries an unbounded leading repeat at every offset."""
+    branches = root.children if root.kind == "alt" else [root]
+    for branch in branches:
+        items = branch.children if branch.kind == "concat" else [branch]
+        while items and items[0].kind == "group" and items[0].group in ("capture", "noncapture"):
+            inner = items[0].children[0]
+            items = (inner.children if inner.kind == "concat" else [inner]) + items[1:]
+        if not items or items[0].kind == "anchor" or items[0].kind == "flags":
+            continue
+        lead = items[0]
+        if lead.kind == "repeat" and lead.unbounded and lead.mode != "possessive" and len(items) > 1:
+            risks.append({
+                "kind": "unanchored_leading_quantifier",
+                "detail": f"unanchored {node_to_text(lead)} is rescanned from every start offset by find()",
+            })
+
+
+# =============================================================================
+# Extraction
+# =============================================================================
+
+@dataclass
+class RegexLiteral:
+    """A regex literal found at a Pattern.compile call site."""
+    file: str
+    module: str
+    line_number: int
+    call: str
+    owner: Optional[str]
+    parts: Parts
+    flags: List[str]
+    parse_error: Optional[str] = None
+    backtracking: List[dict] = field(default_factory=list)
+    js_features: Dict[str, int] = field(default_factory=dict)
+    # Unresolved reference -> fully qualified constant it names, or None for runtime values
+    qualified_refs: Dict[str, Optional[str]] = field(default_factory=dict)
+
+    @property
+    def pattern(self) -> str:
+        """Resolved pattern text with unresolved fragments shown as <name>."""
+        return "".join(v if k == "lit" else f"<{v}>" for k, v in self.parts)
+
+    @property
+    def regex(self) -> str:
+        """Resolved pattern text with unresolved fragments as the opaque placeholder."""
+        return "".join(v if k == "lit" else OPAQUE_CHAR for k, v in self.parts)
+
+    @property
+    def resolution(self) -> str:
+        kinds = {k for k, _ in self.parts}
+        if kinds == {"lit"}:
+            return "full"
+        return "partial" if "lit" in kinds else "unresolved"
+
+    @property
+    def risk_score(self) -> int:
+        score = sum(RISK_WEIGHTS[r["kind"]] for r in self.backtracking)
+        score += sum(RISK_WEIGHTS[f] for f in self.js_features)
+        return score
+
+    @property
+    def risk_level(self) -> str:
+        kinds = {r["kind"] for r in self.backtracking}
+        if kinds & {"nested_quantifier", "overlapping_alternation"} or BLOCKING_JS_FEATURES & set(self.js_features):
+            return "HIGH"
+        if kinds or self.js_features:
+            return "MEDIUM"
+        return "LOW"
+
+    def to_dict(self) -> dict:
+        return {
+            "file": self.file,
+            "line_number": self.line_number,
+            "owner": self.owner,
+            "call": self.call,
+            "pattern": self.pattern,
+            "flags": self.flags,
+            "resolution": self.resolution,
+            "unresolved_refs": [v for k, v in self.parts if k != "lit"],
+            "risk_score": self.risk_score,
+            "risk_level": self.risk_level,
+            "backtracking": self.backtracking,
+            "js_features": [
+                {"feature": name, "count": count, "note": JS_FEATURE_NOTES[name]}
+                for name, count in sorted(self.js_features.items())
+            ],
+            "parse_error": self.parse_error,
+        }
+
+
+def _assignment_owner(tokens: List[Token], i: int) -> Optional[str]:
+    """Name of the field or variable the expression at token i is assigned to, if any."""
+    j = i - 1
+    while j > 0 and tokens[j].value not in (";", "{", "}"):
+        if tokens[j].value == "=" and tokens[j - 1].kind == "ident" and tokens[j + 1].value != "=":
+            return tokens[j - 1].value
+        j -= 1
+    return None
+
+
+def qualify_ref(name: str, package: str, class_name: str,
+                imports: Dict[str, str], static_imports: Dict[str, str]) -> Optional[str]:
+    """
+    Fully qualified name of the constant an unresolved reference names.
+
+    Class-qualified references (Escaping.ESCAPABLE) are resolved over the
+    imports, else to a class of the same package. A bare constant is a static
+    import or a field of this class (or a supertype, which it is conservatively
+    keyed as). References through variables (parsing.OPENTAG) or to non-constant
+    names are runtime values: None.
+    """
+    segments = name.split(".")
+    if not CONSTANT_NAME.match(segments[-1]):
+        return None
+    if len(segments) == 1:
+        if name in static_imports:
+            return static_imports[name]
+        return f"{package}.{class_name}.{name}" if package else f"{class_name}.{name}"
+    first = segments[0]
+    if first[:1].isupper():
+        if first in imports:
+            return ".".join([imports[first]] + segments[1:])
+        return f"{package}.{name}" if package else name
+    if any(s[:1].isupper() for s in segments[1:-1]):
+        # Already fully qualified: com.x.Escaping.ESCAPABLE
+        return name
+    return None
+
+
+def extract_regex_literals(text: str, rel_path: str, module: str) -> List[RegexLiteral]:
+    """Find Pattern.compile/Pattern.matches sites in a Java file and resolve their regex argument."""
+    if "Pattern" not in text:
+        return []
+    tokens = tokenize_java(text)
+    constants = collect_string_constants(tokens)
+    class_name = Path(rel_path).stem
+    package_match = PACKAGE_RE.search(text)
+    package = package_match.group(1) if package_match else ""
+    imports: Dict[str, str] = {}
+    static_imports: Dict[str, str] = {}
+    for match in IMPORT_RE.finditer(text):
+        if not match.group(3):
+            target = static_imports if match.group(1) else imports
+            target[match.group(2).rsplit(".", 1)[-1]] = match.group(2)
+    literals = []
+
+    for i in range(2, len(tokens) - 1):
+        token = tokens[i]
+        if (token.kind != "ident" or token.value not in REGEX_CALLS
+                or tokens[i - 1].value != "." or tokens[i - 2].value != "Pattern"
+                or tokens[i + 1].value != "("):
+            continue
+        parts, end = parse_string_expression(tokens, i + 2)
+        if not parts:
+            continue
+        flags: List[str] = []
+        if token.value == "compile" and end < len(tokens) and tokens[end].value == ",":
+            flags_end = _skip_to_end_of_expression(tokens, end + 1)
+            flags = sorted({
+                tokens[k + 2].value
+                for k in range(end + 1, flags_end - 2)
+                if tokens[k].value == "Pattern" and tokens[k + 1].value == "."
+            })
+
+        literal = RegexLiteral(
+            file=rel_path,
+            module=module,
+            line_number=token.line,
+            call=REGEX_CALLS[token.value],
+            owner=_assignment_owner(tokens, i - 2),
+            parts=resolve_parts(parts, constants, class_name),
+            flags=flags,
+        )
+        literal.qualified_refs = {
+            value: qualify_ref(value, package, class_name, imports, static_imports) if kind == "ref" else None
+            for kind, value in literal.parts
+            if kind != "lit"
+        }
+        score_literal(literal)
+        literals.append(literal)
+
+    return literals
+
+
+def score_literal(literal: RegexLiteral) -> None:
+    """Parse a literal and fill in its backtracking risks and JS-engine features."""
+    if literal.resolution == "unresolved":
+        return
+    parser = JavaRegexParser(literal.regex, literal.flags)
+    try:
+        root = parser.parse()
+    except (RegexSyntaxError, ValueError) as e:
+        literal.parse_error = str(e)
+        return
+    literal.backtracking = find_backtracking_risks(root)
+    literal.js_features = dict(parser.features)
+
+
+def normalized_key(literal: RegexLiteral) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """
+    Key under which literals compiling the same regex are grouped.
+
+    The pattern is the resolved text, so constants concatenated differently still
+    match, and unresolved fragments become the <fully qualified name> of the
+    constant (see qualify_ref()) so sites compiling the same external constant
+    group together, but same-named constants of different classes do not. A
+    leading inline flag group is folded into the flags: "(?i)abc" and
+    compile("abc", CASE_INSENSITIVE) are the same regex.
+    Returns None when a fragment is a runtime value (local variable, method call),
+    since equal names then do not mean equal regexes.
+    """
+    qualified = [literal.qualified_refs.get(v) for k, v in literal.parts if k != "lit"]
+    if not all(qualified):
+        return None
+    names = iter(qualified)
+    pattern = "".join(v if k == "lit" else f"<{next(names)}>" for k, v in literal.parts)
+    flags = set(literal.flags)
+    match = LEADING_INLINE_FLAGS.match(pattern)
+    if match:
+        flags.update(INLINE_FLAG_NAMES[c] for c in match.group(1))
+        pattern = pattern[match.end():]
+    return pattern, tuple(sorted(flags))
+
+
+def find_duplicate_literals(literals: List[RegexLiteral]) -> List[dict]:
+    """Group literals by normalized key and return those compiled at more than one site."""
+    groups: Dict[Tuple[str, Tuple[str, ...]], List[RegexLiteral]] = defaultdict(list)
+    for literal in literals:
+        key = normalized_key(literal)
+        if key is not None:
+            groups[key].append(literal)
+
+    duplicates = []
+    for (pattern, flags), sites in groups.items():
+        if len(sites) < 2:
+            continue
+        sites.sort(key=lambda l: (l.module, l.file, l.line_number))
+        modules = sorted({l.module for l in sites})
+        duplicates.append({
+            "pattern": pattern,
+            "flags": list(flags),
+            "occurrences": len(sites),
+            "module_count": len(modules),
+            "file_count": len({l.file for l in sites}),
+            "modules": modules,
+            "owners": sorted({l.owner for l in sites if l.owner}),
+            "resolution": sites[0].resolution,
+            "risk_level": sites[0].risk_level,
+            "sites": [
+                {"module": l.module, "file": l.file, "line_number": l.line_number,
+                 "owner": l.owner, "call": l.call, "flags": l.flags}
+                for l in sites
+            ],
+        })
+    duplicates.sort(key=lambda d: (-d["occurrences"], -d["module_count"], d["pattern"], d["flags"]))
+    return duplicates
+
+
+class RegexLiteralAnalyzer(Analyzer):
+    """Analyzer plugin contributing the "regex_literals" report section."""
+    name = "regex_literals"
+
+    def analyze(self, source: SourceFile) -> List[RegexLiteral]:
+        if source.language != "java":
+            return []
+        return extract_regex_literals(source.text, source.rel_path, source.module)
+
+    def merge(self, results: List[List[RegexLiteral]]) -> List[RegexLiteral]:
+        merged = results[0]
+        for literals in results[1:]:
+            merged.extend(literals)
+        return merged
+
+    def report(self, module_results: Dict[str, List[RegexLiteral]]) -> dict:
+        return {self.name: generate_report(module_results)}
+
+    def dump_results(self, module_results: Dict[str, List[RegexLiteral]]) -> dict:
+        return {module: [asdict(lit) for lit in literals] for module, literals in module_results.items()}
+
+    def load_results(self, data: dict) -> Dict[str, List[RegexLiteral]]:
+        return {
+            module: [RegexLiteral(**{**lit, "parts": [tuple(p) for p in lit["parts"]]}) for lit in literals]
+            for module, literals in data.items()
+        }
+
+    def print_summary(self, report: dict) -> None:
+        print_summary(report[self.name])
+
+
+def generate_report(by_module: Dict[str, List[RegexLiteral]]) -> dict:
+    """Generate the final JSON report structure."""
+    all_literals = [lit for literals in by_module.values() for lit in literals]
+    ranked = sorted(all_literals, key=lambda l: (-l.risk_score, l.file, l.line_number))
+
+    risk_levels = {"HIGH": 0, "MEDIUM": 0, "LOW": 0}
+    resolution = {"full": 0, "partial": 0, "unresolved": 0}
+    backtracking_counts: Dict[str, int] = defaultdict(int)
+    feature_counts: Dict[str, int] = defaultdict(int)
+    for literal in all_literals:
+        resolution[literal.resolution] += 1
+        if literal.resolution != "unresolved":
+            risk_levels[literal.risk_level] += 1
+        for risk in literal.backtracking:
+            backtracking_counts[risk["kind"]] += 1
+        for feature in literal.js_features:
+            feature_counts[feature] += 1
+
+    modules = {}
+    for module, literals in by_module.items():
+        if not literals:
+            continue
+        module_ranked = sorted(literals, key=lambda l: (-l.risk_score, l.file, l.line_number))
+        modules[module] = {
+            "literal_count": len(literals),
+            "total_risk_score": sum(l.risk_score for l in literals),
+            "max_risk_score": module_ranked[0].risk_score,
+            "high_risk_count": sum(1 for l in literals if l.risk_level == "HIGH" and l.resolution != "unresolved"),
+            "literals": [l.to_dict() for l in module_ranked],
+        }
+
+    duplicates = find_duplicate_literals(all_literals)
+
+    return {
+        "summary": {
+            "total_literals": len(all_literals),
+            "resolution": resolution,
+            "risk_levels": risk_levels,
+            "parse_errors": sum(1 for l in all_literals if l.parse_error),
+            "backtracking_risks": dict(sorted(backtracking_counts.items())),
+            "js_features": dict(sorted(feature_counts.items())),
+            "duplicated_literals": len(duplicates),
+            "redundant_compiles": sum(d["occurrences"] - 1 for d in duplicates),
+            "cross_module_duplicates": sum(1 for d in duplicates if d["module_count"] > 1),
+        },
+        "duplicates": duplicates,
+        "top_risks": [l.to_dict() for l in ranked[:25] if l.risk_score > 0],
+        "by_module": dict(sorted(
+            modules.items(),
+            key=lambda item: (-item[1]["total_risk_score"], item[0])
+        )),
+    }
+
+
+def print_summary(report: dict) -> None:
+    """Print a human-readable summary to console."""
+    print("\n" + "=" * 70)
+    print("REGEX LITERALS ANALYSIS - SUMMARY")
+    print("=" * 70)
+
+    summary = report["summary"]
+    print(f"\nRegex literals: {summary['total_literals']}")
+    resolution = summary["resolution"]
+    print(f"  Fully resolved: {resolution['full']}, partially: {resolution['partial']}, "
+          f"unresolved: {resolution['unresolved']}, parse errors: {summary['parse_errors']}")
+
+    print("\nRisk levels:")
+    for level, count in summary["risk_levels"].items():
+        print(f"  {level}: {count}")
+
+    if summary["backtracking_risks"]:
+        print("\nBacktracking risks:")
+        for kind, count in summary["backtracking_risks"].items():
+            print(f"  - {kind}: {count}")
+
+    if summary["js_features"]:
+        print("\nKotlin/JS engine features:")
+        for feature, count in summary["js_features"].items():
+            print(f"  - {feature}: {count}")
+
+    if report["duplicates"]:
+        print("\n" + "-" * 70)
+        print(f"DUPLICATED LITERALS: {summary['duplicated_literals']} "
+              f"({summary['redundant_compiles']} redundant compiles, "
+              f"{summary['cross_module_duplicates']} across modules)")
+        print("-" * 70)
+        for dup in report["duplicates"][:15]:
+            flags = f" [{', '.join(dup['flags'])}]" if dup["flags"] else ""
+            pattern = dup["pattern"] if len(dup["pattern"]) <= 50 else dup["pattern"][:47] + "..."
+            print(f"  {dup['occurrences']:3d}x in {dup['module_count']} module(s): {pattern!r}{flags}")
+
+    print("\n" + "-" * 70)
+    print("BY MODULE (ranked by total risk score):")
+    print("-" * 70)
+
+    for module, data in report["by_module"].items():
+        print(f"\n  {module}: {data['literal_count']} literals, risk {data['total_risk_score']} "
+              f"(max {data['max_risk_score']}, high: {data['high_risk_count']})")
+        for literal in data["literals"][:3]:
+            if literal["risk_score"] > 0:
+                print(f"    - [{literal['risk_level']}] {literal['risk_score']:3d} "
+                      f"{literal['file']}:{literal['line_number']} {literal['owner'] or ''}")
+
+    print("\n" + "=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract regex literals and score them for backtracking and Kotlin/JS engine risk"
+    )
+    parser.add_argument(
+        "--repo-root",
+        type=Path,
+        default=Path(__file__).parent.parent.parent,
+        help="Path to repository root (default: two levels up from script)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Output JSON file path (default: .ai_out/.../regex_literals.json)"
+    )
+    parser.add_argument(
+        "--scope",
+        choices=list(SCOPES),
+        default="main",
+        help="Source sets to scan: main, test, testFixtures or all (default: main)"
+    )
+    args = parser.parse_args()
+
+    repo_root = args.repo_root.resolve()
+
+    if args.output:
+        output_path = args.output
+    else:
+        output_dir = repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / "regex_literals.json"
+
+    print(f"Analyzing regex literals in: {repo_root}")
+
+    java_files = find_java_files(repo_root, scope=args.scope)
+    print(f"Found {len(java_files)} Java files (scope: {args.scope})")
+
+    analyzer = RegexLiteralAnalyzer()
+    results = analyze_by_module(java_files, repo_root, [analyzer])
+    report = generate_report(results[analyzer.name])
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\nJSON report written to: {output_path}")
+    print_summary(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,891 @@
+#!/usr/bin/env python3
+"""
+Replay the regex literals of the code base against the CommonMark spec corpus.
+
+Static risk scores (analyze_regex_literals.py) cannot show which regexes are
+actually expensive on real markdown. This script:
+
+- Extracts every fully resolved regex literal at a Pattern.compile /
+  Pattern.matches call site and translates it from java.util.regex to Python
+  re syntax: character classes (including nested classes, && intersections
+  and \\p{...} properties) are expanded to code point ranges, Java-only
+  escapes (\\h, \\v, \\R, \\z, \\Z, \\Q...\\E, \\x{...}) are rewritten, and "."
+  excludes every Java line terminator. Patterns that cannot be translated
+  (\\G, \\X, flags in mid-pattern, ...) are listed with the reason.
+- Infers how each pattern is used from the Java source: matcher(..).find(),
+  matches() or lookingAt() on the pattern's field or Matcher variable (split,
+  replaceAll and friends count as find). find is assumed when nothing is found.
+- Runs each pattern with each of its semantics (find: search, matches:
+  fullmatch, lookingAt: match) over the flexmark-test-specs resources
+  (spec.0.26.txt ... spec.txt) and every *_spec.md file - each line without
+  its terminator, and each section of a spec example and each prose paragraph
+  with its line terminators, so multi-line patterns see real text - timing
+  every call, within a time budget per pattern and semantics. The longest
+  inputs always run first; the rest in a fixed random order, so a budget cut
+  keeps a uniform sample.
+- Records throughput, mean and worst-case input latency per pattern and
+  flags outliers: timeouts, worst-case inputs far more expensive per
+  character than the pattern's average (superlinear backtracking), and
+  patterns far slower per character than the median. Patterns that never
+  matched a corpus input are marked and not ranked with the others.
+
+Patterns run in a worker subprocess; a pattern that does not finish within
+--pattern-timeout (catastrophic backtracking) is recorded as a timeout and
+the worker is restarted for the remaining patterns.
+
+Python's re is a backtracking engine like java.util.regex, so relative costs
+carry over; absolute numbers do not.
+
+Usage:
+    python benchmark_regex_literals.py [--repo-root PATH] [--output PATH] [--scope main]
+                                       [--time-budget SECONDS] [--pattern-timeout SECONDS]
+
+Output:
+    JSON report with per-pattern timings, outliers and a per-module summary,
+    which analyze_module_feasibility.py adds to the module assessments.
+"""
+
+import argparse
+import heapq
+import json
+import queue
+import random
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from analyze_java_api_blockers import SCOPES, analyze_by_module, find_java_files
+from analyze_regex_literals import (
+    ESCAPE_CLASS_RANGES,
+    MAX_CODE_POINT,
+    POSIX_PROPERTY_RANGES,
+    JavaRegexParser,
+    Ranges,
+    RegexLiteral,
+    RegexLiteralAnalyzer,
+    RegexSyntaxError,
+    ranges_negate,
+    ranges_union,
+)
+
+
+# Java line terminators, which "." does not match without DOTALL
+LINE_TERMINATORS: Ranges = ((0x0A, 0x0A), (0x0D, 0x0D), (0x85, 0x85), (0x2028, 0x2029))
+JAVA_LINEBREAK = "(?:\\r\\n|[\\n\\x0b\\f\\r\\x85\\u2028\\u2029])"
+
+JAVA_FLAGS = {
+    "CASE_INSENSITIVE": re.IGNORECASE,
+    "MULTILINE": re.MULTILINE,
+    "DOTALL": re.DOTALL,
+    "COMMENTS": re.VERBOSE,
+}
+INLINE_FLAGS = {"i": "i", "m": "m", "s": "s", "x": "x"}
+
+# Spec corpus: flexmark-test-specs resources plus every *_spec.md file
+SPEC_RESOURCES = "flexmark-test-specs/src/main/resources"
+SPEC_FILE_RE = re.compile(r'^spec(\.\d+\.\d+)?\.txt$')
+SPEC_TAB = "→"  # spec examples write tabs as an arrow
+EXAMPLE_FENCE = "`" * 32  # opens (followed by " example") and closes a spec example
+EXAMPLE_SECTION = "."  # separates the sections of a spec example
+
+SEMANTICS = ("find", "matches", "lookingAt")
+USAGE_RE = r'\.\s*(find|matches|lookingAt|replaceAll|replaceFirst|results|hitEnd)\s*\('
+PATTERN_USE_RE = r'\.\s*(split|splitAsStream|asPredicate|asMatchPredicate)\s*\('
+USAGE_SEMANTICS = {
+    "find": "find", "matches": "matches", "lookingAt": "lookingAt",
+    "replaceAll": "find", "replaceFirst": "find", "results": "find", "hitEnd": "find",
+    "split": "find", "splitAsStream": "find", "asPredicate": "find", "asMatchPredicate": "matches",
+}
+
+# Inputs that always run first, longest first
+LONGEST_FIRST = 100
+
+# Slowest inputs timed again for the worst case, and how often
+WORST_CANDIDATES = 5
+WORST_REPEATS = 5
+
+# A pattern is an outlier when its worst input costs this many times its average
+# per character (and at least MIN_OUTLIER_US), or its average this many times
+# the median of all patterns
+OUTLIER_FACTOR = 10
+MIN_OUTLIER_US = 100
+
+
+class Untranslatable(ValueError):
+    """Raised when a Java regex has no equivalent Python re pattern."""
+
+
+@dataclass
+class Translation:
+    """A Java regex translated to Python re."""
+    pattern: str
+    flags: int
+    approximations: List[str] = field(default_factory=list)
+
+
+# =============================================================================
+# Translation
+# =============================================================================
+
+@lru_cache(maxsize=None)
+def unicode_category_ranges(prefix: str) -> Ranges:
+    """Code point ranges of the Unicode general categories starting with prefix (e.g. "L", "Pd")."""
+    ranges = []
+    start = None
+    for code in range(MAX_CODE_POINT + 2):
+        inside = code <= MAX_CODE_POINT and unicodedata.category(chr(code)).startswith(prefix)
+        if inside and start is None:
+            start = code
+        elif not inside and start is not None:
+            ranges.append((start, code - 1))
+            start = None
+    return tuple(ranges)
+
+
+def property_ranges(name: str, approximations: List[str]) -> Ranges:
+    """Code points of a \\p{name} class."""
+    base = name[2:] if name.startswith("Is") else name
+    base = base.split("=", 1)[1] if base.startswith(("gc=", "General_Category=")) else base
+    if base in POSIX_PROPERTY_RANGES:
+        return POSIX_PROPERTY_RANGES[base]
+    if re.fullmatch(r'[LMNPSZC][a-z]?', base):
+        return unicode_category_ranges(base)
+    if base == "Alphabetic":
+        approximations.append("\\p{IsAlphabetic} as categories L and Nl")
+        return ranges_union(unicode_category_ranges("L"), unicode_category_ranges("Nl"))
+    raise Untranslatable(f"unsupported property \\p{{{name}}}")
+
+
+def render_code_point(code: int) -> str:
+    if code < 0x100:
+        return f"\\x{code:02x}"
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    return f"\\U{code:08x}"
+
+
+def render_class(ranges: Ranges) -> str:
+    """A Python character class accepting exactly the given code points."""
+    if not ranges:
+        return "(?!)"
+    items = []
+    for low, high in ranges:
+        items.append(render_code_point(low) if low == high else f"{render_code_point(low)}-{render_code_point(high)}")
+    return "[" + "".join(items) + "]"
+
+
+class _PropertyParser(JavaRegexParser):
+    """JavaRegexParser whose \\p{...} classes are exact Unicode ranges instead of approximations."""
+
+    def __init__(self, pattern: str, flags: List[str], approximations: List[str]):
+        super().__init__(pattern, flags)
+        self.approximations = approximations
+
+    def _parse_property(self) -> Ranges:
+        start = self.pos
+        super()._parse_property()
+        name = self.pattern[start + 1:self.pos - 1] if self.pattern[start] == "{" else self.pattern[start]
+        return property_ranges(name, self.approximations)
+
+
+def translate_java_regex(pattern: str, flags: List[str]) -> Translation:
+    """
+    Translate a java.util.regex pattern and its Pattern flags to Python re.
+
+    \\d, \\w, \\s and \\b stay ASCII as in Java (re.ASCII) unless
+    UNICODE_CHARACTER_CLASS is set. Raises Untranslatable.
+    """
+    approximations: List[str] = []
+    py_flags = 0
+    for flag in flags:
+        if flag in JAVA_FLAGS:
+            py_flags |= JAVA_FLAGS[flag]
+        elif flag == "LITERAL":
+            return Translation(re.escape(pattern), py_flags, approximations)
+        elif flag not in ("UNICODE_CASE", "UNICODE_CHARACTER_CLASS"):
+            approximations.append(f"flag {flag} ignored")
+    if "UNICODE_CHARACTER_CLASS" not in flags:
+        py_flags |= re.ASCII
+    if "UNICODE_CASE" in flags and "UNICODE_CHARACTER_CLASS" not in flags:
+        approximations.append("UNICODE_CASE with ASCII character classes")
+
+    dotall = bool(py_flags & re.DOTALL)
+    out: List[str] = []
+    i = 0
+    n = len(pattern)
+
+    def parser_at(pos: int) -> JavaRegexParser:
+        parser = _PropertyParser(pattern, flags, approximations)
+        parser.pos = pos
+        return parser
+
+    while i < n:
+        char = pattern[i]
+        if char == "\\":
+            if i + 1 >= n:
+                raise Untranslatable("trailing backslash")
+            escape = pattern[i + 1]
+            i += 2
+            if escape in "pP":
+                parser = parser_at(i)
+                ranges = parser._parse_property()
+                out.append(render_class(ranges_negate(ranges) if escape == "P" else ranges))
+                i = parser.pos
+            elif escape in "hHvV":
+                ranges = ESCAPE_CLASS_RANGES[escape.lower()]
+                out.append(render_class(ranges_negate(ranges) if escape.isupper() else ranges))
+            elif escape == "R":
+                out.append(JAVA_LINEBREAK)
+            elif escape in "GX":
+                raise Untranslatable(f"\\{escape} has no Python equivalent")
+            elif escape == "z":
+                out.append("\\Z")
+            elif escape == "Z":
+                out.append("(?=" + JAVA_LINEBREAK + "?\\Z)")
+            elif escape == "Q":
+                end = pattern.find("\\E", i)
+                end = n if end < 0 else end
+                out.append(re.escape(pattern[i:end]))
+                i = min(end + 2, n)
+            elif escape in "0xuec":
+                parser = parser_at(i)
+                code = parser._parse_char_escape(escape)
+                out.append(render_code_point(code))
+                i = parser.pos
+            elif escape == "k":
+                match = re.match(r'<(\w+)>', pattern[i:])
+                if not match:
+                    raise Untranslatable("malformed \\k<name>")
+                out.append(f"(?P={match.group(1)})")
+                i += len(match.group(0))
+            else:
+                out.append("\\" + escape)
+        elif char == "[":
+            parser = parser_at(i + 1)
+            out.append(render_class(parser._parse_class()))
+            i = parser.pos
+        elif char == ".":
+            out.append("." if dotall else render_class(ranges_negate(LINE_TERMINATORS)))
+            i += 1
+        elif char == "(" and pattern.startswith("(?<", i) and pattern[i + 3:i + 4] not in ("=", "!"):
+            out.append("(?P<")
+            i += 3
+        elif char == "(" and pattern.startswith("(?", i) and re.match(r'\(\?[idmsuxU]*(?:-[idmsuxU]*)?[:)]', pattern[i:]):
+            match = re.match(r'\(\?([idmsuxU]*)(?:-([idmsuxU]*))?([:)])', pattern[i:])
+            on, off, end = match.group(1), match.group(2) or "", match.group(3)
+            dropped = sorted(set(on + off) - set(INLINE_FLAGS))
+            if dropped:
+                approximations.append(f"inline flags {''.join(dropped)} ignored")
+            on = "".join(INLINE_FLAGS[c] for c in on if c in INLINE_FLAGS)
+            off = "".join(INLINE_FLAGS[c] for c in off if c in INLINE_FLAGS)
+            if end == ")":
+                if i != 0 or off:
+                    raise Untranslatable("inline flags in mid-pattern")
+                dotall = dotall or "s" in on
+                out.append(f"(?{on})" if on else "")
+            else:
+                dotall_scope = "s" in on
+                if dotall_scope and not dotall:
+                    approximations.append("scoped (?s:...) keeps Java line terminators out of '.'")
+                out.append(f"(?{on}{'-' + off if off else ''}:" if on or off else "(?:")
+            i += len(match.group(0))
+        else:
+            out.append(char)
+            i += 1
+
+    translated = "".join(out)
+    try:
+        re.compile(translated, py_flags)
+    except re.error as e:
+        raise Untranslatable(f"re.compile failed: {e}")
+    return Translation(translated, py_flags, approximations)
+
+
+# =============================================================================
+# Usage semantics
+# =============================================================================
+
+def statement_after(lines: List[str], line_number: int, start_column: int = 0) -> str:
+    """Source text from a position to the end of its statement (at most 10 lines)."""
+    text = lines[line_number - 1][start_column:] if line_number <= len(lines) else ""
+    index = line_number
+    while ";" not in text and index < len(lines) and index < line_number + 10:
+        text += " " + lines[index]
+        index += 1
+    return text.split(";", 1)[0]
+
+
+def owner_names(owner: str, text: str) -> List[str]:
+    """A Pattern field name plus the fields of the same file assigned from it (TICKS = ST_TICKS)."""
+    names = [owner]
+    for name in names:
+        for match in re.finditer(rf'(\w+)\s*=\s*{name}\s*;', text):
+            if match.group(1) not in names:
+                names.append(match.group(1))
+    return names
+
+
+def usage_semantics(literal: RegexLiteral, text: str, others: Dict[str, str]) -> Tuple[List[str], str]:
+    """
+    Matcher semantics a literal is used with, and where they were found
+    ("call", "file", "other files" or "default").
+
+    others maps repo-relative paths to the text of files that refer to the
+    literal's owner (or an alias of it) through a qualifier (X.OWNER), for
+    patterns used elsewhere.
+    """
+    if literal.call == "Pattern.matches":
+        return ["matches"], "call"
+
+    found = set()
+    if literal.owner is None:
+        statement = statement_after(text.splitlines(), literal.line_number)
+        for match in re.finditer(USAGE_RE + "|" + PATTERN_USE_RE, statement):
+            found.add(USAGE_SEMANTICS[match.group(1) or match.group(2)])
+        source = "call"
+    else:
+        names = owner_names(literal.owner, text)
+        found = {s for name in names for s in _owner_usages(name, text)}
+        source = "file"
+        if not found:
+            source = "other files"
+            for body in others.values():
+                for name in names:
+                    if re.search(rf'\.\s*{name}\b', body):
+                        found.update(_owner_usages(name, body))
+
+    if not found:
+        return ["find"], "default"
+    return [s for s in SEMANTICS if s in found], source
+
+
+def _owner_usages(owner: str, text: str) -> set:
+    """Semantics of the uses of a Pattern field or variable named owner in text."""
+    found = set()
+    for match in re.finditer(rf'\b{owner}\s*\.\s*matcher\s*\(', text):
+        rest = text[match.end():match.end() + 400].split(";", 1)[0]
+        direct = re.search(r'^[^;]*?\)\s*' + USAGE_RE, rest)
+        if direct:
+            found.add(USAGE_SEMANTICS[direct.group(1)])
+            continue
+        variable = re.search(r'(\w+)\s*=\s*$', text[max(0, match.start() - 200):match.start()])
+        if variable:
+            for use in re.finditer(rf'\b{variable.group(1)}\s*' + USAGE_RE, text[match.end():]):
+                found.add(USAGE_SEMANTICS[use.group(1)])
+    for match in re.finditer(rf'\b{owner}\s*' + PATTERN_USE_RE, text):
+        found.add(USAGE_SEMANTICS[match.group(1)])
+    return found
+
+
+# =============================================================================
+# Corpus and worker
+# =============================================================================
+
+def corpus_files(repo_root: Path) -> List[Path]:
+    """The spec resources of flexmark-test-specs and every *_spec.md file."""
+    resources = repo_root / SPEC_RESOURCES
+    files = sorted(p for p in resources.glob("*.txt") if SPEC_FILE_RE.match(p.name)) if resources.exists() else []
+    files += sorted(
+        p for p in repo_root.rglob("*_spec.md")
+        if ".ai_out" not in p.parts and "build" not in p.relative_to(repo_root).parts
+    )
+    return files
+
+
+def corpus_blocks(lines: List[str]) -> List[Tuple[str, int]]:
+    """
+    Split a spec file into blocks with their first line number: every section
+    of a spec example (markdown source, expected output, ...) and every prose
+    paragraph. Blocks keep their line terminators, so patterns that match
+    across lines or anchor at a line end see real text.
+    """
+    blocks = []
+    block: List[str] = []
+    start = 0
+    in_example = False
+
+    def flush() -> None:
+        if block:
+            blocks.append(("".join(block), start))
+            block.clear()
+
+    for number, line in enumerate(lines, start=1):
+        bare = line.rstrip("\r\n")
+        if bare.startswith(EXAMPLE_FENCE) and (in_example or bare[len(EXAMPLE_FENCE):].startswith(" example")):
+            flush()
+            in_example = not in_example
+        elif in_example and bare == EXAMPLE_SECTION:
+            flush()
+        elif not in_example and not bare.strip():
+            flush()
+        else:
+            if not block:
+                start = number
+            block.append(line.replace(SPEC_TAB, "\t") if in_example else line)
+    flush()
+    return blocks
+
+
+def load_corpus(paths: List[str], seed: int = 0) -> List[Tuple[str, str]]:
+    """
+    Distinct inputs of the corpus with the first place they occur: every
+    non-empty line without its terminator, as line-oriented callers pass it,
+    and every block of corpus_blocks() with its terminators. Ordered longest
+    first for LONGEST_FIRST inputs and shuffled after that.
+    """
+    seen: Dict[str, str] = {}
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+            lines = f.readlines()
+        for number, line in enumerate(lines, start=1):
+            line = line.rstrip("\r\n").replace(SPEC_TAB, "\t")
+            if line and line not in seen:
+                seen[line] = f"{path}:{number}"
+        for block, number in corpus_blocks(lines):
+            if block not in seen:
+                seen[block] = f"{path}:{number}"
+    inputs = sorted(seen.items(), key=lambda item: -len(item[0]))
+    head, tail = inputs[:LONGEST_FIRST], inputs[LONGEST_FIRST:]
+    random.Random(seed).shuffle(tail)
+    return head + tail
+
+
+def run_semantics(compiled, semantics: str, inputs: List[Tuple[str, str]], budget: float) -> dict:
+    """
+    Time one pattern with one semantics over the inputs until done or out of budget.
+
+    A single slow call is often scheduler noise, so the WORST_CANDIDATES
+    slowest inputs are timed again WORST_REPEATS times; the worst case is the
+    largest of their fastest repeats.
+    """
+    call = {"find": compiled.search, "matches": compiled.fullmatch, "lookingAt": compiled.match}[semantics]
+    perf_counter = time.perf_counter
+    total = 0.0
+    chars = 0
+    matched = 0
+    runs = 0
+    slowest: List[Tuple[float, int]] = []
+    deadline = perf_counter() + budget
+    for index, (text, _) in enumerate(inputs):
+        started = perf_counter()
+        result = call(text)
+        elapsed = perf_counter() - started
+        total += elapsed
+        chars += len(text)
+        runs += 1
+        if result is not None:
+            matched += 1
+        if len(slowest) < WORST_CANDIDATES:
+            heapq.heappush(slowest, (elapsed, index))
+        elif elapsed > slowest[0][0]:
+            heapq.heapreplace(slowest, (elapsed, index))
+        if started > deadline:
+            break
+
+    worst = -1.0
+    worst_input = None
+    for _, index in slowest:
+        text = inputs[index][0]
+        repeats = []
+        for _ in range(WORST_REPEATS):
+            started = perf_counter()
+            call(text)
+            repeats.append(perf_counter() - started)
+        if min(repeats) > worst:
+            worst, worst_input = min(repeats), inputs[index]
+
+    return {
+        "inputs": runs,
+        "coverage": round(runs / len(inputs), 4) if inputs else 0.0,
+        "matched": matched,
+        "seconds": round(total, 6),
+        "throughput_mb_s": round(chars / total / 1e6, 3) if total else None,
+        "mean_us": round(total / runs * 1e6, 3) if runs else None,
+        "ns_per_char": round(total / chars * 1e9, 3) if chars else None,
+        "worst_us": round(worst * 1e6, 3) if runs else None,
+        "worst_ns_per_char": round(worst / len(worst_input[0]) * 1e9, 3) if worst_input else None,
+        "worst_input": {
+            "origin": worst_input[1],
+            "length": len(worst_input[0]),
+            "preview": worst_input[0][:80],
+        } if worst_input else None,
+    }
+
+
+def worker() -> None:
+    """Benchmark the jobs read from stdin, writing one JSON line per job."""
+    request = json.loads(sys.stdin.read())
+    inputs = load_corpus(request["corpus"], request["seed"])
+    print(json.dumps({"ready": len(inputs)}), flush=True)
+    for job in request["jobs"]:
+        compiled = re.compile(job["pattern"], job["flags"])
+        results = {s: run_semantics(compiled, s, inputs, request["time_budget"]) for s in job["semantics"]}
+        print(json.dumps({"id": job["id"], "results": results}), flush=True)
+
+
+def run_jobs(jobs: List[dict], corpus: List[Path], time_budget: float, timeout: float, seed: int) -> Dict[int, dict]:
+    """
+    Run jobs in worker subprocesses. A job that does not report back within
+    timeout seconds is recorded as {"timeout": True}; the worker is killed and
+    a new one continues with the jobs after it.
+    """
+    results: Dict[int, dict] = {}
+    pending = list(jobs)
+    while pending:
+        request = {
+            "corpus": [str(p) for p in corpus],
+            "seed": seed,
+            "time_budget": time_budget,
+            "jobs": pending,
+        }
+        process = subprocess.Popen(
+            [sys.executable, __file__, "--worker"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+        )
+        lines: "queue.Queue[Optional[str]]" = queue.Queue()
+
+        def read(stream=process.stdout):
+            for line in stream:
+                lines.put(line)
+            lines.put(None)
+
+        threading.Thread(target=read, daemon=True).start()
+        process.stdin.write(json.dumps(request))
+        process.stdin.close()
+
+        ready = lines.get()
+        if ready is None:
+            process.wait()
+            raise RuntimeError(f"benchmark worker exited with status {process.returncode}")
+        while pending:
+            try:
+                line = lines.get(timeout=timeout)
+            except queue.Empty:
+                results[pending[0]["id"]] = {"timeout": True}
+                print(f"  timeout after {timeout:g}s: {pending[0]['label']}")
+                pending = pending[1:]
+                process.kill()
+                process.wait()
+                break
+            if line is None:
+                process.wait()
+                results[pending[0]["id"]] = {"error": f"worker exited with status {process.returncode}"}
+                pending = pending[1:]
+                break
+            result = json.loads(line)
+            results[result["id"]] = result["results"]
+            pending = [job for job in pending if job["id"] != result["id"]]
+        else:
+            process.wait()
+    return results
+
+
+# =============================================================================
+# Report
+# =============================================================================
+
+def never_matched(pattern: dict) -> bool:
+    """True when the pattern ran and matched none of its inputs with any semantics."""
+    results = [r for r in pattern["semantics"].values() if "matched" in r]
+    return bool(results) and len(results) == len(pattern["semantics"]) and not any(r["matched"] for r in results)
+
+
+def flag_outliers(patterns: List[dict]) -> None:
+    """
+    Mark timeouts and patterns whose cost per input character is out of line.
+
+    Latency grows with input length for any pattern, so costs are compared per
+    character: a worst-case input far more expensive per character than the
+    pattern's average means superlinear backtracking on that input, and an
+    average far above the median of all patterns means a slow pattern.
+    Patterns that never matched only ever timed the failure path, so they are
+    flagged for timeouts only and left out of the median.
+    """
+    timed = [r for p in patterns if not p["never_matched"]
+             for r in p["semantics"].values() if r.get("ns_per_char") is not None]
+    median_cost = statistics.median(r["ns_per_char"] for r in timed) if timed else 0.0
+    for pattern in patterns:
+        reasons = []
+        for semantics, result in pattern["semantics"].items():
+            if result.get("timeout"):
+                reasons.append(f"{semantics}: timeout")
+                continue
+            if result.get("ns_per_char") is None or pattern["never_matched"]:
+                continue
+            if (result["worst_ns_per_char"] >= OUTLIER_FACTOR * result["ns_per_char"]
+                    and result["worst_us"] >= MIN_OUTLIER_US):
+                reasons.append(f"{semantics}: worst input costs {result['worst_ns_per_char']:.0f}ns/char, "
+                               f"{result['worst_ns_per_char'] / result['ns_per_char']:.0f}x its average")
+            if median_cost and result["ns_per_char"] >= OUTLIER_FACTOR * median_cost:
+                reasons.append(f"{semantics}: {result['ns_per_char']:.0f}ns/char on average, "
+                               f"{result['ns_per_char'] / median_cost:.0f}x the median pattern")
+        pattern["outlier"] = bool(reasons)
+        pattern["outlier_reasons"] = reasons
+
+
+def worst_us(pattern: dict) -> float:
+    """Worst-case latency of a pattern over its semantics; timeouts rank first."""
+    results = pattern["semantics"].values()
+    if any(r.get("timeout") for r in results):
+        return float("inf")
+    return max((r["worst_us"] for r in results if r.get("worst_us") is not None), default=0.0)
+
+
+def generate_report(patterns: List[dict], untranslatable: List[dict], corpus: List[Path],
+                    repo_root: Path, settings: dict) -> dict:
+    """
+    Generate the final JSON report structure. Patterns that never matched
+    rank after all others and are not a module's slowest pattern.
+    """
+    for pattern in patterns:
+        pattern["never_matched"] = never_matched(pattern)
+    flag_outliers(patterns)
+    patterns.sort(key=lambda p: (p["never_matched"], -worst_us(p), p["file"], p["line_number"]))
+
+    modules: Dict[str, dict] = {}
+    for pattern in patterns:
+        entry = modules.setdefault(pattern["module"], {
+            "benchmarked": 0, "outliers": 0, "timeouts": 0, "never_matched": 0, "untranslatable": 0,
+            "slowest": None,
+        })
+        entry["benchmarked"] += 1
+        entry["outliers"] += pattern["outlier"]
+        entry["timeouts"] += any(r.get("timeout") for r in pattern["semantics"].values())
+        entry["never_matched"] += pattern["never_matched"]
+        if entry["slowest"] is None and not pattern["never_matched"]:
+            entry["slowest"] = {
+                "pattern": pattern["pattern"],
+                "file": pattern["file"],
+                "line_number": pattern["line_number"],
+                "worst_us": None if worst_us(pattern) == float("inf") else worst_us(pattern),
+            }
+    for item in untranslatable:
+        modules.setdefault(item["module"], {
+            "benchmarked": 0, "outliers": 0, "timeouts": 0, "never_matched": 0, "untranslatable": 0,
+            "slowest": None,
+        })["untranslatable"] += 1
+
+    return {
+        "corpus": {
+            "files": [p.relative_to(repo_root).as_posix() for p in corpus],
+            "bytes": sum(p.stat().st_size for p in corpus),
+        },
+        "settings": settings,
+        "summary": {
+            "benchmarked": len(patterns),
+            "untranslatable": len(untranslatable),
+            "outliers": sum(p["outlier"] for p in patterns),
+            "timeouts": sum(1 for p in patterns if worst_us(p) == float("inf")),
+            "never_matched": sum(p["never_matched"] for p in patterns),
+        },
+        "patterns": patterns,
+        "untranslatable": untranslatable,
+        "by_module": dict(sorted(modules.items(), key=lambda item: (-item[1]["outliers"], item[0]))),
+    }
+
+
+def print_summary(report: dict) -> None:
+    """Print a human-readable summary to console."""
+    print("\n" + "=" * 70)
+    print("REGEX REPLAY BENCHMARK - SUMMARY")
+    print("=" * 70)
+
+    summary = report["summary"]
+    print(f"\nCorpus: {len(report['corpus']['files'])} files, {report['corpus']['bytes'] / 1024:.0f} KiB")
+    print(f"Benchmarked patterns: {summary['benchmarked']} "
+          f"({summary['untranslatable']} untranslatable, not run)")
+    print(f"Outliers: {summary['outliers']} ({summary['timeouts']} timeouts)")
+    print(f"Never matched: {summary['never_matched']} (timings not ranked)")
+
+    print("\n" + "-" * 70)
+    print("SLOWEST PATTERNS (worst-case input latency):")
+    print("-" * 70)
+    for pattern in [p for p in report["patterns"] if not p["never_matched"]][:15]:
+        results = pattern["semantics"]
+        timings = ", ".join(
+            f"{s}: timeout" if r.get("timeout") else
+            f"{s}: {r['worst_us']:.0f}us worst, {r['mean_us']:.1f}us mean, {r['throughput_mb_s']} MB/s"
+            if r.get("worst_us") is not None else f"{s}: {r.get('error', 'no inputs')}"
+            for s, r in results.items()
+        )
+        mark = "!" if pattern["outlier"] else " "
+        print(f"  {mark} {pattern['file'].rsplit('/', 1)[-1]}:{pattern['line_number']} "
+              f"{pattern['owner'] or ''}")
+        print(f"      {json.dumps(pattern['pattern'])[1:-1][:64]}")
+        print(f"      {timings}")
+        for reason in pattern["outlier_reasons"]:
+            print(f"      ! {reason}")
+
+    never = [p for p in report["patterns"] if p["never_matched"]]
+    if never:
+        print("\n" + "-" * 70)
+        print("NEVER MATCHED (no corpus input matched, timings not ranked):")
+        print("-" * 70)
+        for pattern in never:
+            print(f"  {pattern['file'].rsplit('/', 1)[-1]}:{pattern['line_number']} "
+                  f"{json.dumps(pattern['pattern'])[1:-1][:56]}")
+
+    if report["untranslatable"]:
+        print("\n" + "-" * 70)
+        print("UNTRANSLATABLE:")
+        print("-" * 70)
+        for item in report["untranslatable"]:
+            print(f"  {item['file'].rsplit('/', 1)[-1]}:{item['line_number']} - {item['reason']}")
+
+    print("\n" + "=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay regex literals against the CommonMark spec corpus and time them"
+    )
+    parser.add_argument(
+        "--repo-root",
+        type=Path,
+        default=Path(__file__).parent.parent.parent,
+        help="Path to repository root (default: two levels up from script)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Output JSON file path (default: .ai_out/.../regex_benchmark.json)"
+    )
+    parser.add_argument(
+        "--scope",
+        choices=list(SCOPES),
+        default="main",
+        help="Source sets whose regex literals are benchmarked (default: main)"
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=1.0,
+        metavar="SECONDS",
+        help="Time per pattern and semantics; inputs beyond it are not run (default: 1)"
+    )
+    parser.add_argument(
+        "--pattern-timeout",
+        type=float,
+        default=30.0,
+        metavar="SECONDS",
+        help="Wall time after which a pattern counts as a timeout (default: 30)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed for the input order (default: 0)"
+    )
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker()
+        return
+    if args.time_budget <= 0 or args.pattern_timeout <= 0:
+        parser.error("--time-budget and --pattern-timeout must be positive")
+
+    repo_root = args.repo_root.resolve()
+    if args.output:
+        output_path = args.output
+    else:
+        output_dir = repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / "regex_benchmark.json"
+
+    corpus = corpus_files(repo_root)
+    if not corpus:
+        print(f"Error: no spec corpus under {repo_root}")
+        sys.exit(1)
+
+    java_files = find_java_files(repo_root, scope=args.scope)
+    analyzer = RegexLiteralAnalyzer()
+    literals = [lit for lits in analyze_by_module(java_files, repo_root, [analyzer])[analyzer.name].values()
+                for lit in lits]
+    texts = {lit.file: (repo_root / lit.file).read_text(encoding="utf-8", errors="replace") for lit in literals}
+    owners = {name for lit in literals if lit.owner for name in owner_names(lit.owner, texts[lit.file])}
+    qualified = {}
+    for path in java_files:
+        text = path.read_text(encoding="utf-8", errors="replace")
+        if any(f".{owner}" in text for owner in owners):
+            qualified[path.relative_to(repo_root).as_posix()] = text
+    print(f"Found {len(literals)} regex literals in {len(java_files)} Java files (scope: {args.scope})")
+
+    jobs = []
+    patterns = []
+    untranslatable = []
+    for literal in sorted(literals, key=lambda l: (l.file, l.line_number)):
+        base = {
+            "file": literal.file,
+            "module": literal.module,
+            "line_number": literal.line_number,
+            "owner": literal.owner,
+            "pattern": literal.pattern,
+            "flags": literal.flags,
+        }
+        if literal.resolution != "full":
+            untranslatable.append({**base, "reason": f"pattern not fully resolved ({literal.resolution})"})
+            continue
+        if literal.parse_error:
+            untranslatable.append({**base, "reason": f"parse error: {literal.parse_error}"})
+            continue
+        try:
+            translation = translate_java_regex(literal.regex, literal.flags)
+        except (Untranslatable, RegexSyntaxError) as e:
+            untranslatable.append({**base, "reason": str(e)})
+            continue
+        others = {p: t for p, t in qualified.items() if p != literal.file}
+        semantics, source = usage_semantics(literal, texts[literal.file], others)
+        jobs.append({
+            "id": len(patterns),
+            "label": f"{literal.file}:{literal.line_number}",
+            "pattern": translation.pattern,
+            "flags": translation.flags,
+            "semantics": semantics,
+        })
+        patterns.append({
+            **base,
+            "python_pattern": translation.pattern,
+            "approximations": translation.approximations,
+            "semantics_source": source,
+        })
+
+    print(f"Replaying {len(jobs)} patterns against {len(corpus)} corpus files "
+          f"({len(untranslatable)} not translatable)")
+    started = time.perf_counter()
+    results = run_jobs(jobs, corpus, args.time_budget, args.pattern_timeout, args.seed)
+    for job, pattern in zip(jobs, patterns):
+        result = results.get(job["id"], {"error": "not run"})
+        if "timeout" in result or "error" in result:
+            pattern["semantics"] = {s: result for s in job["semantics"]}
+        else:
+            pattern["semantics"] = result
+    print(f"Replayed in {time.perf_counter() - started:.1f}s")
+
+    settings = {
+        "scope": args.scope,
+        "time_budget": args.time_budget,
+        "pattern_timeout": args.pattern_timeout,
+        "seed": args.seed,
+        "python": sys.version.split()[0],
+    }
+    report = generate_report(patterns, untranslatable, corpus, repo_root, settings)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\nJSON report written to: {output_path}")
+    print_summary(report)
+
+
+if __name__ == "__main__":
+    main()
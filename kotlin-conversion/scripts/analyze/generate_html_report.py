@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Write a static HTML report that opens instantly, however large the findings are.
+
+java_api_blockers.json grows to tens of MB on large trees, which is slow to
+open in a browser or editor. This script writes:
+
+- index.html: the module_feasibility.json summary and one table per tier,
+  with the assessment of every module. Nothing else is loaded up front.
+- chunks/<module>.js: the findings of one module, loaded only when its row is
+  expanded. Browsers refuse fetch() on file:// URLs, so a chunk is the JSON
+  data wrapped in a call to a loader function and loaded with a <script> tag;
+  the report works from the local filesystem without a web server.
+
+Findings are rendered as a virtualized list: only the rows in view (plus a
+small margin) exist in the DOM, so a category with 100,000 findings scrolls
+as smoothly as one with ten. A filter box narrows a list by file or code.
+
+Usage:
+    python generate_html_report.py [--repo-root PATH] [--output-dir PATH]
+                                   [--feasibility PATH] [--blockers PATH]
+
+Prerequisites:
+    module_feasibility.json and java_api_blockers.json (run
+    run_all_analysis.sh first). Without java_api_blockers.json the index is
+    written without findings.
+
+Output:
+    <output-dir>/index.html and <output-dir>/chunks/*.js
+    (default: .ai_out/kotlin-mp-feasibility-analysis/html/)
+"""
+
+import argparse
+import html
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from analyze_module_feasibility import load_json_report
+
+
+CHUNK_DIR = "chunks"
+CHUNK_LOADER = "reportChunk"
+
+TIERS = [
+    ("tier_1_fully_convertible", "Tier 1: Fully Convertible"),
+    ("tier_2_convertible_with_effort", "Tier 2: Convertible with Effort"),
+    ("tier_3_jvm_only", "Tier 3: JVM-Only"),
+]
+
+
+def chunk_name(module: str) -> str:
+    """File name of a module's chunk; module names are directory names, kept to a safe alphabet."""
+    return re.sub(r'[^\w.-]', "_", module) + ".js"
+
+
+def script_json(data) -> str:
+    """JSON safe to embed in a <script> element."""
+    text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return text.replace("</", "<\\/").replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+
+
+def module_chunk(module: str, categories: Dict[str, dict], descriptions: Dict[str, dict]) -> dict:
+    """
+    Findings of one module in a compact form: file paths are listed once and
+    every finding is [file index, line number, line content, pattern].
+    """
+    files: List[str] = []
+    file_index: Dict[str, int] = {}
+    chunk_categories = {}
+    for category, data in sorted(categories.items(), key=lambda item: -item[1].get("count", 0)):
+        findings = []
+        for finding in data.get("findings", []):
+            path = finding["file"]
+            if path not in file_index:
+                file_index[path] = len(files)
+                files.append(path)
+            findings.append([file_index[path], finding["line_number"],
+                             finding["line_content"], finding["pattern_matched"]])
+        findings.sort(key=lambda f: (files[f[0]], f[1]))
+        chunk_categories[category] = {
+            "description": descriptions.get(category, {}).get("description", ""),
+            "impact": descriptions.get(category, {}).get("impact", ""),
+            "count": data.get("count", len(findings)),
+            "file_count": data.get("file_count", len(data.get("files", []))),
+            "findings": findings,
+        }
+    return {"module": module, "files": files, "categories": chunk_categories}
+
+
+def write_chunks(blockers: Optional[dict], output_dir: Path) -> Dict[str, Tuple[str, int]]:
+    """Write one chunk per module with findings; returns module -> (relative path, finding count)."""
+    chunk_dir = output_dir / CHUNK_DIR
+    chunk_dir.mkdir(parents=True, exist_ok=True)
+    for stale in chunk_dir.glob("*.js"):
+        stale.unlink()
+    if not blockers:
+        return {}
+
+    written = {}
+    descriptions = blockers.get("summary", {})
+    for module, categories in sorted(blockers.get("by_module", {}).items()):
+        categories = {c: d for c, d in categories.items() if isinstance(d, dict) and d.get("count")}
+        if not categories:
+            continue
+        chunk = module_chunk(module, categories, descriptions)
+        name = chunk_name(module)
+        with open(chunk_dir / name, "w", encoding="utf-8") as f:
+            f.write(f"{CHUNK_LOADER}({script_json(chunk)});\n")
+        written[module] = (f"{CHUNK_DIR}/{name}", sum(c["count"] for c in chunk["categories"].values()))
+    return written
+
+
+def render_module_rows(modules: List[str], assessments: Dict[str, dict],
+                       chunks: Dict[str, Tuple[str, int]]) -> str:
+    rows = []
+    for module in modules:
+        data = assessments.get(module, {})
+        deps = data.get("blocking_deps", []) + data.get("replaceable_deps", [])
+        chunk = chunks.get(module)
+        attributes = f' data-module="{html.escape(module)}"'
+        if chunk:
+            attributes += f' data-chunk="{html.escape(chunk[0])}" class="expandable"'
+        notes = "".join(f"<li>{html.escape(note)}</li>" for note in data.get("notes", []))
+        rows.append(
+            f"<tr{attributes}>"
+            f"<td class=\"name\">{html.escape(module)}</td>"
+            f"<td>{html.escape(data.get('feasibility', ''))}</td>"
+            f"<td class=\"num\">{data.get('api_blocker_count', 0)}</td>"
+            f"<td class=\"num\">{data.get('regex_usage_count', 0)}</td>"
+            f"<td>{html.escape(', '.join(deps))}</td>"
+            f"<td><ul>{notes}</ul></td>"
+            f"</tr>"
+        )
+    return "\n".join(rows)
+
+
+def render_index(feasibility: dict, chunks: Dict[str, Tuple[str, int]], source: str) -> str:
+    """The index page: summary, tier tables and the loader script."""
+    summary = feasibility["summary"]
+    breakdown = summary["tier_breakdown"]
+    assessments = feasibility["modules"]
+
+    metrics = [
+        ("Modules", summary["total_modules"]),
+        ("Tier 1", breakdown["tier_1_fully_convertible"]),
+        ("Tier 2", breakdown["tier_2_convertible_with_effort"]),
+        ("Tier 3", breakdown["tier_3_jvm_only"]),
+        ("Regex usages", summary["total_regex_usages"]),
+        ("API blockers", summary["total_api_blockers"]),
+        ("Blocking deps", len(summary["unique_blocking_deps"])),
+        ("Replaceable deps", len(summary["unique_replaceable_deps"])),
+    ]
+    metric_html = "".join(
+        f'<div class="metric"><span>{value}</span>{html.escape(label)}</div>' for label, value in metrics
+    )
+
+    tables = []
+    for key, title in TIERS:
+        modules = feasibility["tiers"].get(key, [])
+        tables.append(
+            f"<h2>{html.escape(title)} ({len(modules)})</h2>\n"
+            "<table class=\"modules\"><thead><tr><th>Module</th><th>Feasibility</th>"
+            "<th>API blockers</th><th>Regex</th><th>Dependencies</th><th>Notes</th></tr></thead>\n"
+            f"<tbody>\n{render_module_rows(modules, assessments, chunks)}\n</tbody></table>"
+        )
+
+    return PAGE_TEMPLATE.format(
+        source=html.escape(source),
+        metrics=metric_html,
+        recommendation=html.escape(summary.get("conversion_recommendation", "")),
+        tables="\n".join(tables),
+        loader=CHUNK_LOADER,
+    )
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Kotlin Multiplatform Feasibility Report</title>
+<style>
+body {{ font: 14px/1.4 system-ui, sans-serif; margin: 2em; color: #222; }}
+h1 {{ margin-bottom: 0.2em; }}
+.source {{ color: #777; margin-bottom: 1.5em; }}
+.metrics {{ display: flex; flex-wrap: wrap; gap: 0.8em; margin-bottom: 1em; }}
+.metric {{ border: 1px solid #ddd; border-radius: 4px; padding: 0.5em 1em; min-width: 7em; color: #555; }}
+.metric span {{ display: block; font-size: 1.6em; color: #222; }}
+pre.recommendation {{ white-space: pre-wrap; background: #f6f6f6; padding: 1em; border-radius: 4px; }}
+table.modules {{ border-collapse: collapse; width: 100%; margin-bottom: 2em; }}
+table.modules th, table.modules td {{ border-bottom: 1px solid #eee; padding: 0.3em 0.6em; text-align: left; vertical-align: top; }}
+table.modules td.num {{ text-align: right; }}
+table.modules ul {{ margin: 0; padding-left: 1.2em; }}
+tr.expandable td.name {{ cursor: pointer; color: #0645ad; }}
+tr.expandable td.name::before {{ content: "\\25b8  "; }}
+tr.expandable.open td.name::before {{ content: "\\25be  "; }}
+tr.details > td {{ background: #fafafa; padding: 0.8em 1.5em; }}
+.category h4 {{ margin: 0.8em 0 0.2em; }}
+.category .meta {{ color: #777; }}
+.category input {{ margin: 0.3em 0; width: 30em; }}
+.viewport {{ position: relative; overflow-y: auto; border: 1px solid #ddd; background: #fff; }}
+.row {{ position: absolute; left: 0; right: 0; height: 22px; line-height: 22px; white-space: nowrap;
+        overflow: hidden; text-overflow: ellipsis; font: 12px monospace; padding: 0 0.5em; }}
+.row .loc {{ color: #0645ad; }}
+.row .pattern {{ color: #999; }}
+</style>
+</head>
+<body>
+<h1>Kotlin Multiplatform Feasibility Report</h1>
+<div class="source">{source}</div>
+<div class="metrics">{metrics}</div>
+<pre class="recommendation">{recommendation}</pre>
+{tables}
+<script>
+(function () {{
+  var ROW_HEIGHT = 22, VISIBLE_ROWS = 15, OVERSCAN = 10;
+  var chunks = {{}}, waiting = {{}};
+
+  // Chunks call this when their <script> has loaded
+  window.{loader} = function (data) {{
+    chunks[data.module] = data;
+    (waiting[data.module] || []).forEach(function (callback) {{ callback(data); }});
+    delete waiting[data.module];
+  }};
+
+  function loadChunk(module, src, callback) {{
+    if (chunks[module]) {{ callback(chunks[module]); return; }}
+    if (waiting[module]) {{ waiting[module].push(callback); return; }}
+    waiting[module] = [callback];
+    var script = document.createElement("script");
+    script.src = src;
+    script.onerror = function () {{ callback(null); }};
+    document.head.appendChild(script);
+  }}
+
+  function element(tag, className, text) {{
+    var node = document.createElement(tag);
+    if (className) node.className = className;
+    if (text !== undefined) node.textContent = text;
+    return node;
+  }}
+
+  // Renders only the rows of items in view; items are [file, line, content, pattern]
+  function virtualList(files, items) {{
+    var viewport = element("div", "viewport");
+    var spacer = element("div");
+    viewport.appendChild(spacer);
+    viewport.style.height = Math.min(items.length, VISIBLE_ROWS) * ROW_HEIGHT + 2 + "px";
+    var shown = items, first = -1, last = -1;
+
+    function render(force) {{
+      var start = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN);
+      var end = Math.min(shown.length, start + VISIBLE_ROWS + 2 * OVERSCAN);
+      if (!force && start === first && end === last) return;
+      first = start; last = end;
+      while (spacer.firstChild) spacer.removeChild(spacer.firstChild);
+      for (var i = start; i < end; i++) {{
+        var item = shown[i], row = element("div", "row");
+        row.style.top = i * ROW_HEIGHT + "px";
+        row.appendChild(element("span", "loc", files[item[0]] + ":" + item[1] + "  "));
+        row.appendChild(element("span", "", item[2] + "  "));
+        row.appendChild(element("span", "pattern", item[3]));
+        row.title = files[item[0]] + ":" + item[1] + "\\n" + item[2];
+        spacer.appendChild(row);
+      }}
+    }}
+
+    viewport.addEventListener("scroll", function () {{ render(false); }});
+    return {{
+      node: viewport,
+      filter: function (text) {{
+        text = text.toLowerCase();
+        shown = !text ? items : items.filter(function (item) {{
+          return (files[item[0]] + ":" + item[1] + " " + item[2]).toLowerCase().indexOf(text) >= 0;
+        }});
+        spacer.style.height = shown.length * ROW_HEIGHT + "px";
+        viewport.scrollTop = 0;
+        render(true);
+        return shown.length;
+      }}
+    }};
+  }}
+
+  function renderDetails(cell, data) {{
+    cell.textContent = "";
+    if (!data) {{ cell.textContent = "Could not load the findings of this module."; return; }}
+    Object.keys(data.categories).forEach(function (name) {{
+      var category = data.categories[name], section = element("div", "category");
+      section.appendChild(element("h4", "", name + " (" + category.count + " in " + category.file_count + " files)"));
+      var meta = [category.impact, category.description].filter(Boolean).join(" - ");
+      if (category.findings.length < category.count) {{
+        meta += " - showing a sample of " + category.findings.length;
+      }}
+      section.appendChild(element("div", "meta", meta));
+      if (category.findings.length) {{
+        var list = virtualList(data.files, category.findings);
+        var input = element("input");
+        var counter = element("span", "meta");
+        input.placeholder = "Filter by file or code";
+        input.addEventListener("input", function () {{
+          counter.textContent = " " + list.filter(input.value) + " shown";
+        }});
+        section.appendChild(input);
+        section.appendChild(counter);
+        section.appendChild(list.node);
+        list.filter("");
+      }}
+      cell.appendChild(section);
+    }});
+  }}
+
+  document.querySelectorAll("tr.expandable td.name").forEach(function (nameCell) {{
+    nameCell.addEventListener("click", function () {{
+      var row = nameCell.parentNode, next = row.nextElementSibling;
+      if (next && next.classList.contains("details")) {{
+        next.hidden = !next.hidden;
+        row.classList.toggle("open", !next.hidden);
+        return;
+      }}
+      var details = element("tr", "details"), cell = element("td", "", "Loading...");
+      cell.colSpan = row.children.length;
+      details.appendChild(cell);
+      row.parentNode.insertBefore(details, row.nextSibling);
+      row.classList.add("open");
+      loadChunk(row.dataset.module, row.dataset.chunk, function (data) {{ renderDetails(cell, data); }});
+    }});
+  }});
+}})();
+</script>
+</body>
+</html>
+"""
+
+
+def print_summary(output_dir: Path, index_path: Path, chunks: Dict[str, Tuple[str, int]]) -> None:
+    """Print a human-readable summary to console."""
+    print("\n" + "=" * 70)
+    print("HTML REPORT - SUMMARY")
+    print("=" * 70)
+
+    chunk_bytes = sum((output_dir / path).stat().st_size for path, _ in chunks.values())
+    print(f"\nIndex: {index_path} ({index_path.stat().st_size / 1024:.1f} KiB)")
+    print(f"Chunks: {len(chunks)} modules with findings, {chunk_bytes / 1024:.1f} KiB in total")
+    if chunks:
+        largest = sorted(chunks.items(), key=lambda item: -(output_dir / item[1][0]).stat().st_size)[:5]
+        print("\nLargest chunks:")
+        for module, (path, count) in largest:
+            print(f"  {module}: {count} findings, {(output_dir / path).stat().st_size / 1024:.1f} KiB")
+
+    print("\n" + "=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write a static HTML report with per-module findings loaded on demand"
+    )
+    parser.add_argument(
+        "--repo-root",
+        type=Path,
+        default=Path(__file__).parent.parent.parent,
+        help="Path to repository root (default: two levels up from script)"
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="Output directory (default: .ai_out/.../html)"
+    )
+    parser.add_argument(
+        "--feasibility",
+        type=Path,
+        default=None,
+        help="module_feasibility.json to summarize (default: .ai_out/.../module_feasibility.json)"
+    )
+    parser.add_argument(
+        "--blockers",
+        type=Path,
+        default=None,
+        help="java_api_blockers.json with the findings (default: .ai_out/.../java_api_blockers.json)"
+    )
+    args = parser.parse_args()
+
+    repo_root = args.repo_root.resolve()
+    report_dir = repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis"
+    output_dir = args.output_dir or report_dir / "html"
+    feasibility_path = args.feasibility or report_dir / "module_feasibility.json"
+    blockers_path = args.blockers or report_dir / "java_api_blockers.json"
+
+    feasibility = load_json_report(feasibility_path)
+    if not feasibility:
+        print(f"Error: {feasibility_path} not found. Run analyze_module_feasibility.py first.")
+        sys.exit(1)
+    blockers = load_json_report(blockers_path)
+    if blockers is None:
+        print(f"Warning: {blockers_path} not found, writing the index without findings")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    chunks = write_chunks(blockers, output_dir)
+
+    index_path = output_dir / "index.html"
+    with open(index_path, "w", encoding="utf-8") as f:
+        f.write(render_index(feasibility, chunks, str(feasibility_path)))
+
+    print(f"HTML report written to: {index_path}")
+    print_summary(output_dir, index_path, chunks)
+
+
+if __name__ == "__main__":
+    main()
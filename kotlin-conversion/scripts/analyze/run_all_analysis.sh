@@ -4,8 +4,15 @@
 #
 # This script executes the analysis pipeline:
 # 1. analyze_java_api_blockers.py - Detect problematic Java API usage
-# 2. analyze_external_deps.py - Analyze Maven dependencies
-# 3. analyze_module_feasibility.py - Aggregate and produce final assessment
+# 2. analyze_regex_literals.py - Score regex literals for backtracking and Kotlin/JS risk
+# 3. benchmark_regex_literals.py - Replay regex literals against the CommonMark spec corpus
+# 4. analyze_class_blockers.py - Propagate blockers between classes over imports
+# 5. analyze_duplicate_code.py - Find near-duplicate classes and methods across modules
+# 6. analyze_external_deps.py - Analyze Maven dependencies
+# 7. analyze_build_profile.py - Attribute Gradle build time to modules (when profiles exist)
+# 8. analyze_module_feasibility.py - Aggregate and produce final assessment
+# 9. analyze_module_graph.py - Schedule conversion/build waves over the module graph
+# 10. generate_html_report.py - Static HTML report with per-module findings loaded on demand
 #
 # Usage:
 #     ./run_all_analysis.sh [--repo-root PATH]
@@ -84,24 +91,73 @@ echo "Using Python ${PYTHON_VERSION}"
 # Step 1: Analyze Java API blockers
 echo ""
 echo "----------------------------------------------"
-echo "Step 1/3: Analyzing Java API blockers..."
+echo "Step 1/10: Analyzing Java API blockers..."
 echo "----------------------------------------------"
 $PYTHON_CMD "${SCRIPT_DIR}/analyze_java_api_blockers.py" --repo-root "${REPO_ROOT}"
 
-# Step 2: Analyze external dependencies
+# Step 2: Analyze regex literals
 echo ""
 echo "----------------------------------------------"
-echo "Step 2/3: Analyzing external dependencies..."
+echo "Step 2/10: Analyzing regex literals..."
+echo "----------------------------------------------"
+$PYTHON_CMD "${SCRIPT_DIR}/analyze_regex_literals.py" --repo-root "${REPO_ROOT}"
+
+# Step 3: Replay regex literals against the spec corpus
+echo ""
+echo "----------------------------------------------"
+echo "Step 3/10: Benchmarking regex literals on the spec corpus..."
+echo "----------------------------------------------"
+$PYTHON_CMD "${SCRIPT_DIR}/benchmark_regex_literals.py" --repo-root "${REPO_ROOT}"
+
+# Step 4: Propagate blockers between classes
+echo ""
+echo "----------------------------------------------"
+echo "Step 4/10: Propagating blockers between classes..."
+echo "----------------------------------------------"
+$PYTHON_CMD "${SCRIPT_DIR}/analyze_class_blockers.py" --repo-root "${REPO_ROOT}"
+
+# Step 5: Near-duplicate code
+echo ""
+echo "----------------------------------------------"
+echo "Step 5/10: Finding near-duplicate code..."
+echo "----------------------------------------------"
+$PYTHON_CMD "${SCRIPT_DIR}/analyze_duplicate_code.py" --repo-root "${REPO_ROOT}"
+
+# Step 6: Analyze external dependencies
+echo ""
+echo "----------------------------------------------"
+echo "Step 6/10: Analyzing external dependencies..."
 echo "----------------------------------------------"
 $PYTHON_CMD "${SCRIPT_DIR}/analyze_external_deps.py" --repo-root "${REPO_ROOT}"
 
-# Step 3: Aggregate module feasibility
+# Step 7: Build time per module from Gradle --profile reports
 echo ""
 echo "----------------------------------------------"
-echo "Step 3/3: Aggregating module feasibility..."
+echo "Step 7/10: Attributing build time to modules..."
+echo "----------------------------------------------"
+$PYTHON_CMD "${SCRIPT_DIR}/analyze_build_profile.py" --repo-root "${REPO_ROOT}"
+
+# Step 8: Aggregate module feasibility
+echo ""
+echo "----------------------------------------------"
+echo "Step 8/10: Aggregating module feasibility..."
 echo "----------------------------------------------"
 $PYTHON_CMD "${SCRIPT_DIR}/analyze_module_feasibility.py" --repo-root "${REPO_ROOT}" --skip-prerequisites
 
+# Step 9: Module dependency graph and waves
+echo ""
+echo "----------------------------------------------"
+echo "Step 9/10: Scheduling module conversion waves..."
+echo "----------------------------------------------"
+$PYTHON_CMD "${SCRIPT_DIR}/analyze_module_graph.py" --repo-root "${REPO_ROOT}"
+
+# Step 10: HTML report
+echo ""
+echo "----------------------------------------------"
+echo "Step 10/10: Writing the HTML report..."
+echo "----------------------------------------------"
+$PYTHON_CMD "${SCRIPT_DIR}/generate_html_report.py" --repo-root "${REPO_ROOT}"
+
 # Summary
 echo ""
 echo "=============================================="
@@ -110,7 +166,15 @@ echo "=============================================="
 echo ""
 echo "Output files:"
 echo "  - ${OUTPUT_DIR}/java_api_blockers.json"
+echo "  - ${OUTPUT_DIR}/progress/snapshot-*.json"
+echo "  - ${OUTPUT_DIR}/regex_literals.json"
+echo "  - ${OUTPUT_DIR}/regex_benchmark.json"
+echo "  - ${OUTPUT_DIR}/class_blockers.json"
+echo "  - ${OUTPUT_DIR}/duplicate_code.json"
 echo "  - ${OUTPUT_DIR}/external_deps.json"
+echo "  - ${OUTPUT_DIR}/build_profile.json (with build_profile_history.json, when profiles exist)"
 echo "  - ${OUTPUT_DIR}/module_feasibility.json"
+echo "  - ${OUTPUT_DIR}/module_graph.json"
+echo "  - ${OUTPUT_DIR}/html/index.html"
 echo ""
 echo "View the module_feasibility.json for the consolidated assessment."
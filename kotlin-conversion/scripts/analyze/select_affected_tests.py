@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Select the tests and spec resources affected by a set of changed files.
+
+Instead of running every test suite for every change, this script maps the
+changed files to the minimal set of test classes that can observe them:
+
+- Java and Kotlin sources: the changed class plus every class that depends on it,
+  transitively, over the reverse import index of src/main and src/test
+  (the class index of analyze_class_blockers.py, kept for all scopes).
+- Resources such as *_spec.md: the classes whose string literals name the
+  resource, and everything depending on those classes.
+- build.gradle.kts (and other module files): every test of the module and of
+  the modules depending on it, over the module graph of analyze_module_graph.py.
+- Root build files (settings.gradle.kts, gradle/, ...): every test.
+
+Test classes are the affected test-scope classes named *Test or *Tests; for
+each of them the spec resources it reads are listed as well.
+
+Usage:
+    python select_affected_tests.py [FILE ...] [--git-range BASE..HEAD]
+                                    [--repo-root PATH] [--index PATH] [--format text|gradle|json]
+
+    Without FILE arguments or --git-range, the uncommitted changes
+    (git diff --name-only HEAD) and untracked files that are not ignored
+    (git ls-files --others --exclude-standard) are used.
+
+Output:
+    text: affected test classes and spec resources per module, plus the
+          Gradle command line
+    gradle: the Gradle task and --tests arguments only
+    json: the selection as JSON
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, Set
+
+from analyze_class_blockers import class_fqn, load_index, save_index, update_index
+from analyze_java_api_blockers import file_scope
+from analyze_module_feasibility import load_json_report
+from analyze_module_graph import build_module_graph
+
+
+# Changes to these (relative to the repository root) can affect every test
+ROOT_BUILD_FILES = ("settings.gradle.kts", "build.gradle.kts", "gradle.properties", "gradlew", "gradlew.bat")
+ROOT_BUILD_DIRS = ("gradle", "buildSrc")
+
+TEST_CLASS_SUFFIXES = ("Test", "Tests")
+
+
+def run_git(repo_root: Path, args: List[str]) -> List[str]:
+    """Non-empty output lines of a git command."""
+    result = subprocess.run(args, cwd=repo_root, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed: {result.stderr.strip()}")
+    return [line for line in result.stdout.splitlines() if line.strip()]
+
+
+def changed_files_from_git(repo_root: Path, git_range: Optional[str]) -> List[str]:
+    """Paths changed in a git range, or uncommitted changes against HEAD plus untracked files."""
+    if git_range:
+        return run_git(repo_root, ["git", "diff", "--name-only", git_range])
+    changed = run_git(repo_root, ["git", "diff", "--name-only", "HEAD"])
+    untracked = run_git(repo_root, ["git", "ls-files", "--others", "--exclude-standard"])
+    return changed + [path for path in untracked if path not in changed]
+
+
+def is_test_class(rel_path: str, entry: dict, repo_root: Path) -> bool:
+    return (entry["class_name"].endswith(TEST_CLASS_SUFFIXES)
+            and file_scope(repo_root / rel_path, repo_root) == "test")
+
+
+def resource_files(repo_root: Path, modules: List[str]) -> Dict[str, List[str]]:
+    """Resource file name -> repo-relative paths, for the src/*/resources of every module."""
+    by_name: Dict[str, List[str]] = defaultdict(list)
+    for module in modules:
+        for path in sorted((repo_root / module).glob("src/*/resources/**/*")):
+            if path.is_file():
+                by_name[path.name].append(path.relative_to(repo_root).as_posix())
+    return by_name
+
+
+def resolve_resource_ref(ref: str, by_name: Dict[str, List[str]]) -> List[str]:
+    """Resource files a string literal such as "/ext_tables_ast_spec.md" can name."""
+    name = PurePosixPath(ref).name
+    suffix = "/" + ref.lstrip("/")
+    return [path for path in by_name.get(name, []) if path.endswith(suffix)]
+
+
+def dependents_closure(seeds: Set[str], reverse: Dict[str, Set[str]]) -> Set[str]:
+    """Seeds plus every file depending on them, transitively."""
+    affected = set(seeds)
+    frontier = list(seeds)
+    while frontier:
+        node = frontier.pop()
+        for dependent in reverse.get(node, ()):
+            if dependent not in affected:
+                affected.add(dependent)
+                frontier.append(dependent)
+    return affected
+
+
+def dependents_of_deleted(rel_path: str, files: Dict[str, dict]) -> Set[str]:
+    """Files that still refer to the class of a deleted source file."""
+    parts = PurePosixPath(rel_path).parts
+    package = ""
+    # <module>/src/<source set>/<java|kotlin>/<package dirs>/<File>
+    if "src" in parts and parts.index("src") + 3 < len(parts):
+        package = ".".join(parts[parts.index("src") + 3:-1])
+    name = PurePosixPath(rel_path).stem
+    fqn = f"{package}.{name}" if package else name
+
+    dependents = set()
+    for other, entry in files.items():
+        refs = entry["imports"] + entry["qualified_refs"]
+        if any(ref == fqn or ref.startswith(fqn + ".") for ref in refs):
+            dependents.add(other)
+        elif name in entry["type_refs"] and (entry["package"] == package or package in entry["star_imports"]):
+            dependents.add(other)
+    return dependents
+
+
+def module_dependents(graph: Dict[str, dict], modules: Set[str]) -> Set[str]:
+    """Modules plus every module depending on them over main and test dependencies."""
+    reverse: Dict[str, Set[str]] = defaultdict(set)
+    for module, node in graph.items():
+        for dep in node["main"] | node["test"]:
+            reverse[dep].add(module)
+    return dependents_closure(modules, reverse)
+
+
+def select_tests(repo_root: Path, changed: List[str], files: Dict[str, dict], graph: Dict[str, dict]) -> dict:
+    """Map changed paths to affected test classes, whole test modules and spec resources."""
+    reverse: Dict[str, Set[str]] = defaultdict(set)
+    for rel_path, entry in files.items():
+        for dep in entry["edges"]:
+            reverse[dep].add(rel_path)
+
+    modules = sorted(graph)
+    by_name = resource_files(repo_root, modules)
+    resource_users: Dict[str, Set[str]] = defaultdict(set)
+    test_resources: Dict[str, List[str]] = {}
+    for rel_path, entry in files.items():
+        resolved = sorted({p for ref in entry.get("resource_refs", []) for p in resolve_resource_ref(ref, by_name)})
+        for path in resolved:
+            resource_users[path].add(rel_path)
+        test_resources[rel_path] = resolved
+
+    seeds: Set[str] = set()
+    changed_modules: Set[str] = set()
+    full = False
+    reasons: Dict[str, str] = {}
+    ignored = []
+
+    for path in changed:
+        path = PurePosixPath(path).as_posix()
+        top = PurePosixPath(path).parts[0] if PurePosixPath(path).parts else ""
+        if path in ROOT_BUILD_FILES or top in ROOT_BUILD_DIRS:
+            full = True
+            reasons[path] = "root build file: all tests"
+        elif path in files:
+            seeds.add(path)
+            reasons[path] = "source"
+        elif path.endswith((".java", ".kt")) and top in graph:
+            # Deleted (or not yet indexed) source: whatever still refers to it
+            seeds.update(dependents_of_deleted(path, files))
+            reasons[path] = "deleted source"
+        elif path in resource_users:
+            seeds.update(resource_users[path])
+            reasons[path] = f"resource read by {len(resource_users[path])} classes"
+        elif top in graph:
+            changed_modules.add(top)
+            reasons[path] = f"module file: all tests of {top} and its dependents"
+        else:
+            ignored.append(path)
+
+    affected = dependents_closure(seeds, reverse)
+    full_modules = set(modules) if full else module_dependents(graph, changed_modules)
+
+    tests_by_module: Dict[str, List[str]] = defaultdict(list)
+    specs: Set[str] = set()
+    for rel_path in sorted(files):
+        entry = files[rel_path]
+        if not is_test_class(rel_path, entry, repo_root):
+            continue
+        if entry["module"] in full_modules:
+            specs.update(test_resources[rel_path])
+        elif rel_path in affected:
+            tests_by_module[entry["module"]].append(class_fqn(entry))
+            specs.update(test_resources[rel_path])
+
+    return {
+        "changed_files": len(changed),
+        "full_run": full,
+        "reasons": reasons,
+        "ignored": ignored,
+        "affected_classes": len(affected),
+        "full_modules": sorted(full_modules),
+        "tests": {module: tests for module, tests in sorted(tests_by_module.items())},
+        "spec_resources": sorted(p for p in specs if p.endswith("_spec.md")),
+    }
+
+
+def gradle_arguments(selection: dict) -> List[str]:
+    """Gradle tasks and --tests filters for the selection."""
+    if selection["full_run"]:
+        return ["test"]
+    args = [f":{module}:test" for module in selection["full_modules"]]
+    for module, tests in selection["tests"].items():
+        args.append(f":{module}:test")
+        for test in tests:
+            args.extend(["--tests", test])
+    return args
+
+
+def print_summary(selection: dict, args: List[str]) -> None:
+    """Print a human-readable summary to console."""
+    print("\n" + "=" * 70)
+    print("AFFECTED TESTS - SUMMARY")
+    print("=" * 70)
+
+    print(f"\nChanged files: {selection['changed_files']} "
+          f"({len(selection['ignored'])} outside modules ignored)")
+    print(f"Affected classes: {selection['affected_classes']}")
+
+    if selection["full_run"]:
+        print("\nRoot build files changed: running all tests")
+    elif selection["full_modules"]:
+        print("\nAll tests of:")
+        for module in selection["full_modules"]:
+            print(f"  * {module}")
+
+    if selection["tests"]:
+        print("\nTest classes:")
+        for module, tests in selection["tests"].items():
+            print(f"  {module}: {len(tests)}")
+            for test in tests:
+                print(f"    - {test}")
+
+    if selection["spec_resources"]:
+        print("\nSpec resources:")
+        for spec in selection["spec_resources"]:
+            print(f"  - {spec}")
+
+    print("\n" + "-" * 70)
+    print("GRADLE")
+    print("-" * 70)
+    print("./gradlew " + " ".join(args) if args else "(no tests affected)")
+    print("\n" + "=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Select the test classes and spec resources affected by changed files"
+    )
+    parser.add_argument("files", nargs="*", help="Changed files, relative to the repository root")
+    parser.add_argument(
+        "--git-range",
+        default=None,
+        metavar="BASE..HEAD",
+        help="Use the files changed in a git range instead of FILE arguments"
+    )
+    parser.add_argument(
+        "--repo-root",
+        type=Path,
+        default=Path(__file__).parent.parent.parent,
+        help="Path to repository root (default: two levels up from script)"
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=None,
+        help="Persistent class index over all scopes (default: .ai_out/.../test_impact_index.json)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "gradle", "json"],
+        default="text",
+        help="Output format (default: text)"
+    )
+    args = parser.parse_args()
+
+    if args.files and args.git_range:
+        parser.error("give either FILE arguments or --git-range")
+
+    repo_root = args.repo_root.resolve()
+    output_dir = repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    index_path = args.index or output_dir / "test_impact_index.json"
+
+    if args.files:
+        changed = [Path(f).resolve().relative_to(repo_root).as_posix() if Path(f).is_absolute() else f
+                   for f in args.files]
+    else:
+        try:
+            changed = changed_files_from_git(repo_root, args.git_range)
+        except RuntimeError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    index = load_index(index_path, repo_root)
+    update_index(index, repo_root, "all")
+    save_index(index, index_path)
+
+    graph = build_module_graph(repo_root, load_json_report(output_dir / "external_deps.json"))
+    selection = select_tests(repo_root, changed, index["files"], graph)
+    gradle_args = gradle_arguments(selection)
+
+    if args.format == "gradle":
+        print(" ".join(gradle_args))
+    elif args.format == "json":
+        print(json.dumps({**selection, "gradle_arguments": gradle_args}, indent=2))
+    else:
+        print_summary(selection, gradle_args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,598 @@
+#!/usr/bin/env python3
+"""
+Trigram index over Java and Kotlin sources for fast ad-hoc blocker queries.
+
+The build command stores a posting list of file ids for every byte trigram of
+the (ASCII-lowercased) sources in an SQLite file. Re-running build only
+re-reads files whose size or mtime changed and rewrites the posting lists of
+the trigrams they gained or lost.
+
+The query command turns a regex into a boolean trigram query (codesearch
+style), narrows the files to the candidates through the index, and runs the
+regex line by line on those candidates only.
+
+Usage:
+    python trigram_search.py build [--repo-root PATH] [--index PATH] [--rebuild] [--scope all]
+    python trigram_search.py query REGEX [--repo-root PATH] [--index PATH]
+                                   [--ignore-case] [--module NAME] [--files-only] [--limit N]
+    python trigram_search.py query --category CATEGORY [...]
+
+Output:
+    build: the index file (default: .ai_out/.../trigram_index.sqlite)
+    query: matching lines as path:line: content, plus narrowing statistics
+"""
+
+import argparse
+import re
+import sqlite3
+import sys
+import time
+from array import array
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+from analyze_java_api_blockers import (
+    API_CATEGORIES,
+    SCOPES,
+    SOURCE_EXTENSIONS,
+    category_patterns,
+    find_java_files,
+    get_module_name,
+)
+
+
+INDEX_VERSION = "1"
+
+# Exact string sets larger than this, or with longer strings, are folded into trigram queries
+MAX_EXACT_SET = 16
+MAX_EXACT_LENGTH = 8
+
+# Character classes with at most this many members are expanded into exact strings
+MAX_CLASS_SIZE = 8
+
+# Cross products of suffixes and prefixes larger than this give up on boundary trigrams
+MAX_BOUNDARY_PAIRS = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    trigrams BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (trigram INTEGER PRIMARY KEY, ids BLOB NOT NULL);
+"""
+
+
+def file_trigrams(data: bytes) -> Set[int]:
+    """Distinct byte trigrams of the ASCII-lowercased data, packed into 24-bit integers."""
+    data = data.lower()
+    grams = {data[i:i + 3] for i in range(len(data) - 2)}
+    return {int.from_bytes(g, "big") for g in grams}
+
+
+def string_trigrams(text: bytes) -> List[int]:
+    return sorted({int.from_bytes(text[i:i + 3], "big") for i in range(len(text) - 2)})
+
+
+# =============================================================================
+# Index build and incremental update
+# =============================================================================
+
+def open_index(index_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(index_path))
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _to_blob(ids: Iterable[int]) -> bytes:
+    return array("I", sorted(ids)).tobytes()
+
+
+def _from_blob(blob: bytes) -> array:
+    ids = array("I")
+    ids.frombytes(blob)
+    return ids
+
+
+def update_index(conn: sqlite3.Connection, repo_root: Path, rebuild: bool = False, scope: str = "all") -> dict:
+    """
+    Bring the index up to date with the sources of the given scan scope under
+    repo_root. Files of other scopes are dropped like deleted files.
+
+    Returns statistics about added, changed, removed and unchanged files.
+    """
+    cur = conn.cursor()
+    version = cur.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    root = cur.execute("SELECT value FROM meta WHERE key = 'repo_root'").fetchone()
+    if rebuild or (version and version[0] != INDEX_VERSION) or (root and root[0] != str(repo_root)):
+        cur.executescript("DELETE FROM files; DELETE FROM postings; DELETE FROM meta;")
+
+    known = {
+        path: (file_id, mtime_ns, size)
+        for file_id, path, mtime_ns, size in cur.execute("SELECT id, path, mtime_ns, size FROM files")
+    }
+    next_id = max((v[0] for v in known.values()), default=0) + 1
+
+    added: Dict[int, Set[int]] = defaultdict(set)    # trigram -> file ids gaining it
+    removed: Dict[int, Set[int]] = defaultdict(set)  # trigram -> file ids losing it
+    stats = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+    seen = set()
+
+    for file_path in find_java_files(repo_root, SOURCE_EXTENSIONS, scope):
+        rel_path = file_path.relative_to(repo_root).as_posix()
+        seen.add(rel_path)
+        st = file_path.stat()
+        previous = known.get(rel_path)
+        if previous and previous[1] == st.st_mtime_ns and previous[2] == st.st_size:
+            stats["unchanged"] += 1
+            continue
+
+        try:
+            data = file_path.read_bytes()
+        except OSError as e:
+            print(f"Warning: Could not read {file_path}: {e}")
+            continue
+        new_grams = file_trigrams(data)
+
+        if previous:
+            file_id = previous[0]
+            blob = cur.execute("SELECT trigrams FROM files WHERE id = ?", (file_id,)).fetchone()[0]
+            old_grams = set(_from_blob(blob))
+            stats["changed"] += 1
+        else:
+            file_id = next_id
+            next_id += 1
+            old_grams = set()
+            stats["added"] += 1
+
+        for gram in new_grams - old_grams:
+            added[gram].add(file_id)
+        for gram in old_grams - new_grams:
+            removed[gram].add(file_id)
+        cur.execute(
+            "INSERT OR REPLACE INTO files (id, path, mtime_ns, size, trigrams) VALUES (?, ?, ?, ?, ?)",
+            (file_id, rel_path, st.st_mtime_ns, st.st_size, _to_blob(new_grams))
+        )
+
+    for rel_path, (file_id, _, _) in known.items():
+        if rel_path in seen:
+            continue
+        blob = cur.execute("SELECT trigrams FROM files WHERE id = ?", (file_id,)).fetchone()[0]
+        for gram in _from_blob(blob):
+            removed[gram].add(file_id)
+        cur.execute("DELETE FROM files WHERE id = ?", (file_id,))
+        stats["removed"] += 1
+
+    touched = sorted(set(added) | set(removed))
+    for start in range(0, len(touched), 500):
+        batch = touched[start:start + 500]
+        marks = ",".join("?" * len(batch))
+        current = {
+            gram: set(_from_blob(blob))
+            for gram, blob in cur.execute(f"SELECT trigram, ids FROM postings WHERE trigram IN ({marks})", batch)
+        }
+        rows = []
+        for gram in batch:
+            ids = (current.get(gram, set()) - removed.get(gram, set())) | added.get(gram, set())
+            rows.append((gram, _to_blob(ids) if ids else None))
+        cur.executemany("DELETE FROM postings WHERE trigram = ?", [(g,) for g, b in rows if b is None])
+        cur.executemany(
+            "INSERT OR REPLACE INTO postings (trigram, ids) VALUES (?, ?)",
+            [(g, b) for g, b in rows if b is not None]
+        )
+
+    cur.executemany(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+        [("version", INDEX_VERSION), ("repo_root", str(repo_root)), ("scope", scope),
+         ("updated", str(time.time()))]
+    )
+    conn.commit()
+    stats["trigrams_touched"] = len(touched)
+    return stats
+
+
+# =============================================================================
+# Regex to trigram query
+# =============================================================================
+
+# A query is ALL (no constraint), NONE, ("tri", gram), ("and", queries) or ("or", queries)
+ALL = ("all",)
+NONE = ("none",)
+
+
+def q_and(*queries) -> tuple:
+    items = []
+    for q in queries:
+        if q == NONE:
+            return NONE
+        if q == ALL:
+            continue
+        items.extend(q[1] if q[0] == "and" else [q])
+    unique = list(dict.fromkeys(items))
+    if not unique:
+        return ALL
+    return unique[0] if len(unique) == 1 else ("and", tuple(unique))
+
+
+def q_or(*queries) -> tuple:
+    items = []
+    for q in queries:
+        if q == ALL:
+            return ALL
+        if q == NONE:
+            continue
+        items.extend(q[1] if q[0] == "or" else [q])
+    unique = list(dict.fromkeys(items))
+    if not unique:
+        return NONE
+    return unique[0] if len(unique) == 1 else ("or", tuple(unique))
+
+
+def q_string(text: bytes) -> tuple:
+    """Query requiring every trigram of text (ALL when text is shorter than a trigram)."""
+    return q_and(*(("tri", g) for g in string_trigrams(text)))
+
+
+class RegexInfo:
+    """
+    What is known about the strings a regex fragment matches.
+
+    exact: the complete set of matched strings, or None when unbounded.
+    prefix / suffix: possible first / last (up to) two bytes of a match.
+    match: trigram query every match must satisfy (besides exact).
+    """
+    __slots__ = ("emptyable", "exact", "prefix", "suffix", "match")
+
+    def __init__(self, emptyable: bool, exact: Optional[Set[bytes]], prefix: Set[bytes],
+                 suffix: Set[bytes], match: tuple):
+        self.emptyable = emptyable
+        self.exact = exact
+        self.prefix = prefix
+        self.suffix = suffix
+        self.match = match
+
+    def heads(self) -> Set[bytes]:
+        return self.exact if self.exact is not None else self.prefix
+
+    def tails(self) -> Set[bytes]:
+        return self.exact if self.exact is not None else self.suffix
+
+    def full_query(self) -> tuple:
+        if self.exact is None:
+            return self.match
+        return q_and(self.match, q_or(*(q_string(s) for s in self.exact)))
+
+
+def _info_exact(strings: Set[bytes]) -> RegexInfo:
+    return _simplify(RegexInfo(b"" in strings, strings, strings, strings, ALL))
+
+
+def _info_any() -> RegexInfo:
+    return RegexInfo(False, None, {b""}, {b""}, ALL)
+
+
+def _info_empty_unknown() -> RegexInfo:
+    return RegexInfo(True, None, {b""}, {b""}, ALL)
+
+
+def _trim(strings: Set[bytes], head: bool) -> Set[bytes]:
+    trimmed = {s[:2] if head else s[-2:] for s in strings}
+    return trimmed if len(trimmed) <= MAX_EXACT_SET else {b""}
+
+
+def _simplify(info: RegexInfo) -> RegexInfo:
+    """Fold large or long exact sets into the trigram query."""
+    if info.exact is not None and (
+        len(info.exact) > MAX_EXACT_SET or any(len(s) > MAX_EXACT_LENGTH for s in info.exact)
+    ):
+        return RegexInfo(info.emptyable, None, _trim(info.exact, True), _trim(info.exact, False),
+                         info.full_query())
+    info.prefix = _trim(info.prefix, True)
+    info.suffix = _trim(info.suffix, False)
+    return info
+
+
+def _concat(x: RegexInfo, y: RegexInfo) -> RegexInfo:
+    if x.exact is not None and y.exact is not None and len(x.exact) * len(y.exact) <= MAX_EXACT_SET:
+        return _info_exact({a + b for a in x.exact for b in y.exact})
+
+    tails, heads = x.tails(), y.heads()
+    if len(tails) * len(heads) <= MAX_BOUNDARY_PAIRS:
+        boundary = q_or(*(q_string(a + b) for a in tails for b in heads))
+    else:
+        boundary = ALL
+    match = q_and(x.full_query(), y.full_query(), boundary)
+
+    prefix = {a + b for a in x.exact for b in y.prefix} if x.exact is not None else set(x.prefix)
+    if x.emptyable and x.exact is None:
+        prefix |= y.heads()
+    suffix = {a + b for a in x.suffix for b in y.exact} if y.exact is not None else set(y.suffix)
+    if y.emptyable and y.exact is None:
+        suffix |= x.tails()
+    return _simplify(RegexInfo(x.emptyable and y.emptyable, None, prefix, suffix, match))
+
+
+def _alternate(x: RegexInfo, y: RegexInfo) -> RegexInfo:
+    if x.exact is not None and y.exact is not None:
+        return _info_exact(x.exact | y.exact)
+    return _simplify(RegexInfo(
+        x.emptyable or y.emptyable, None,
+        x.heads() | y.heads(), x.tails() | y.tails(),
+        q_or(x.full_query(), y.full_query())
+    ))
+
+
+def _class_members(items: list) -> Optional[Set[bytes]]:
+    """Members of a small positive character class, lowercased, or None when too broad."""
+    members: Set[bytes] = set()
+    for op, av in items:
+        if op == sre_constants.LITERAL:
+            members.add(chr(av).encode("utf-8").lower())
+        elif op == sre_constants.RANGE and av[1] - av[0] < MAX_CLASS_SIZE:
+            members.update(chr(c).encode("utf-8").lower() for c in range(av[0], av[1] + 1))
+        else:
+            return None
+        if len(members) > MAX_CLASS_SIZE:
+            return None
+    return members
+
+
+def analyze_regex(parsed) -> RegexInfo:
+    """Compute RegexInfo for a parsed (sre_parse) pattern sequence."""
+    info = _info_exact({b""})
+    for op, av in parsed:
+        info = _concat(info, _analyze_node(op, av))
+    return info
+
+
+def _analyze_node(op, av) -> RegexInfo:
+    c = sre_constants
+    if op == c.LITERAL:
+        return _info_exact({chr(av).encode("utf-8").lower()})
+    if op == c.IN:
+        members = _class_members(av)
+        return _info_exact(members) if members else _info_any()
+    if op in (c.NOT_LITERAL, c.ANY):
+        return _info_any()
+    if op == c.SUBPATTERN:
+        return analyze_regex(av[-1])
+    if op == getattr(c, "ATOMIC_GROUP", None):
+        return analyze_regex(av)
+    if op == c.BRANCH:
+        result = None
+        for branch in av[1]:
+            branch_info = analyze_regex(branch)
+            result = branch_info if result is None else _alternate(result, branch_info)
+        return result or _info_exact({b""})
+    if op in (c.MAX_REPEAT, c.MIN_REPEAT, getattr(c, "POSSESSIVE_REPEAT", None)):
+        low, high, body = av
+        inner = analyze_regex(body)
+        if high == 1:
+            return _alternate(_info_exact({b""}), inner) if low == 0 else inner
+        if low == 0:
+            return _info_empty_unknown()
+        if low == high and low <= 4:
+            result = inner
+            for _ in range(low - 1):
+                result = _concat(result, inner)
+            return result
+        folded = _simplify(RegexInfo(inner.emptyable, None, set(inner.heads()), set(inner.tails()),
+                                     inner.full_query()))
+        return folded
+    if op in (c.AT, c.ASSERT, c.ASSERT_NOT):
+        return _info_exact({b""})
+    # Back references, conditionals and anything else: no constraint
+    return _info_empty_unknown()
+
+
+def regex_to_query(pattern: str, flags: int = 0) -> tuple:
+    """Trigram query that every file containing a match of pattern must satisfy."""
+    if flags & re.VERBOSE:
+        return ALL
+    return analyze_regex(sre_parse.parse(pattern, flags)).full_query()
+
+
+# =============================================================================
+# Query evaluation
+# =============================================================================
+
+def evaluate_query(conn: sqlite3.Connection, query: tuple) -> Optional[Set[int]]:
+    """File ids satisfying query; None means every file."""
+    cache: Dict[int, Set[int]] = {}
+
+    def postings(gram: int) -> Set[int]:
+        if gram not in cache:
+            row = conn.execute("SELECT ids FROM postings WHERE trigram = ?", (gram,)).fetchone()
+            cache[gram] = set(_from_blob(row[0])) if row else set()
+        return cache[gram]
+
+    def evaluate(q: tuple) -> Optional[Set[int]]:
+        kind = q[0]
+        if kind == "all":
+            return None
+        if kind == "none":
+            return set()
+        if kind == "tri":
+            return postings(q[1])
+        if kind == "and":
+            result = None
+            # Most selective trigrams first so intersections shrink quickly
+            for sub in sorted(q[1], key=lambda s: len(postings(s[1])) if s[0] == "tri" else 1 << 30):
+                ids = evaluate(sub)
+                if ids is not None:
+                    result = set(ids) if result is None else result & ids
+                    if not result:
+                        return result
+            return result
+        result = set()
+        for sub in q[1]:
+            ids = evaluate(sub)
+            if ids is None:
+                return None
+            result |= ids
+        return result
+
+    return evaluate(query)
+
+
+def search(
+    conn: sqlite3.Connection,
+    repo_root: Path,
+    pattern: str,
+    flags: int = 0,
+    module: Optional[str] = None,
+    limit: Optional[int] = None
+) -> Tuple[List[Tuple[str, int, str]], dict]:
+    """Run a regex over the candidate files selected by the index."""
+    started = time.perf_counter()
+    regex = re.compile(pattern, flags)
+    query = regex_to_query(pattern, flags)
+    ids = evaluate_query(conn, query)
+    if ids is None:
+        rows = conn.execute("SELECT path FROM files ORDER BY path").fetchall()
+    else:
+        rows = []
+        id_list = sorted(ids)
+        for start in range(0, len(id_list), 500):
+            batch = id_list[start:start + 500]
+            marks = ",".join("?" * len(batch))
+            rows.extend(conn.execute(f"SELECT path FROM files WHERE id IN ({marks})", batch).fetchall())
+        rows.sort()
+    candidates = [path for (path,) in rows]
+    if module:
+        candidates = [p for p in candidates if get_module_name(repo_root / p, repo_root) == module]
+    narrowed = time.perf_counter()
+
+    matches = []
+    matched_files = 0
+    for rel_path in candidates:
+        try:
+            with open(repo_root / rel_path, 'r', encoding='utf-8', errors='replace') as f:
+                lines = f.readlines()
+        except OSError:
+            continue
+        hit = False
+        for line_num, line in enumerate(lines, start=1):
+            if regex.search(line):
+                matches.append((rel_path, line_num, line.rstrip("\n")))
+                hit = True
+                if limit and len(matches) >= limit:
+                    break
+        matched_files += hit
+        if limit and len(matches) >= limit:
+            break
+
+    total_files = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+    return matches, {
+        "indexed_files": total_files,
+        "candidate_files": len(candidates),
+        "matching_files": matched_files,
+        "narrow_ms": (narrowed - started) * 1000,
+        "verify_ms": (time.perf_counter() - narrowed) * 1000,
+    }
+
+
+def category_regex(category: str) -> str:
+    """A single regex matching any pattern of an API_CATEGORIES entry."""
+    return "|".join(f"(?:{p})" for p, _ in category_patterns(category))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Trigram index over Java/Kotlin sources for fast ad-hoc blocker queries"
+    )
+    parser.add_argument("command", choices=["build", "query"], help="build/update the index, or query it")
+    parser.add_argument("regex", nargs="?", help="Regex to search for (query)")
+    parser.add_argument(
+        "--repo-root",
+        type=Path,
+        default=Path(__file__).parent.parent.parent,
+        help="Path to repository root (default: two levels up from script)"
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=None,
+        help="Index file path (default: .ai_out/.../trigram_index.sqlite)"
+    )
+    parser.add_argument("--rebuild", action="store_true", help="Discard the index and rebuild it (build)")
+    parser.add_argument(
+        "--scope",
+        choices=list(SCOPES),
+        default="all",
+        help="Source sets to index: main, test, testFixtures or all (build; default: all)"
+    )
+    parser.add_argument(
+        "--category",
+        choices=sorted(API_CATEGORIES),
+        help="Query with all patterns of an API_CATEGORIES category instead of REGEX"
+    )
+    parser.add_argument("--ignore-case", "-i", action="store_true", help="Case-insensitive regex (query)")
+    parser.add_argument("--module", default=None, help="Restrict results to one module (query)")
+    parser.add_argument("--files-only", "-l", action="store_true", help="Print matching file paths only (query)")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after N matching lines (query)")
+    args = parser.parse_args()
+
+    repo_root = args.repo_root.resolve()
+
+    if args.index:
+        index_path = args.index
+    else:
+        output_dir = repo_root / ".ai_out" / "kotlin-mp-feasibility-analysis"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        index_path = output_dir / "trigram_index.sqlite"
+
+    if args.command == "build":
+        started = time.perf_counter()
+        conn = open_index(index_path)
+        stats = update_index(conn, repo_root, args.rebuild, args.scope)
+        conn.close()
+        print(f"Index updated in {time.perf_counter() - started:.2f}s: {index_path}")
+        print(f"  added: {stats['added']}, changed: {stats['changed']}, removed: {stats['removed']}, "
+              f"unchanged: {stats['unchanged']}, trigrams touched: {stats['trigrams_touched']}")
+        return
+
+    if bool(args.regex) == bool(args.category):
+        parser.error("query needs exactly one of REGEX or --category")
+    if not index_path.exists():
+        parser.error(f"No index at {index_path}; run 'build' first")
+
+    pattern = args.regex or category_regex(args.category)
+    flags = re.IGNORECASE if args.ignore_case else 0
+    try:
+        re.compile(pattern, flags)
+    except re.error as e:
+        parser.error(f"Invalid regex: {e}")
+
+    conn = open_index(index_path)
+    matches, stats = search(conn, repo_root, pattern, flags, args.module, args.limit)
+    conn.close()
+
+    if args.files_only:
+        for rel_path in dict.fromkeys(m[0] for m in matches):
+            print(rel_path)
+    else:
+        for rel_path, line_num, line in matches:
+            print(f"{rel_path}:{line_num}: {line.strip()}")
+
+    print(
+        f"\n{len(matches)} matches in {stats['matching_files']} files; "
+        f"{stats['candidate_files']} of {stats['indexed_files']} files verified "
+        f"(narrow {stats['narrow_ms']:.1f} ms, verify {stats['verify_ms']:.1f} ms)",
+        file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    main()